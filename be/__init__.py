@@ -1,3 +1,4 @@
 from .database import SessionLocal
 from .database import init_db
-from .router import get, save
\ No newline at end of file
+from .database import get_db, session_scope, get_pool_status
+from .router import get, save, webhook
\ No newline at end of file
@@ -1,13 +1,25 @@
 from fastapi import FastAPI
 from contextlib import asynccontextmanager
-from . import init_db
-from . import get, save
+import anyio.to_thread
+import os
+from . import init_db, get_pool_status
+from . import get, save, webhook
+from .modules import init_github_session, close_github_session, ensure_future_partitions, get_http_cache_stats, get_rate_limit_status, get_token_cache_stats, get_result_cache_stats
 from fastapi.middleware.cors import CORSMiddleware
 
+# def 핸들러를 실행하는 스레드 풀 크기 (동시에 블로킹 I/O를 기다릴 수 있는 요청 수, anyio 기본값은 40)
+THREADPOOL_SIZE: int = int(os.getenv("THREADPOOL_SIZE", "40"))
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
+    anyio.to_thread.current_default_thread_limiter().total_tokens = THREADPOOL_SIZE
     init_db()
+    # 앞으로 몇 달치 commits, code_changes 파티션을 미리 만들어둬요
+    ensure_future_partitions()
+    # GitHub API 연결을 재사용하도록 keep-alive 세션을 앱 전체에서 공유 (get_github_session으로 가져와요)
+    init_github_session()
     yield
+    close_github_session()
 
 app = FastAPI(lifespan=lifespan)
 
@@ -23,8 +35,20 @@ app.add_middleware(
 async def read_root():
     return {"message": "working!"}
 
+@app.get("/metrics")
+def read_metrics():
+    # DB 연결 풀, GitHub 응답 캐시, 토큰 확인 캐시, 분석 결과 캐시, 토큰별 rate limit 상태
+    return {
+        "db_pool": get_pool_status(),
+        "github_http_cache": get_http_cache_stats(),
+        "token_cache": get_token_cache_stats(),
+        "result_cache": get_result_cache_stats(),
+        "github_rate_limit": get_rate_limit_status()
+    }
+
 app.include_router(get.router)
 app.include_router(save.router)
+app.include_router(webhook.router)
 
 
 
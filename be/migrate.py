@@ -0,0 +1,183 @@
+"""
+be/migrations의 스키마 마이그레이션을 적용하거나 되돌려요.
+적용한 버전은 schema_migrations 테이블에 남아요.
+
+    python -m be.migrate status
+    python -m be.migrate upgrade [version] [--dry-run]
+    python -m be.migrate downgrade [version] [--dry-run]
+
+upgrade는 version까지(없으면 전부) 적용하고, downgrade는 version보다 뒤의 버전을 되돌려요(없으면 마지막 하나).
+
+마이그레이션 파일은 be/migrations/{4자리 버전}_{이름}.py 이고 UPGRADE, DOWNGRADE SQL 문자열을 가져요.
+CREATE INDEX CONCURRENTLY처럼 트랜잭션 안에서 실행할 수 없는 마이그레이션은 TRANSACTIONAL = False로 두고,
+한 번에 한 문장씩 실행되도록 UPGRADE, DOWNGRADE를 SQL 문자열의 리스트로 써요.
+"""
+from typing import Dict, List, Optional, Union
+from sqlalchemy import text
+import importlib.util
+import argparse
+import re
+import os
+from .database import engine
+
+MIGRATIONS_DIR: str = os.path.join(os.path.dirname(os.path.abspath(__file__)), "migrations")
+MIGRATION_FILE = re.compile(r"^(\d{4})_(\w+)\.py$")
+
+# 앱과 워커가 동시에 떠도 한 프로세스만 마이그레이션하도록 잡는 advisory lock 키
+MIGRATION_LOCK_KEY = 7_201_001
+
+
+def load_migrations() -> List[Dict]:
+    """
+    return: 버전 순서의 [{version, name, upgrade, downgrade, transactional}]
+    """
+    migrations: List[Dict] = []
+    for filename in sorted(os.listdir(MIGRATIONS_DIR)):
+        match = MIGRATION_FILE.match(filename)
+        if not match:
+            continue
+
+        spec = importlib.util.spec_from_file_location(f"be.migrations.m{match.group(1)}", os.path.join(MIGRATIONS_DIR, filename))
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+
+        migrations.append({
+            "version": match.group(1),
+            "name": match.group(2),
+            "upgrade": module.UPGRADE,
+            "downgrade": module.DOWNGRADE,
+            "transactional": getattr(module, "TRANSACTIONAL", True)
+        })
+    return migrations
+
+def _statements(sql: Union[str, List[str]]) -> List[str]:
+    return [sql] if isinstance(sql, str) else list(sql)
+
+def _execute_sql(conn, sql: Union[str, List[str]]) -> None:
+    # text()는 :name을, 드라이버는 %를 파라미터로 읽어서 SQL을 파라미터 없이 커서로 그대로 실행해요
+    cursor = conn.connection.cursor()
+    try:
+        for statement in _statements(sql):
+            cursor.execute(statement)
+    finally:
+        cursor.close()
+
+def _ensure_versions_table(conn) -> None:
+    conn.execute(text("""
+        CREATE TABLE IF NOT EXISTS schema_migrations (
+            version VARCHAR(4) PRIMARY KEY,
+            name VARCHAR(255) NOT NULL,
+            applied_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
+        )
+    """))
+
+def get_applied_versions(conn) -> List[str]:
+    _ensure_versions_table(conn)
+    return list(conn.execute(text("SELECT version FROM schema_migrations ORDER BY version")).scalars())
+
+def _run(migration: Dict, direction: str, dry_run: bool) -> None:
+    sql = migration[direction]
+    print(f"{direction:<8}| {migration['version']}_{migration['name']}")
+    if dry_run:
+        for statement in _statements(sql):
+            print(statement.strip() + "\n")
+        return
+
+    if direction == "upgrade":
+        record = text("INSERT INTO schema_migrations (version, name) VALUES (:version, :name)")
+    else:
+        record = text("DELETE FROM schema_migrations WHERE version = :version")
+    params = {"version": migration['version'], "name": migration['name']}
+
+    if migration['transactional']:
+        # DDL과 버전 기록을 한 트랜잭션으로 묶어서 중간에 실패하면 둘 다 되돌려요
+        with engine.begin() as conn:
+            _execute_sql(conn, sql)
+            conn.execute(record, params)
+    else:
+        with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+            _execute_sql(conn, sql)
+            conn.execute(record, params)
+
+def _locked_connection():
+    # advisory lock은 세션 단위라서 마이그레이션이 끝날 때까지 이 연결을 열어둬요
+    conn = engine.connect().execution_options(isolation_level="AUTOCOMMIT")
+    conn.execute(text("SELECT pg_advisory_lock(:key)"), {"key": MIGRATION_LOCK_KEY})
+    return conn
+
+def _release(conn) -> None:
+    try:
+        conn.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": MIGRATION_LOCK_KEY})
+    finally:
+        conn.close()
+
+def upgrade(target: Optional[str] = None, dry_run: bool = False) -> List[str]:
+    """
+    아직 적용하지 않은 마이그레이션을 target 버전까지 순서대로 적용해요.
+
+    return: 적용한 버전 목록
+    """
+    conn = _locked_connection()
+    try:
+        applied = set(get_applied_versions(conn))
+        pending = [m for m in load_migrations() if m['version'] not in applied and (target is None or m['version'] <= target)]
+
+        for migration in pending:
+            _run(migration, "upgrade", dry_run)
+        return [m['version'] for m in pending]
+    finally:
+        _release(conn)
+
+def downgrade(target: Optional[str] = None, dry_run: bool = False) -> List[str]:
+    """
+    target 버전보다 뒤에 적용된 마이그레이션을 최신 것부터 되돌려요. target이 없으면 마지막 하나만 되돌려요.
+
+    return: 되돌린 버전 목록
+    """
+    conn = _locked_connection()
+    try:
+        applied = get_applied_versions(conn)
+        migrations = {m['version']: m for m in load_migrations()}
+
+        if target is None:
+            versions = applied[-1:]
+        else:
+            versions = [version for version in applied if version > target]
+
+        for version in reversed(versions):
+            if version not in migrations:
+                raise RuntimeError(f"migration file for version {version} not found")
+            _run(migrations[version], "downgrade", dry_run)
+        return list(reversed(versions))
+    finally:
+        _release(conn)
+
+def status() -> List[Dict]:
+    """
+    return: [{version, name, applied}]
+    """
+    with engine.connect() as conn:
+        applied = set(get_applied_versions(conn))
+        conn.commit()
+    return [
+        {"version": m['version'], "name": m['name'], "applied": m['version'] in applied}
+        for m in load_migrations()
+    ]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(prog="python -m be.migrate")
+    parser.add_argument("command", choices=["status", "upgrade", "downgrade"])
+    parser.add_argument("version", nargs="?", default=None)
+    parser.add_argument("--dry-run", action="store_true", help="실행하지 않고 SQL만 출력")
+    args = parser.parse_args()
+
+    if args.command == "status":
+        for migration in status():
+            print(f"{'applied' if migration['applied'] else 'pending':<8}| {migration['version']}_{migration['name']}")
+    elif args.command == "upgrade":
+        versions = upgrade(args.version, args.dry_run)
+        print(f"        | {'would apply' if args.dry_run else 'applied'} {len(versions)} migrations")
+    else:
+        versions = downgrade(args.version, args.dry_run)
+        print(f"        | {'would revert' if args.dry_run else 'reverted'} {len(versions)} migrations")
@@ -0,0 +1,69 @@
+"""
+처음 스키마: 레포, 커밋, 변경 파일, 회고 결과
+마이그레이션 이전에 init_db로 만든 데이터베이스에서도 그대로 실행되도록 IF NOT EXISTS를 써요.
+"""
+
+UPGRADE = """
+CREATE TABLE IF NOT EXISTS repositories (
+    repo_id SERIAL PRIMARY KEY,
+    github_username VARCHAR(255) NOT NULL,
+    repo_name VARCHAR(255) NOT NULL,
+    repo_url VARCHAR(255) NOT NULL,
+    last_updated TIMESTAMP WITH TIME ZONE,
+    is_secret BOOLEAN DEFAULT FALSE,
+    UNIQUE(github_username, repo_url)
+);
+
+CREATE TABLE IF NOT EXISTS repo_recaps (
+    repo_recap_id SERIAL PRIMARY KEY,
+    github_username VARCHAR(255) NOT NULL,
+    repo_id INTEGER REFERENCES repositories(repo_id),
+    year INTEGER NOT NULL,
+    month INTEGER NOT NULL,
+    content TEXT NOT NULL,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+    UNIQUE(github_username, repo_id, year, month)
+);
+
+CREATE TABLE IF NOT EXISTS total_recaps(
+    total_recap_id SERIAL PRIMARY KEY,
+    github_username VARCHAR(255) NOT NULL,
+    year INTEGER NOT NULL,
+    month INTEGER NOT NULL,
+    content TEXT NOT NULL,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+    UNIQUE(github_username, year, month)
+);
+
+CREATE TABLE IF NOT EXISTS commits (
+    commit_id SERIAL PRIMARY KEY,
+    repo_id INTEGER REFERENCES repositories(repo_id),
+    commit_hash VARCHAR(40) NOT NULL,
+    commit_message TEXT,
+    commit_date TIMESTAMP WITH TIME ZONE NOT NULL,
+    author VARCHAR(255),
+    UNIQUE(repo_id, commit_hash)
+);
+
+CREATE TABLE IF NOT EXISTS code_changes (
+    change_id SERIAL PRIMARY KEY,
+    commit_id INTEGER REFERENCES commits(commit_id),
+    file_path TEXT NOT NULL,
+    change_type VARCHAR(10) NOT NULL,
+    content TEXT,
+    additions INTEGER,
+    deletions INTEGER,
+    changes INTEGER,
+    language VARCHAR(50)
+);
+"""
+
+DOWNGRADE = """
+DROP TABLE IF EXISTS code_changes;
+DROP TABLE IF EXISTS commits;
+DROP TABLE IF EXISTS total_recaps;
+DROP TABLE IF EXISTS repo_recaps;
+DROP TABLE IF EXISTS repositories;
+"""
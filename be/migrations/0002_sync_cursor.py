@@ -0,0 +1,13 @@
+"""
+증분 동기화 커서: 레포마다 마지막으로 동기화한 커밋
+"""
+
+UPGRADE = """
+ALTER TABLE repositories ADD COLUMN IF NOT EXISTS last_synced_commit_sha VARCHAR(40);
+ALTER TABLE repositories ADD COLUMN IF NOT EXISTS last_synced_commit_date TIMESTAMP WITH TIME ZONE;
+"""
+
+DOWNGRADE = """
+ALTER TABLE repositories DROP COLUMN IF EXISTS last_synced_commit_date;
+ALTER TABLE repositories DROP COLUMN IF EXISTS last_synced_commit_sha;
+"""
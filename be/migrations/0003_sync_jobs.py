@@ -0,0 +1,31 @@
+"""
+동기화 작업 큐 (be/worker.py가 처리)
+"""
+
+UPGRADE = """
+CREATE TABLE IF NOT EXISTS sync_jobs (
+    job_id SERIAL PRIMARY KEY,
+    github_username VARCHAR(255) NOT NULL,
+    repository JSONB NOT NULL,
+    start_date TIMESTAMP NOT NULL,
+    end_date TIMESTAMP NOT NULL,
+    github_token TEXT,
+    status VARCHAR(10) NOT NULL DEFAULT 'queued',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    max_attempts INTEGER NOT NULL DEFAULT 3,
+    last_error TEXT,
+    result JSONB,
+    worker_id VARCHAR(255),
+    available_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+    started_at TIMESTAMP WITH TIME ZONE,
+    finished_at TIMESTAMP WITH TIME ZONE
+);
+
+CREATE INDEX IF NOT EXISTS sync_jobs_queued_idx
+    ON sync_jobs (available_at, job_id) WHERE status = 'queued';
+"""
+
+DOWNGRADE = """
+DROP TABLE IF EXISTS sync_jobs;
+"""
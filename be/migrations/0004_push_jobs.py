@@ -0,0 +1,19 @@
+"""
+push webhook으로 들어온 커밋만 가져오는 작업 (kind = 'push')
+"""
+
+UPGRADE = """
+ALTER TABLE sync_jobs ADD COLUMN IF NOT EXISTS kind VARCHAR(10) NOT NULL DEFAULT 'repo';
+ALTER TABLE sync_jobs ADD COLUMN IF NOT EXISTS commit_shas TEXT[];
+ALTER TABLE sync_jobs ALTER COLUMN start_date DROP NOT NULL;
+ALTER TABLE sync_jobs ALTER COLUMN end_date DROP NOT NULL;
+"""
+
+# push 작업은 기간이 없어서 되돌리기 전에 지워요
+DOWNGRADE = """
+DELETE FROM sync_jobs WHERE kind = 'push';
+ALTER TABLE sync_jobs ALTER COLUMN end_date SET NOT NULL;
+ALTER TABLE sync_jobs ALTER COLUMN start_date SET NOT NULL;
+ALTER TABLE sync_jobs DROP COLUMN IF EXISTS commit_shas;
+ALTER TABLE sync_jobs DROP COLUMN IF EXISTS kind;
+"""
@@ -0,0 +1,18 @@
+"""
+압축된 patch와 크기 정보 (be/modules/patch_storage.py)
+"""
+
+UPGRADE = """
+ALTER TABLE code_changes ADD COLUMN IF NOT EXISTS content_data BYTEA;
+ALTER TABLE code_changes ADD COLUMN IF NOT EXISTS content_encoding VARCHAR(10);
+ALTER TABLE code_changes ADD COLUMN IF NOT EXISTS content_size INTEGER;
+ALTER TABLE code_changes ADD COLUMN IF NOT EXISTS content_truncated BOOLEAN NOT NULL DEFAULT FALSE;
+"""
+
+# content_data에만 있는 patch는 되돌리면 사라져요
+DOWNGRADE = """
+ALTER TABLE code_changes DROP COLUMN IF EXISTS content_truncated;
+ALTER TABLE code_changes DROP COLUMN IF EXISTS content_size;
+ALTER TABLE code_changes DROP COLUMN IF EXISTS content_encoding;
+ALTER TABLE code_changes DROP COLUMN IF EXISTS content_data;
+"""
@@ -0,0 +1,20 @@
+"""
+내용 기준(sha256)으로 한 번만 저장하는 patch, code_changes.patch_hash가 가리켜요
+"""
+
+UPGRADE = """
+CREATE TABLE IF NOT EXISTS patch_blobs (
+    blob_hash CHAR(64) PRIMARY KEY,
+    data BYTEA NOT NULL,
+    encoding VARCHAR(10) NOT NULL,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
+);
+
+ALTER TABLE code_changes ADD COLUMN IF NOT EXISTS patch_hash CHAR(64);
+"""
+
+# patch_blobs에만 있는 patch는 되돌리면 사라져요
+DOWNGRADE = """
+ALTER TABLE code_changes DROP COLUMN IF EXISTS patch_hash;
+DROP TABLE IF EXISTS patch_blobs;
+"""
@@ -0,0 +1,18 @@
+"""
+같은 커밋의 같은 파일은 한 행만 (save_repo_and_commits가 upsert해요)
+중복 행은 가장 나중에 저장한 행만 남겨요. 테이블이 크면 먼저 python -m be.scripts.compact_code_changes로 나눠서 정리해두세요.
+"""
+
+UPGRADE = """
+DELETE FROM code_changes older
+USING code_changes newer
+WHERE older.commit_id = newer.commit_id
+AND older.file_path = newer.file_path
+AND older.change_id < newer.change_id;
+
+CREATE UNIQUE INDEX IF NOT EXISTS code_changes_commit_file_key ON code_changes (commit_id, file_path);
+"""
+
+DOWNGRADE = """
+DROP INDEX IF EXISTS code_changes_commit_file_key;
+"""
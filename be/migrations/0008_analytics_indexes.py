@@ -0,0 +1,39 @@
+"""
+분석 쿼리(get_days, get_commit_num, get_used_language, combine_commits)용 인덱스
+CONCURRENTLY로 만들어서 만드는 동안에도 저장/조회가 막히지 않아요.
+
+- commits_repo_date_idx: 사용자 레포들의 기간 내 커밋, author/commit_hash까지 인덱스만 보고 세요
+- commits_repo_local_date_idx: 서울 기준 날짜별 집계, (commit_date AT TIME ZONE 'Asia/Seoul')::date와 똑같이 써야 타요
+- commits_author_date_idx: author 기준 기간 내 커밋 (combine_commits)
+- code_changes_commit_language_idx: 커밋별 언어 집계
+"""
+
+TRANSACTIONAL = False
+
+UPGRADE = [
+    """
+    CREATE INDEX CONCURRENTLY IF NOT EXISTS commits_repo_date_idx
+        ON commits (repo_id, commit_date) INCLUDE (author, commit_hash)
+    """,
+    """
+    CREATE INDEX CONCURRENTLY IF NOT EXISTS commits_repo_local_date_idx
+        ON commits (repo_id, ((commit_date AT TIME ZONE 'Asia/Seoul')::date))
+    """,
+    """
+    CREATE INDEX CONCURRENTLY IF NOT EXISTS commits_author_date_idx
+        ON commits (author, commit_date)
+    """,
+    """
+    CREATE INDEX CONCURRENTLY IF NOT EXISTS code_changes_commit_language_idx
+        ON code_changes (commit_id, language)
+    """,
+    "ANALYZE commits",
+    "ANALYZE code_changes",
+]
+
+DOWNGRADE = [
+    "DROP INDEX CONCURRENTLY IF EXISTS code_changes_commit_language_idx",
+    "DROP INDEX CONCURRENTLY IF EXISTS commits_author_date_idx",
+    "DROP INDEX CONCURRENTLY IF EXISTS commits_repo_local_date_idx",
+    "DROP INDEX CONCURRENTLY IF EXISTS commits_repo_date_idx",
+]
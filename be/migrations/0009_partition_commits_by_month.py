@@ -0,0 +1,199 @@
+"""
+commits, code_changes를 커밋 날짜(서울 기준 월)로 나눈 파티션 테이블로 바꿔요.
+한 달을 조회하는 쿼리는 그 달의 파티션 하나만 읽고, 오래된 달은 파티션째로 떼어낼 수 있어요(be/scripts/detach_month.py).
+
+- 파티션 키(commit_date)가 PK/UNIQUE에 들어가야 해서 키가 바뀌어요
+    commits: PK (commit_id, commit_date), UNIQUE (repo_id, commit_hash, commit_date)
+    code_changes: PK (change_id, commit_date), UNIQUE (commit_id, commit_date, file_path)
+- code_changes에 commit_date를 두고 (commit_id, commit_date)로 commits를 참조해요
+- 파티션은 ensure_commit_partitions(from, to)가 만들어요. 저장할 때와 앱/워커가 시작할 때 불러요(be/modules/partitions.py).
+  맞는 파티션이 없으면 DEFAULT 파티션에 들어가고, 나중에 그 달의 파티션을 만들 때 옮겨져요.
+"""
+
+ENSURE_PARTITIONS_FUNCTION = """
+CREATE OR REPLACE FUNCTION ensure_commit_partitions(from_date TIMESTAMP WITH TIME ZONE, to_date TIMESTAMP WITH TIME ZONE)
+RETURNS VOID LANGUAGE plpgsql AS $$
+DECLARE
+    month_start DATE := date_trunc('month', from_date AT TIME ZONE 'Asia/Seoul')::date;
+    last_month DATE := date_trunc('month', to_date AT TIME ZONE 'Asia/Seoul')::date;
+    suffix TEXT;
+    lower_bound TIMESTAMP WITH TIME ZONE;
+    upper_bound TIMESTAMP WITH TIME ZONE;
+BEGIN
+    WHILE month_start <= last_month LOOP
+        suffix := to_char(month_start, '"p"YYYY_MM');
+
+        IF to_regclass('commits_' || suffix) IS NULL THEN
+            -- 같은 파티션을 동시에 만들지 않도록 잠그고 다시 확인해요
+            PERFORM pg_advisory_xact_lock(hashtext('ensure_commit_partitions'));
+        END IF;
+
+        IF to_regclass('commits_' || suffix) IS NULL THEN
+            lower_bound := month_start::timestamp AT TIME ZONE 'Asia/Seoul';
+            upper_bound := (month_start + INTERVAL '1 month')::timestamp AT TIME ZONE 'Asia/Seoul';
+
+            -- CREATE TABLE ... PARTITION OF 대신 따로 만들고 ATTACH해서 부모 테이블을 오래 잠그지 않아요
+            EXECUTE format('CREATE TABLE %I (LIKE commits INCLUDING DEFAULTS INCLUDING CONSTRAINTS)', 'commits_' || suffix);
+            EXECUTE format('CREATE TABLE %I (LIKE code_changes INCLUDING DEFAULTS INCLUDING CONSTRAINTS)', 'code_changes_' || suffix);
+
+            -- DEFAULT 파티션에 들어가 있던 이 달의 행을 옮겨요 (참조하는 code_changes부터)
+            EXECUTE format(
+                'WITH moved AS (DELETE FROM code_changes_default WHERE commit_date >= $1 AND commit_date < $2 RETURNING *) INSERT INTO %I SELECT * FROM moved',
+                'code_changes_' || suffix
+            ) USING lower_bound, upper_bound;
+            EXECUTE format(
+                'WITH moved AS (DELETE FROM commits_default WHERE commit_date >= $1 AND commit_date < $2 RETURNING *) INSERT INTO %I SELECT * FROM moved',
+                'commits_' || suffix
+            ) USING lower_bound, upper_bound;
+
+            EXECUTE format('ALTER TABLE commits ATTACH PARTITION %I FOR VALUES FROM (%L) TO (%L)', 'commits_' || suffix, lower_bound, upper_bound);
+            EXECUTE format('ALTER TABLE code_changes ATTACH PARTITION %I FOR VALUES FROM (%L) TO (%L)', 'code_changes_' || suffix, lower_bound, upper_bound);
+        END IF;
+
+        month_start := month_start + INTERVAL '1 month';
+    END LOOP;
+END $$;
+"""
+
+UPGRADE = """
+ALTER TABLE code_changes RENAME TO code_changes_unpartitioned;
+ALTER TABLE commits RENAME TO commits_unpartitioned;
+ALTER SEQUENCE commits_commit_id_seq OWNED BY NONE;
+ALTER SEQUENCE code_changes_change_id_seq OWNED BY NONE;
+
+-- 기존 테이블의 인덱스 이름과 겹치지 않도록 키와 인덱스는 기존 테이블을 지운 뒤에 만들어요
+CREATE TABLE commits (
+    commit_id INTEGER NOT NULL DEFAULT nextval('commits_commit_id_seq'),
+    repo_id INTEGER,
+    commit_hash VARCHAR(40) NOT NULL,
+    commit_message TEXT,
+    commit_date TIMESTAMP WITH TIME ZONE NOT NULL,
+    author VARCHAR(255)
+) PARTITION BY RANGE (commit_date);
+
+CREATE TABLE code_changes (
+    change_id INTEGER NOT NULL DEFAULT nextval('code_changes_change_id_seq'),
+    commit_id INTEGER NOT NULL,
+    commit_date TIMESTAMP WITH TIME ZONE NOT NULL,
+    file_path TEXT NOT NULL,
+    change_type VARCHAR(10) NOT NULL,
+    content TEXT,
+    additions INTEGER,
+    deletions INTEGER,
+    changes INTEGER,
+    language VARCHAR(50),
+    content_data BYTEA,
+    content_encoding VARCHAR(10),
+    content_size INTEGER,
+    content_truncated BOOLEAN NOT NULL DEFAULT FALSE,
+    patch_hash CHAR(64)
+) PARTITION BY RANGE (commit_date);
+
+CREATE TABLE commits_default PARTITION OF commits DEFAULT;
+CREATE TABLE code_changes_default PARTITION OF code_changes DEFAULT;
+""" + ENSURE_PARTITIONS_FUNCTION + """
+SELECT ensure_commit_partitions(
+    COALESCE((SELECT MIN(commit_date) FROM commits_unpartitioned), CURRENT_TIMESTAMP),
+    GREATEST(COALESCE((SELECT MAX(commit_date) FROM commits_unpartitioned), CURRENT_TIMESTAMP), CURRENT_TIMESTAMP + INTERVAL '3 months')
+);
+
+INSERT INTO commits (commit_id, repo_id, commit_hash, commit_message, commit_date, author)
+SELECT commit_id, repo_id, commit_hash, commit_message, commit_date, author
+FROM commits_unpartitioned;
+
+INSERT INTO code_changes (
+    change_id, commit_id, commit_date, file_path, change_type, content, additions, deletions, changes, language,
+    content_data, content_encoding, content_size, content_truncated, patch_hash
+)
+SELECT cc.change_id, cc.commit_id, c.commit_date, cc.file_path, cc.change_type, cc.content, cc.additions, cc.deletions, cc.changes, cc.language,
+       cc.content_data, cc.content_encoding, cc.content_size, cc.content_truncated, cc.patch_hash
+FROM code_changes_unpartitioned cc
+JOIN commits_unpartitioned c ON cc.commit_id = c.commit_id;
+
+DROP TABLE code_changes_unpartitioned;
+DROP TABLE commits_unpartitioned;
+
+ALTER TABLE commits ADD CONSTRAINT commits_pkey PRIMARY KEY (commit_id, commit_date);
+ALTER TABLE commits ADD CONSTRAINT commits_repo_id_commit_hash_key UNIQUE (repo_id, commit_hash, commit_date);
+ALTER TABLE commits ADD CONSTRAINT commits_repo_id_fkey FOREIGN KEY (repo_id) REFERENCES repositories(repo_id);
+CREATE INDEX commits_repo_date_idx ON commits (repo_id, commit_date) INCLUDE (author, commit_hash);
+CREATE INDEX commits_repo_local_date_idx ON commits (repo_id, ((commit_date AT TIME ZONE 'Asia/Seoul')::date));
+CREATE INDEX commits_author_date_idx ON commits (author, commit_date);
+
+ALTER TABLE code_changes ADD CONSTRAINT code_changes_pkey PRIMARY KEY (change_id, commit_date);
+ALTER TABLE code_changes ADD CONSTRAINT code_changes_commit_id_fkey
+    FOREIGN KEY (commit_id, commit_date) REFERENCES commits (commit_id, commit_date);
+CREATE UNIQUE INDEX code_changes_commit_file_key ON code_changes (commit_id, commit_date, file_path);
+CREATE INDEX code_changes_commit_language_idx ON code_changes (commit_id, language);
+
+ALTER SEQUENCE commits_commit_id_seq OWNED BY commits.commit_id;
+ALTER SEQUENCE code_changes_change_id_seq OWNED BY code_changes.change_id;
+
+ANALYZE commits;
+ANALYZE code_changes;
+"""
+
+# 떼어낸(detach) 파티션의 행은 되돌릴 때 포함되지 않아요
+DOWNGRADE = """
+ALTER TABLE code_changes RENAME TO code_changes_partitioned;
+ALTER TABLE commits RENAME TO commits_partitioned;
+ALTER SEQUENCE commits_commit_id_seq OWNED BY NONE;
+ALTER SEQUENCE code_changes_change_id_seq OWNED BY NONE;
+
+CREATE TABLE commits (
+    commit_id INTEGER NOT NULL DEFAULT nextval('commits_commit_id_seq'),
+    repo_id INTEGER,
+    commit_hash VARCHAR(40) NOT NULL,
+    commit_message TEXT,
+    commit_date TIMESTAMP WITH TIME ZONE NOT NULL,
+    author VARCHAR(255)
+);
+
+CREATE TABLE code_changes (
+    change_id INTEGER NOT NULL DEFAULT nextval('code_changes_change_id_seq'),
+    commit_id INTEGER,
+    file_path TEXT NOT NULL,
+    change_type VARCHAR(10) NOT NULL,
+    content TEXT,
+    additions INTEGER,
+    deletions INTEGER,
+    changes INTEGER,
+    language VARCHAR(50),
+    content_data BYTEA,
+    content_encoding VARCHAR(10),
+    content_size INTEGER,
+    content_truncated BOOLEAN NOT NULL DEFAULT FALSE,
+    patch_hash CHAR(64)
+);
+
+INSERT INTO commits (commit_id, repo_id, commit_hash, commit_message, commit_date, author)
+SELECT commit_id, repo_id, commit_hash, commit_message, commit_date, author
+FROM commits_partitioned;
+
+INSERT INTO code_changes (
+    change_id, commit_id, file_path, change_type, content, additions, deletions, changes, language,
+    content_data, content_encoding, content_size, content_truncated, patch_hash
+)
+SELECT change_id, commit_id, file_path, change_type, content, additions, deletions, changes, language,
+       content_data, content_encoding, content_size, content_truncated, patch_hash
+FROM code_changes_partitioned;
+
+DROP TABLE code_changes_partitioned;
+DROP TABLE commits_partitioned;
+DROP FUNCTION IF EXISTS ensure_commit_partitions(TIMESTAMP WITH TIME ZONE, TIMESTAMP WITH TIME ZONE);
+
+ALTER TABLE commits ADD CONSTRAINT commits_pkey PRIMARY KEY (commit_id);
+ALTER TABLE commits ADD CONSTRAINT commits_repo_id_commit_hash_key UNIQUE (repo_id, commit_hash);
+ALTER TABLE commits ADD CONSTRAINT commits_repo_id_fkey FOREIGN KEY (repo_id) REFERENCES repositories(repo_id);
+CREATE INDEX commits_repo_date_idx ON commits (repo_id, commit_date) INCLUDE (author, commit_hash);
+CREATE INDEX commits_repo_local_date_idx ON commits (repo_id, ((commit_date AT TIME ZONE 'Asia/Seoul')::date));
+CREATE INDEX commits_author_date_idx ON commits (author, commit_date);
+
+ALTER TABLE code_changes ADD CONSTRAINT code_changes_pkey PRIMARY KEY (change_id);
+ALTER TABLE code_changes ADD CONSTRAINT code_changes_commit_id_fkey FOREIGN KEY (commit_id) REFERENCES commits(commit_id);
+CREATE UNIQUE INDEX code_changes_commit_file_key ON code_changes (commit_id, file_path);
+CREATE INDEX code_changes_commit_language_idx ON code_changes (commit_id, language);
+
+ALTER SEQUENCE commits_commit_id_seq OWNED BY commits.commit_id;
+ALTER SEQUENCE code_changes_change_id_seq OWNED BY code_changes.change_id;
+"""
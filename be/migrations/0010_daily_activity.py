@@ -0,0 +1,38 @@
+"""
+사용자/서울 기준 날짜/레포별 커밋 수와 추가/삭제 줄 수를 미리 모아둔 테이블
+save_repo_and_commits가 저장할 때 같은 트랜잭션에서 바뀐 날짜만 다시 계산하고, get_days가 읽어요.
+"""
+
+UPGRADE = """
+CREATE TABLE IF NOT EXISTS daily_activity (
+    github_username VARCHAR(255) NOT NULL,
+    local_date DATE NOT NULL,
+    repo_id INTEGER NOT NULL REFERENCES repositories(repo_id),
+    commit_count INTEGER NOT NULL,
+    additions INTEGER NOT NULL DEFAULT 0,
+    deletions INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (github_username, local_date, repo_id)
+);
+
+-- 이미 저장된 커밋으로 채워요
+INSERT INTO daily_activity (github_username, local_date, repo_id, commit_count, additions, deletions)
+SELECT r.github_username,
+       (c.commit_date AT TIME ZONE 'Asia/Seoul')::date,
+       c.repo_id,
+       COUNT(*),
+       COALESCE(SUM(s.additions), 0),
+       COALESCE(SUM(s.deletions), 0)
+FROM commits c
+JOIN repositories r ON c.repo_id = r.repo_id
+LEFT JOIN (
+    SELECT commit_id, commit_date, SUM(additions) AS additions, SUM(deletions) AS deletions
+    FROM code_changes
+    GROUP BY commit_id, commit_date
+) s ON s.commit_id = c.commit_id AND s.commit_date = c.commit_date
+GROUP BY r.github_username, (c.commit_date AT TIME ZONE 'Asia/Seoul')::date, c.repo_id
+ON CONFLICT (github_username, local_date, repo_id) DO NOTHING;
+"""
+
+DOWNGRADE = """
+DROP TABLE IF EXISTS daily_activity;
+"""
@@ -0,0 +1,17 @@
+"""
+워커 여러 개가 토큰 확인 결과(토큰 sha256 해시 -> GitHub login)를 같이 쓰는 캐시 테이블
+TOKEN_CACHE_BACKEND=postgres일 때만 써요. login이 NULL이면 유효하지 않은 토큰이에요.
+캐시라서 WAL을 남기지 않는 UNLOGGED 테이블로 만들어요 (DB가 비정상 종료되면 비워져요).
+"""
+
+UPGRADE = """
+CREATE UNLOGGED TABLE IF NOT EXISTS token_cache (
+    token_hash CHAR(64) PRIMARY KEY,
+    login VARCHAR(255),
+    expires_at TIMESTAMP WITH TIME ZONE NOT NULL
+);
+"""
+
+DOWNGRADE = """
+DROP TABLE IF EXISTS token_cache;
+"""
@@ -0,0 +1,17 @@
+"""
+사용자별 데이터 버전
+save_repo_and_commits가 저장하는 트랜잭션에서 1씩 올리고, 분석 결과 캐시(be/modules/result_cache.py)가 키에 넣어요.
+행이 없으면 버전 0으로 봐요.
+"""
+
+UPGRADE = """
+CREATE TABLE IF NOT EXISTS data_versions (
+    github_username VARCHAR(255) PRIMARY KEY,
+    version BIGINT NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
+);
+"""
+
+DOWNGRADE = """
+DROP TABLE IF EXISTS data_versions;
+"""
@@ -0,0 +1,12 @@
+"""
+워커가 작업을 처리하는 동안 주기적으로 남기는 heartbeat 시각
+requeue_stale_sync_jobs는 started_at 대신 이 시각으로 워커가 죽었는지 판단해요.
+"""
+
+UPGRADE = """
+ALTER TABLE sync_jobs ADD COLUMN IF NOT EXISTS heartbeat_at TIMESTAMP WITH TIME ZONE;
+"""
+
+DOWNGRADE = """
+ALTER TABLE sync_jobs DROP COLUMN IF EXISTS heartbeat_at;
+"""
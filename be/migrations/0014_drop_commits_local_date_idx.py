@@ -0,0 +1,13 @@
+"""
+commits_repo_local_date_idx 삭제
+서울 기준 날짜별 집계(get_days, activity_calendar)는 이제 daily_activity만 읽어서 이 인덱스를 쓰는 쿼리가 없어요.
+commits가 파티션 테이블이라 CONCURRENTLY 없이 지워요 (각 파티션의 인덱스도 같이 지워져요).
+"""
+
+UPGRADE = """
+DROP INDEX IF EXISTS commits_repo_local_date_idx;
+"""
+
+DOWNGRADE = """
+CREATE INDEX IF NOT EXISTS commits_repo_local_date_idx ON commits (repo_id, ((commit_date AT TIME ZONE 'Asia/Seoul')::date));
+"""
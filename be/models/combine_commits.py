@@ -1,13 +1,13 @@
 from sqlalchemy import text
 try:
-    from ..modules import validate_date_n_token
+    from ..modules import validate_date_n_token, decode_patch
     from .. import SessionLocal
 except ImportError:
     import sys
     import os
     sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
     from be import SessionLocal
-    from be.modules import validate_date_n_token
+    from be.modules import validate_date_n_token, decode_patch
 from typing import List, Dict
 from sqlalchemy.orm import Session
 
@@ -62,9 +62,12 @@ def create_human_prompt(commit_id: int, repo_id: int) -> str:
             c.commit_message,
             cc.file_path,
             cc.change_type,
-            cc.content
+            cc.content,
+            COALESCE(pb.data, cc.content_data) AS content_data,
+            COALESCE(pb.encoding, cc.content_encoding) AS content_encoding
         FROM commits c
-        LEFT JOIN code_changes cc ON c.commit_id = cc.commit_id
+        LEFT JOIN code_changes cc ON c.commit_id = cc.commit_id AND c.commit_date = cc.commit_date
+        LEFT JOIN patch_blobs pb ON cc.patch_hash = pb.blob_hash
         WHERE c.commit_id = :commit_id
         ORDER BY cc.file_path
     """)
@@ -87,7 +90,8 @@ def create_human_prompt(commit_id: int, repo_id: int) -> str:
         for change in changes_result:
             output.append(f"\t- changed file: {change.file_path}")
             output.append(f"\t\t- type: {change.change_type}")
-            output.append(f"\t\t- content: '''\n{change.content}\n'''")
+            content = decode_patch(change.content_data, change.content_encoding, change.content)
+            output.append(f"\t\t- content: '''\n{content}\n'''")
             output.append("") 
         
         return "\n".join(output)
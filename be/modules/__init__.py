@@ -1,6 +1,18 @@
+from .github_client import init_github_session, get_github_session, close_github_session
+from .rate_limit import send_github_request, get_rate_limit_status, PRIORITY_INTERACTIVE, PRIORITY_BACKGROUND
+from .github_http import github_get, get_http_cache_stats, prune_http_cache
 from .fetch_user_repos import get_user_repos
-from .fetch_user_commit import get_user_commits, get_latest_commit_sha
+from .fetch_user_commit import get_user_commits, get_sync_cursor
+from .partitions import ensure_commit_partitions, ensure_future_partitions, get_commit_partitions
+from .patch_storage import encode_patch, encode_commit_patches, store_patch_blobs, decode_patch
 from .save_repo_n_commits import save_repo_and_commits, check_repo_update_needed
-from .validate_values import validate_date_n_token
-from .get_commit_num import get_total_commit_num, get_specific_repo_commit_num  
-from .get_days import get_active_days, get_longest_streak, get_longest_gap, get_total_days, get_each_day_commit_count
\ No newline at end of file
+from .validate_values import validate_date_n_token, validate_range_n_token, validate_token, get_token_cache_stats
+from .get_commit_num import get_total_commit_num, get_specific_repo_commit_num, get_commit_num_between
+from .result_cache import cached_result, get_data_version, clear_result_cache, get_result_cache_stats
+from .activity_calendar import to_bitmap, summarize_calendar
+from .get_days import get_active_days, get_longest_streak, get_longest_gap, get_total_days, get_each_day_commit_count, get_daily_repo_commits, calc_longest_streak, calc_longest_gap
+from .get_used_language import get_used_languages
+from .get_summary import get_month_summary, summarize_range, get_range_summary, get_rolling_summary, get_year_summary
+from .sync_repo import sync_repository, sync_pushed_commits, sync_all_repositories
+from .sync_queue import enqueue_sync_job, enqueue_push_job, claim_sync_job, heartbeat_sync_job, complete_sync_job, fail_sync_job, requeue_stale_sync_jobs, get_sync_job_status
+from .webhook import verify_webhook_signature, parse_push_event, handle_push_event
\ No newline at end of file
@@ -0,0 +1,120 @@
+from datetime import date, timedelta
+from typing import Dict, Iterable, List
+
+# 커밋한 날(서울 기준)을 start_date부터 하루에 1비트씩 쓴 정수(bitmap)로 다뤄요.
+# start_date + i일에 커밋했으면 i번째 비트가 1이에요. 1년이면 365비트라서 한 달이든 전체 기간이든 같은 방식으로 계산해요.
+# 연속된 날(streak)과 쉰 날(gap)은 날짜를 하나씩 돌지 않고 bitmap 전체에 대한 시프트/AND 연산으로 계산해요.
+
+WEEKDAYS = ["mon", "tue", "wed", "thu", "fri", "sat", "sun"]
+
+
+def to_bitmap(commit_dates: Iterable[date], start_date: date, end_date: date) -> int:
+    """
+    start_date ~ end_date(포함하지 않음) 사이의 커밋 날짜들로 bitmap을 만들어요. 범위 밖의 날짜는 무시해요.
+    """
+    days = (end_date - start_date).days
+    bitmap = 0
+    for commit_date in commit_dates:
+        offset = (commit_date - start_date).days
+        if 0 <= offset < days:
+            bitmap |= 1 << offset
+    return bitmap
+
+def _longest_run(bitmap: int) -> int:
+    """
+    bitmap에서 가장 길게 이어진 1의 개수
+    runs는 length일 이상 이어진 구간의 시작 비트만 남긴 값이에요. 길이를 두 배씩 늘려보고, 남은 길이는 절반씩 붙여봐서
+    가장 긴 구간이 n일이어도 정수 연산 2*log2(n)번으로 끝나요.
+    """
+    if not bitmap:
+        return 0
+
+    runs = bitmap
+    length = 1
+    while runs & (runs >> length):
+        runs &= runs >> length
+        length *= 2
+
+    step = length // 2
+    while step:
+        longer = runs & (runs >> step)
+        if longer:
+            runs = longer
+            length += step
+        step //= 2
+    return length
+
+def count_active_days(bitmap: int) -> int:
+    # int.bit_count는 python 3.10부터 있어요
+    return bitmap.bit_count() if hasattr(bitmap, "bit_count") else bin(bitmap).count("1")
+
+def longest_streak(bitmap: int) -> int:
+    """
+    가장 길게 연속으로 커밋한 날 수
+    """
+    return _longest_run(bitmap)
+
+def longest_gap(bitmap: int, days: int) -> int:
+    """
+    days일 중 가장 길게 연속으로 커밋하지 않은 날 수
+    """
+    if days <= 0:
+        return 0
+    return _longest_run(~bitmap & ((1 << days) - 1))
+
+def current_streak(bitmap: int, days: int) -> int:
+    """
+    마지막 날부터 거꾸로 세서 연속으로 커밋한 날 수 (마지막 날에 커밋하지 않았으면 0)
+    """
+    if days <= 0:
+        return 0
+    # 커밋하지 않은 날 중 가장 마지막 날 뒤로는 모두 커밋한 날이에요
+    inactive = ~bitmap & ((1 << days) - 1)
+    return days - inactive.bit_length()
+
+def weekday_distribution(bitmap: int, start_date: date, days: int) -> Dict[str, int]:
+    """
+    요일별로 커밋한 날 수 {mon: n, ..., sun: n}
+    """
+    # 7비트마다 1인 마스크(2^0 + 2^7 + 2^14 + ...)를 요일별로 밀어서 겹치는 비트 수를 세요
+    every_week = ((1 << (7 * ((days + 6) // 7))) - 1) // 127
+    bitmap &= (1 << days) - 1
+    distribution: Dict[str, int] = {}
+    for offset in range(7):
+        weekday = WEEKDAYS[(start_date.weekday() + offset) % 7]
+        distribution[weekday] = count_active_days(bitmap & (every_week << offset))
+    return dict((weekday, distribution[weekday]) for weekday in WEEKDAYS)
+
+def active_dates(bitmap: int, start_date: date) -> List[date]:
+    """
+    bitmap을 다시 커밋 날짜 목록으로 바꿔요 (오래된 날짜부터)
+    """
+    return [start_date + timedelta(days=offset) for offset, bit in enumerate(reversed(bin(bitmap)[2:])) if bit == "1"]
+
+def summarize_calendar(bitmap: int, start_date: date, end_date: date) -> Dict:
+    """
+    return: start_date ~ end_date(포함하지 않음) 기간의 {days, active_days, longest_streak, longest_gap, current_streak, weekday_distribution}
+    """
+    days = (end_date - start_date).days
+    bitmap &= (1 << max(days, 0)) - 1
+    return {
+        "days": days,
+        "active_days": count_active_days(bitmap),
+        "longest_streak": longest_streak(bitmap),
+        "longest_gap": longest_gap(bitmap, days),
+        "current_streak": current_streak(bitmap, days),
+        "weekday_distribution": weekday_distribution(bitmap, start_date, days)
+    }
+
+
+if __name__ == "__main__":
+    import timeit
+    from icecream import ic
+
+    start = date(2015, 1, 1)
+    end = date(2025, 1, 1)
+    # 10년 동안 3일에 이틀씩 커밋했다고 가정
+    bitmap = to_bitmap((start + timedelta(days=i) for i in range((end - start).days) if i % 3), start, end)
+
+    ic(summarize_calendar(bitmap, start, end))
+    ic(timeit.timeit(lambda: summarize_calendar(bitmap, start, end), number=1000) / 1000 * 1e6)
@@ -1,29 +1,59 @@
 import requests
-from datetime import datetime
-from typing import List, Dict, Union
+from datetime import datetime, timezone
+from typing import List, Dict, Union, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor
 import os
 import dotenv
 from icecream import ic
 try:
     from .. import SessionLocal
+    from .github_http import github_get
+    from .rate_limit import PRIORITY_BACKGROUND
 except ImportError:
     import sys
     import os
     sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
     from be import SessionLocal
+    from be.modules.github_http import github_get
+    from be.modules.rate_limit import PRIORITY_BACKGROUND
 from sqlalchemy import text
 
 
 dotenv.load_dotenv()
 
-def get_user_commits(token: str, user: str, repo_name: str, start_date: datetime, end_date: datetime, latest_commit_sha: str = None) -> Union[List[Dict], tuple]:
+# 커밋 상세 정보를 동시에 가져올 최대 요청 수
+GITHUB_FETCH_CONCURRENCY: int = int(os.getenv("GITHUB_FETCH_CONCURRENCY", "8"))
+
+# 커밋 수집 방식: rest(기본) 또는 git(로컬 mirror)
+# (GraphQL Commit에는 파일별 변경 내역이 없어서 커밋마다 REST 상세 호출이 그대로 남아요. 호출 수가 줄지 않아서 GraphQL 방식은 두지 않아요)
+GITHUB_COMMIT_BACKEND: str = os.getenv("GITHUB_COMMIT_BACKEND", "rest").lower()
+
+def get_user_commits(token: str, user: str, repo_name: str, start_date: datetime, end_date: datetime, latest_commit_sha: str = None, latest_commit_date: Optional[datetime] = None, session: Optional[requests.Session] = None) -> Union[List[Dict], tuple]:
     """
     주어진 레포지토리 이름과 날짜 범위에 대한 커밋 정보를 가져옴.
-    latest_commit_sha가 제공되면, 해당 커밋 이후의 새로운 커밋만 가져옴.
+    동기화 커서(latest_commit_sha, latest_commit_date)가 이번 기간 안에 있으면 커서 시점부터(since) 조회하고,
+    페이지를 넘기다가 커서 커밋을 만나면 중단해서 새로운 커밋만 가져옴.
 
     params:
-      - latest_commit_sha: DB에 저장된 가장 최근 커밋의 SHA (None이면 모든 커밋을 가져옴)
+      - latest_commit_sha: 마지막으로 동기화한 커밋의 SHA (None이면 기간 내 모든 커밋을 가져옴)
+      - latest_commit_date: 마지막으로 동기화한 커밋의 날짜
+      - session: GitHub 요청에 사용할 세션 (None이면 앱 공유 세션)
+
+    GITHUB_COMMIT_BACKEND=git이면 로컬 git mirror 수집 방식을 사용함.
     """
+    since_date: datetime = start_date
+    if latest_commit_sha and latest_commit_date:
+        cursor_date = _to_naive_utc(latest_commit_date)
+        if start_date <= cursor_date <= end_date:
+            since_date = cursor_date
+        else:
+            # 커서가 기간 밖이면 이번 기간은 처음부터 가져옴
+            latest_commit_sha = None
+
+    if GITHUB_COMMIT_BACKEND == "git":
+        from .git_mirror import get_user_commits_git
+        return get_user_commits_git(token, user, repo_name, since_date, end_date, latest_commit_sha)
+
     print(f"        | repository: {repo_name}, get commits")
 
     url: str = f"https://api.github.com/repos/{user}/{repo_name}/commits"
@@ -31,87 +61,139 @@ def get_user_commits(token: str, user: str, repo_name: str, start_date: datetime
         'Authorization': f'token {token}',
         'Accept': 'application/vnd.github.v3+json'
     }
-    params: Dict[str, str] = {
-        'since': start_date.isoformat(),
+    params: Optional[Dict[str, str]] = {
+        'since': since_date.isoformat(),
         'until': end_date.isoformat(),
         'per_page': 100
     }
     
     all_commits: List[Dict] = []
+    reached_cursor: bool = False
     
-    while True:
-        response: requests.Response = requests.get(url, headers=headers, params=params)
+    while not reached_cursor:
+        response: requests.Response = github_get(url, headers, params, PRIORITY_BACKGROUND, session)
         
         if response.status_code == 200:
             commits: List[Dict] = response.json()
             
-            # 최신 커밋을 찾았거나 더 이상의 커밋이 없으면 중단
-            if latest_commit_sha:
-                for commit in commits:
-                    if commit['sha'] == latest_commit_sha:
-                        break
-                new_commits = [c for c in commits if c['sha'] != latest_commit_sha]
-                all_commits.extend(new_commits)
-                break
-            else:
-                all_commits.extend(commits)
+            # 커서 커밋을 만나면 그 뒤는 이미 저장된 커밋이라 중단
+            for commit in commits:
+                if commit['sha'] == latest_commit_sha:
+                    reached_cursor = True
+                    break
+                all_commits.append(commit)
             
             if 'next' in response.links:
+                # next url에 쿼리가 이미 들어있음
                 url = response.links['next']['url']
+                params = None
             else:
                 break
         else:
             return (response.status_code, response.text)
 
+    details = fetch_commit_details(token, user, repo_name, [commit['sha'] for commit in all_commits], session=session)
+
     detailed_commits = []
-    for i, commit in enumerate(all_commits, 1):
-        print(f"        | Fetching details for commit {i}/{len(all_commits)}: {commit['sha'][:7]}")
-            
-        commit_url = f"https://api.github.com/repos/{user}/{repo_name}/commits/{commit['sha']}"
-        commit_response = requests.get(commit_url, headers=headers)
+    for detail in details:
+        # 하나라도 실패하면 기존처럼 (status_code, text)를 반환
+        if isinstance(detail, tuple):
+            return detail
+        detailed_commits.append(detail)
+
+    return detailed_commits
+
+def fetch_commit_details(token: str, user: str, repo_name: str, shas: List[str], max_workers: Optional[int] = None, session: Optional[requests.Session] = None) -> List[Union[Dict, tuple]]:
+    """
+    커밋 SHA 목록의 상세 정보(변경된 파일 포함)를 스레드 풀로 동시에 가져와요.
+    결과는 shas와 같은 순서로 반환되고, 실패한 요청은 다른 요청에 영향을 주지 않고 그 자리에 (status_code, text) 튜플로 들어가요.
+
+    params:
+      - max_workers: 동시에 보낼 최대 요청 수 (None이면 GITHUB_FETCH_CONCURRENCY)
+      - session: GitHub 요청에 사용할 세션 (None이면 앱 공유 세션)
+    """
+    headers: Dict[str, str] = {
+        'Authorization': f'token {token}',
+        'Accept': 'application/vnd.github.v3+json'
+    }
+    total: int = len(shas)
+
+    def fetch(indexed_sha: tuple) -> Union[Dict, tuple]:
+        i, sha = indexed_sha
+        print(f"        | Fetching details for commit {i}/{total}: {sha[:7]}")
+
+        commit_url = f"https://api.github.com/repos/{user}/{repo_name}/commits/{sha}"
+        try:
+            commit_response = github_get(commit_url, headers, priority=PRIORITY_BACKGROUND, session=session)
+        except requests.RequestException as e:
+            return (None, str(e))
+
         if commit_response.status_code == 200:
-            commit_data = commit_response.json()
-            detailed_commits.append({
-                'sha': commit['sha'],
-                'commit_message': commit['commit']['message'],
-                'author': commit['commit']['author']['name'],
-                'date': commit['commit']['author']['date'],
-                'files_changed': [
-                    {
-                        'filename': file['filename'],
-                        'status': file['status'],
-                        'additions': file['additions'],
-                        'deletions': file['deletions'],
-                        'changes': file['changes'],
-                        'patch': file.get('patch', ''),
-                        'language': os.path.splitext(file['filename'])[1].lower() or 'none'
-                    } for file in commit_data['files']
-                ]
-            })
+            return parse_commit_detail(commit_response.json())
         else:
             return (commit_response.status_code, commit_response.text)
-    
-    return detailed_commits
 
-def get_latest_commit_sha(user: str, repo_url: str) -> str:
+    if not shas:
+        return []
+
+    workers: int = max(1, min(max_workers or GITHUB_FETCH_CONCURRENCY, total))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(fetch, enumerate(shas, 1)))
+
+def parse_commit_detail(commit_data: Dict) -> Dict:
+    """
+    GET /repos/{user}/{repo}/commits/{sha} 응답을 save_repo_and_commits가 쓰는 커밋 레코드로 바꿔요.
+    """
+    return {
+        'sha': commit_data['sha'],
+        'commit_message': commit_data['commit']['message'],
+        'author': commit_data['commit']['author']['name'],
+        'date': commit_data['commit']['author']['date'],
+        'files_changed': [
+            {
+                'filename': file['filename'],
+                'status': file['status'],
+                'additions': file['additions'],
+                'deletions': file['deletions'],
+                'changes': file['changes'],
+                'patch': file.get('patch', ''),
+                'language': os.path.splitext(file['filename'])[1].lower() or 'none'
+            } for file in commit_data.get('files', [])
+        ]
+    }
+
+def _to_naive_utc(value: datetime) -> datetime:
+    return value.astimezone(timezone.utc).replace(tzinfo=None) if value.tzinfo else value
+
+def get_sync_cursor(user: str, repo_url: str) -> Optional[Tuple[str, datetime]]:
     """
-    DB에서 특정 레포의 가장 최근 커밋 SHA를 가져옴
+    DB에서 특정 레포의 동기화 커서(마지막으로 동기화한 커밋의 SHA, 날짜)를 가져옴
+    커서가 아직 없는 레포는 저장된 커밋 중 가장 최근 커밋을 커서로 사용함
 
     args:
         user (str)
         repo_url (str)
 
     return:
-        str: 가장 최근 커밋의 SHA. 커밋이 없으면 None 반환
+        (sha, commit_date): 동기화 커서. 저장된 커밋이 없으면 None 반환
     """
     with SessionLocal() as session:
         query = text("""
-            SELECT c.commit_hash
-            FROM commits c
-            JOIN repositories r ON c.repo_id = r.repo_id
+            SELECT r.last_synced_commit_sha, r.last_synced_commit_date
+            FROM repositories r
             WHERE r.github_username = :username 
             AND r.repo_url = :repo_url
-            ORDER BY c.commit_date DESC
+            AND r.last_synced_commit_sha IS NOT NULL
+            UNION ALL
+            (
+                SELECT c.commit_hash, c.commit_date
+                FROM commits c
+                JOIN repositories r ON c.repo_id = r.repo_id
+                WHERE r.github_username = :username 
+                AND r.repo_url = :repo_url
+                ORDER BY c.commit_date DESC
+                LIMIT 1
+            )
             LIMIT 1
         """)
         
@@ -120,7 +202,7 @@ def get_latest_commit_sha(user: str, repo_url: str) -> str:
             "repo_url": repo_url
         }).first()
         
-        return result[0] if result else None
+        return (result[0], result[1]) if result else None
 
 if __name__ == "__main__":
     token: str = os.getenv("GITHUB_TOKEN")
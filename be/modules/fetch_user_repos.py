@@ -1,14 +1,20 @@
 import requests
 from datetime import datetime
 from icecream import ic
-from typing import List, Dict
+from typing import List, Dict, Optional
 import os
 import dotenv
+try:
+    from .github_http import github_get
+except ImportError:
+    import sys
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+    from be.modules.github_http import github_get
 
 dotenv.load_dotenv()
 
 
-def get_user_repos(token: str, start_date: datetime, end_date: datetime) -> List[Dict] | tuple:
+def get_user_repos(token: str, start_date: datetime, end_date: datetime, session: Optional[requests.Session] = None) -> List[Dict] | tuple:
     """
     start_date, end_date 사이에 있는 모든 레포(레포이름, url, private유무, 최종업뎃날짜) 가져옴
     private 레포지토리도 포함
@@ -18,6 +24,8 @@ def get_user_repos(token: str, start_date: datetime, end_date: datetime) -> List
       'end_date': end_date.strftime('%Y-%m-%d')
     }
     
+    session: GitHub 요청에 사용할 세션 (None이면 앱 공유 세션)
+
     return: List[Dict] | tuple
     """
 
@@ -33,7 +41,7 @@ def get_user_repos(token: str, start_date: datetime, end_date: datetime) -> List
         'per_page': 100
     }
     
-    response: requests.Response = requests.get(url, headers=headers, params=params)
+    response: requests.Response = github_get(url, headers, params, session=session)
     
     if response.status_code == 200:
         repos: List[Dict] = response.json()
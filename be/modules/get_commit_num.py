@@ -3,69 +3,77 @@ from sqlalchemy import text
 from sqlalchemy.orm import Session
 try:
     from . import validate_date_n_token
-    from .. import SessionLocal
+    from .. import session_scope
+    from .result_cache import cached_result
 except ImportError:
     import sys
     import os
     sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
-    from be import SessionLocal
+    from be import session_scope
     from be.modules import validate_date_n_token
+    from be.modules.result_cache import cached_result
 from typing import Optional 
 
-def get_total_commit_num(github_token: str, user: str, year: Optional[int], month: Optional[int]) -> int:
+def get_total_commit_num(github_token: str, user: str, year: Optional[int], month: Optional[int], db: Optional[Session] = None) -> int:
     """
     github_token, user, year, month를 받아서 커밋 수를 반환해요.
     """
 
-    start_date, end_date = validate_date_n_token(year, month, github_token)
-    
-    db: Session = SessionLocal()
-    try:
-        query = text("""
-            SELECT COUNT(DISTINCT c.commit_hash)
-            FROM commits c
-            JOIN repositories r ON c.repo_id = r.repo_id
-            WHERE r.github_username = :username
-            AND c.commit_date BETWEEN :start_date AND :end_date
-            AND c.author = :username
-        """)
+    start_date, end_date = validate_date_n_token(user, year, month, github_token, db=db)
+
+    return get_commit_num_between(user, start_date, end_date, db)
+
+def get_commit_num_between(user: str, start_date: datetime, end_date: datetime, db: Optional[Session] = None) -> int:
+    """
+    토큰 확인 없이 start_date ~ end_date 동안 user가 작성한 커밋 수를 반환해요.
+    """
+    def count() -> int:
+        with session_scope(db) as session:
+            query = text("""
+                SELECT COUNT(DISTINCT c.commit_hash)
+                FROM commits c
+                JOIN repositories r ON c.repo_id = r.repo_id
+                WHERE r.github_username = :username
+                AND c.commit_date BETWEEN :start_date AND :end_date
+                AND c.author = :username
+            """)
         
-        result = db.execute(query, {
-            "username": user,
-            "start_date": start_date,
-            "end_date": end_date
-        }).scalar()
+            result = session.execute(query, {
+                "username": user,
+                "start_date": start_date,
+                "end_date": end_date
+            }).scalar()
         
-        return result or 0
-    finally:
-        db.close()
+            return result or 0
+
+    return cached_result("commit_num", user, (start_date, end_date), count, db)
 
-def get_specific_repo_commit_num(github_token: str, user: str, repo_name: str, year: Optional[int], month: Optional[int]) -> int:
+def get_specific_repo_commit_num(github_token: str, user: str, repo_name: str, year: Optional[int], month: Optional[int], db: Optional[Session] = None) -> int:
     """
     github_token, user, repo_name, year, month를 받아서 특정 레포의 커밋 수를 반환해요.
     """
     
-    start_date, end_date = validate_date_n_token(year, month, github_token)
+    start_date, end_date = validate_date_n_token(user, year, month, github_token, db=db)
 
-    db: Session = SessionLocal()
-    try:
-        query = text("""
-            SELECT COUNT(DISTINCT c.commit_hash)
-            FROM commits c
-            JOIN repositories r ON c.repo_id = r.repo_id
-            WHERE r.github_username = :username
-            AND r.repo_name = :repo_name
-            AND c.commit_date BETWEEN :start_date AND :end_date
-            AND c.author = :username
-        """)
+    def count() -> int:
+        with session_scope(db) as session:
+            query = text("""
+                SELECT COUNT(DISTINCT c.commit_hash)
+                FROM commits c
+                JOIN repositories r ON c.repo_id = r.repo_id
+                WHERE r.github_username = :username
+                AND r.repo_name = :repo_name
+                AND c.commit_date BETWEEN :start_date AND :end_date
+                AND c.author = :username
+            """)
         
-        result = db.execute(query, {
-            "username": user,
-            "repo_name": repo_name,
-            "start_date": start_date,
-            "end_date": end_date
-        }).scalar()
+            result = session.execute(query, {
+                "username": user,
+                "repo_name": repo_name,
+                "start_date": start_date,
+                "end_date": end_date
+            }).scalar()
         
-        return result or 0
-    finally:
-        db.close()
\ No newline at end of file
+            return result or 0
+
+    return cached_result("repo_commit_num", user, (repo_name, start_date, end_date), count, db)
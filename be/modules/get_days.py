@@ -1,16 +1,20 @@
-from typing import List, Tuple
+from typing import List, Optional, Tuple
 from sqlalchemy.orm import Session
 from sqlalchemy import func, distinct
 try:
     from . import validate_date_n_token
-    from .. import SessionLocal
+    from .. import session_scope
+    from .activity_calendar import to_bitmap, longest_streak, longest_gap
+    from .result_cache import cached_result
 except ImportError:
     import sys
     import os
     sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
-    from be import SessionLocal
+    from be import session_scope
     from be.modules import validate_date_n_token
-from datetime import datetime
+    from be.modules.activity_calendar import to_bitmap, longest_streak, longest_gap
+    from be.modules.result_cache import cached_result
+from datetime import date, datetime, timedelta
 from sqlalchemy.sql import text
 from icecream import ic
 import calendar
@@ -22,140 +26,112 @@ def get_total_days(year: int, month: int) -> int:
     """
     return calendar.monthrange(year, month)[1]
 
-def get_active_days(github_username: str, github_token: str, year: int, month: int) -> int:
+def calc_longest_streak(commit_dates: List[date]) -> int:
+    """
+    정렬된 커밋 날짜들에서 가장 긴 연속 커밋 기간을 계산
+    """
+    if not commit_dates:
+        return 0
+    return longest_streak(to_bitmap(commit_dates, commit_dates[0], commit_dates[-1] + timedelta(days=1)))
+
+def calc_longest_gap(commit_dates: List[date], start_date: date, end_date: date) -> int:
+    """
+    커밋 날짜들에서 start_date부터 end_date(포함하지 않음)까지 가장 길게 커밋하지 않은 기간을 계산
+    """
+    return longest_gap(to_bitmap(commit_dates, start_date, end_date), (end_date - start_date).days)
+
+def get_daily_repo_commits(github_username: str, start_date: date, end_date: date, db: Optional[Session] = None) -> List[Tuple[date, str, int]]:
+    """
+    토큰 확인 없이 start_date ~ end_date(서울 기준 날짜, 둘 다 포함)의 날짜별 레포 커밋 수를 daily_activity에서 가져와요.
+    결과는 캐시와 같은 리스트라서 고치면 안 돼요.
+    Returns: [(date, repo_name, commit_count)] 날짜, 레포 이름 순
+    """
+    def fetch() -> List[Tuple[date, str, int]]:
+        with session_scope(db) as session:
+            results = session.execute(text("""
+                SELECT 
+                    da.local_date as commit_date,
+                    r.repo_name,
+                    SUM(da.commit_count) as commit_count
+                FROM daily_activity da
+                JOIN repositories r ON da.repo_id = r.repo_id
+                WHERE da.github_username = :username
+                AND da.local_date BETWEEN :start_date AND :end_date
+                GROUP BY da.local_date, r.repo_name
+                ORDER BY commit_date, r.repo_name
+            """), {
+                "username": github_username,
+                "start_date": start_date,
+                "end_date": end_date
+            })
+
+            return [(row[0], row[1], int(row[2])) for row in results]
+
+    # 월별 지표, 요약이 모두 이 결과에서 계산돼서 여기서 캐시해요 (저장하면 데이터 버전이 바뀌어서 다시 읽어요)
+    return cached_result("daily_repo_commits", github_username, (start_date, end_date), fetch, db)
+
+def get_active_days(github_username: str, github_token: str, year: int, month: int, db: Optional[Session] = None) -> int:
     """
     github_username, github_token, year, month를 받아서 해당 기간동안 커밋된 날짜의 수를 반환
     Returns: active_days(int) 실제로 커밋한 날짜 수
     """
-    db = SessionLocal()
-    try:
-        start_date, end_date = validate_date_n_token(github_username, year, month, github_token)
-        ic(start_date, end_date)
-
-        active_days = len(get_each_day_commit_count(github_username, github_token, year, month))
+    with session_scope(db) as db:
+        try:
+            start_date, end_date = validate_date_n_token(github_username, year, month, github_token, db=db)
+            ic(start_date, end_date)
+
+            # 같은 날 여러 레포에 커밋해도 하루로 세요
+            daily_repo_commits = get_daily_repo_commits(github_username, start_date.date(), end_date.date(), db)
+            active_days = len({commit_date for commit_date, _, _ in daily_repo_commits})
         
-        return active_days
-    
-    except Exception as e:
-        raise Exception(f"get active days err: {str(e)}")
+            return active_days
     
-    finally:
-        db.close()
+        except Exception as e:
+            raise Exception(f"get active days err: {str(e)}")
 
-def get_longest_streak(github_username: str, github_token: str, year: int, month: int) -> int:
+def get_longest_streak(github_username: str, github_token: str, year: int, month: int, db: Optional[Session] = None) -> int:
     """
     github_username, github_token, year, month를 받아서 해당 기간동안 가장 긴 연속 커밋 기간을 반환
     Returns: longest_streak(int) 가장 긴 연속 커밋 기간
     """
 
-    db = SessionLocal()
-    try:
-        start_date, end_date = validate_date_n_token(github_username, year, month, github_token)
-
-        # 해당 기간의 모든 커밋 날짜 가져오기 (time zone seoul 조심)
-        dates_query = db.execute(text("""
-            SELECT DISTINCT DATE(c.commit_date AT TIME ZONE 'UTC' AT TIME ZONE 'Asia/Seoul') as commit_date
-            FROM commits c
-            JOIN repositories r ON c.repo_id = r.repo_id
-            WHERE r.github_username = :username
-            AND c.commit_date >= :start_date
-            AND c.commit_date < :end_date
-            ORDER BY commit_date
-        """), {
-            "username": github_username,
-            "start_date": start_date,
-            "end_date": end_date
-        })
-        
-        # 커밋된 날짜들을 리스트로 변환
-        commit_dates = [row[0] for row in dates_query]
+    with session_scope(db) as db:
+        try:
+            start_date, end_date = validate_date_n_token(github_username, year, month, github_token, db=db)
 
-        longest_streak = 0
-        current_streak = 0
-        
-        if commit_dates:
-            current_streak = 1
-            for i in range(1, len(commit_dates)):
-                # 이전 날짜와 현재 날짜의 차이가 1일이면 연속된 커밋으로
-                if (commit_dates[i] - commit_dates[i-1]).days == 1:
-                    current_streak += 1
-                else:
-                    longest_streak = max(longest_streak, current_streak)
-                    current_streak = 1
-            
-            # 마지막 streak 확인
-            longest_streak = max(longest_streak, current_streak)
-
-        return longest_streak
-
-    except Exception as e:
-        raise Exception(f"get longest streak err: {str(e)}")
-    
-    finally:
-        db.close()
+            # 해당 기간의 모든 커밋 날짜 가져오기
+            # daily_activity의 local_date가 이미 서울 기준 날짜라서 커밋을 다시 훑지 않아요
+            daily_repo_commits = get_daily_repo_commits(github_username, start_date.date(), end_date.date(), db)
 
-def get_longest_gap(github_username: str, github_token: str, year: int, month: int, day: int) -> int:
+            # 커밋된 날짜들을 정렬된 리스트로 변환
+            commit_dates = sorted({commit_date for commit_date, _, _ in daily_repo_commits})
+
+            return calc_longest_streak(commit_dates)
+
+        except Exception as e:
+            raise Exception(f"get longest streak err: {str(e)}")
+
+def get_longest_gap(github_username: str, github_token: str, year: int, month: int, day: int, db: Optional[Session] = None) -> int:
     """
     github_username, github_token, year, month, day를 받아서 1일부터 현재까지 가장 길게 커밋하지 않은 연속된 날짜의 수를 반환
     Returns: longest_gap(int) 가장 긴 연속으로 커밋을 하지 않은 기간
     """
-    db = SessionLocal()
-    try:
-        start_date, _ = validate_date_n_token(github_username, year, month, github_token)
-        # 주어진 day로 현재 날짜 만들기
-        end_date = datetime(year, month, day) 
-
-        # 주어진 기간 동안 모든 커밋 날짜 가져오기
-        dates_query = db.execute(text("""
-            SELECT DISTINCT DATE(c.commit_date AT TIME ZONE 'UTC' AT TIME ZONE 'Asia/Seoul') as commit_date
-            FROM commits c
-            JOIN repositories r ON c.repo_id = r.repo_id
-            WHERE r.github_username = :username
-            AND c.commit_date >= :start_date
-            AND c.commit_date < :end_date
-            ORDER BY commit_date
-        """), {
-            "username": github_username,
-            "start_date": start_date,
-            "end_date": end_date
-        })
-        
-        commit_dates = [row[0] for row in dates_query]
-        longest_gap = 0
-        
-        if commit_dates:
-            # 지정된 날짜까지의 커밋 날짜 필터링
-            commit_dates = [d for d in commit_dates if d < end_date.date()]
-            
-            if not commit_dates:
-                # 지정된 날짜까지 커밋이 없는 경우
-                longest_gap = (end_date.date() - start_date.date()).days - 1
-            else:
-                # 월의 시작부터 첫 커밋까지의 간격 확인
-                if (commit_dates[0] - start_date.date()).days > longest_gap:
-                    longest_gap = (commit_dates[0] - start_date.date()).days
-                
-                # 커밋 간의 간격 확인
-                for i in range(1, len(commit_dates)):
-                    gap = (commit_dates[i] - commit_dates[i-1]).days - 1
-                    longest_gap = max(longest_gap, gap)
-                
-                # 마지막 커밋부터 지정된 날짜까지의 간격 확인
-                if (end_date.date() - commit_dates[-1]).days - 1 > longest_gap:
-                    longest_gap = (end_date.date() - commit_dates[-1]).days - 1
-        else:
-            # 커밋이 없는 경우, 시작부터 지정된 날짜까지의 간격으로
-            longest_gap = (end_date.date() - start_date.date()).days - 1
-
-        return longest_gap
-
-    except Exception as e:
-        raise Exception(f"get longest gap err: {str(e)}")
-    
-    finally:
-        db.close()
+    with session_scope(db) as db:
+        try:
+            start_date, _ = validate_date_n_token(github_username, year, month, github_token, db=db)
+            # 주어진 day로 현재 날짜 만들기
+            end_date = datetime(year, month, day) 
 
-def get_each_day_commit_count(github_username: str, github_token: str, year: int, month: int) -> List[Tuple[str, str, int]]:
+            # 주어진 기간 동안 모든 커밋 날짜 가져오기 (end_date는 포함하지 않아요)
+            daily_repo_commits = get_daily_repo_commits(github_username, start_date.date(), end_date.date() - timedelta(days=1), db)
+            commit_dates = sorted({commit_date for commit_date, _, _ in daily_repo_commits})
+
+            return calc_longest_gap(commit_dates, start_date.date(), end_date.date())
+
+        except Exception as e:
+            raise Exception(f"get longest gap err: {str(e)}")
+
+def get_each_day_commit_count(github_username: str, github_token: str, year: int, month: int, db: Optional[Session] = None) -> List[Tuple[str, str, int]]:
     """
     github_username, github_token, year, month를 받아서 해당 기간동안 각 날짜별 레포의 커밋 수를 반환
     Returns:
@@ -164,37 +140,15 @@ def get_each_day_commit_count(github_username: str, github_token: str, year: int
         - repo_name: 레포 이름
         - commit_count: 해당 날짜의 커밋 수
     """
-    db = SessionLocal()
-    try:
-        start_date, end_date = validate_date_n_token(github_username, year, month, github_token)
-
-        # 레포별 커밋 수 조회
-        results = db.execute(text("""
-            SELECT 
-                DATE(c.commit_date AT TIME ZONE 'UTC' AT TIME ZONE 'Asia/Seoul') as commit_date,
-                r.repo_name,
-                COUNT(*) as commit_count
-            FROM commits c
-            JOIN repositories r ON c.repo_id = r.repo_id
-            WHERE r.github_username = :username
-            AND c.commit_date >= :start_date
-            AND c.commit_date < :end_date
-            GROUP BY DATE(c.commit_date AT TIME ZONE 'UTC' AT TIME ZONE 'Asia/Seoul'), r.repo_name
-            ORDER BY commit_date, r.repo_name
-        """), {
-            "username": github_username,
-            "start_date": start_date,
-            "end_date": end_date
-        })
-
-        # 튜플 (date, repo_name, commit_count)로 구성된 리스트로 변환
-        return [(str(row[0]), row[1], row[2]) for row in results]
-
-    except Exception as e:
-        raise Exception(f"get each day commit count err: {str(e)}")
-    
-    finally:
-        db.close()
+    with session_scope(db) as db:
+        try:
+            start_date, end_date = validate_date_n_token(github_username, year, month, github_token, db=db)
+
+            # 튜플 (date, repo_name, commit_count)로 구성된 리스트로 변환
+            return [(str(commit_date), repo_name, commit_count) for commit_date, repo_name, commit_count in get_daily_repo_commits(github_username, start_date.date(), end_date.date(), db)]
+
+        except Exception as e:
+            raise Exception(f"get each day commit count err: {str(e)}")
 
 
 
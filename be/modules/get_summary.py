@@ -0,0 +1,178 @@
+from datetime import date, datetime, time, timedelta
+from typing import Dict, Optional, Tuple
+from zoneinfo import ZoneInfo
+from fastapi import HTTPException
+from sqlalchemy.orm import Session
+try:
+    from . import validate_date_n_token, validate_range_n_token
+    from .. import session_scope
+    from .get_days import get_total_days, get_daily_repo_commits, calc_longest_streak, calc_longest_gap
+    from .get_commit_num import get_commit_num_between
+    from .get_used_language import get_used_languages
+    from .activity_calendar import to_bitmap, summarize_calendar
+    from .result_cache import cached_result
+except ImportError:
+    import sys
+    import os
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+    from be import session_scope
+    from be.modules import validate_date_n_token, validate_range_n_token
+    from be.modules.get_days import get_total_days, get_daily_repo_commits, calc_longest_streak, calc_longest_gap
+    from be.modules.get_commit_num import get_commit_num_between
+    from be.modules.get_used_language import get_used_languages
+    from be.modules.activity_calendar import to_bitmap, summarize_calendar
+    from be.modules.result_cache import cached_result
+from icecream import ic
+
+# 최근 n일 요약에서 받을 수 있는 최대 일수
+MAX_ROLLING_DAYS: int = 3660
+
+# daily_activity의 local_date 기준 시간대
+SEOUL = ZoneInfo("Asia/Seoul")
+
+def get_month_summary(github_username: str, github_token: str, year: int, month: int, day: Optional[int] = None, db: Optional[Session] = None) -> Dict:
+    """
+    대시보드에 필요한 월간 지표를 한 번에 반환해요.
+    토큰은 한 번만 확인하고, 날짜별 지표(active_days, longest_streak, longest_gap, each_day_commit_count)는 daily_activity를 한 번 읽은 결과로 같이 계산해요.
+
+    longest_gap은 day를 주면 /days/longest_gap처럼 1일부터 day 전날까지 보고,
+    없으면 이번 달은 오늘 전날까지, 지난 달은 말일까지 봐요.
+
+    Returns:
+        {total_days, active_days, longest_streak, longest_gap, each_day_commit_count, total_commit_num, used_language}
+    """
+    start_date, end_date = validate_date_n_token(github_username, year, month, github_token, db=db)
+    total_days = get_total_days(year, month)
+
+    if day is not None:
+        if day < 1 or day > total_days:
+            raise HTTPException(status_code=422, detail="Invalid day")
+        gap_end = date(year, month, day)
+    elif start_date.date() <= _today() <= end_date.date():
+        # daily_activity의 local_date처럼 서울 기준 오늘이에요
+        gap_end = _today()
+    else:
+        gap_end = end_date.date() + timedelta(days=1)
+
+    # 날짜 지표와 같은 서울 기준 한 달로 커밋 수, 언어를 세요
+    seoul_start, seoul_end = _seoul_bounds(start_date.date(), end_date.date())
+
+    def summarize() -> Dict:
+        with session_scope(db) as session:
+            daily_repo_commits = get_daily_repo_commits(github_username, start_date.date(), end_date.date(), session)
+            total_commit_num = get_commit_num_between(github_username, seoul_start, seoul_end, session)
+            used_language = get_used_languages(github_username, seoul_start, seoul_end, session)
+
+        commit_dates = sorted({commit_date for commit_date, _, _ in daily_repo_commits})
+
+        return {
+            "total_days": total_days,
+            "active_days": len(commit_dates),
+            "longest_streak": calc_longest_streak(commit_dates),
+            "longest_gap": calc_longest_gap(commit_dates, start_date.date(), gap_end),
+            "each_day_commit_count": [(str(commit_date), repo_name, commit_count) for commit_date, repo_name, commit_count in daily_repo_commits],
+            "total_commit_num": total_commit_num,
+            "used_language": used_language
+        }
+
+    return cached_result("month_summary", github_username, (year, month, gap_end), summarize, db)
+
+def summarize_range(github_username: str, start_date: date, end_date: date, db: Optional[Session] = None) -> Dict:
+    """
+    토큰 확인 없이 start_date ~ end_date(둘 다 포함, 서울 기준 날짜) 기간의 지표를 계산해요.
+    기간이 한 달이든 1년이든 daily_activity를 한 번 읽고, 커밋 수와 언어는 각각 한 번의 집계 쿼리로 가져와요.
+    streak, gap 같은 날짜 지표는 오늘까지만 봐요 (앞으로 올 날을 커밋하지 않은 날로 세지 않아요).
+
+    Returns:
+        {start_date, end_date, total_commit_num, used_language, monthly, repositories,
+         days, active_days, longest_streak, longest_gap, current_streak, weekday_distribution}
+    """
+    calendar_end = max(min(end_date, _today()) + timedelta(days=1), start_date)
+    # 오늘이 바뀌면 streak, gap이 달라져서 calendar_end도 키에 넣어요
+    return cached_result("range_summary", github_username, (start_date, end_date, calendar_end), lambda: _summarize_range(github_username, start_date, end_date, calendar_end, db), db)
+
+def _summarize_range(github_username: str, start_date: date, end_date: date, calendar_end: date, db: Optional[Session]) -> Dict:
+    # 커밋 수, 언어도 날짜 지표와 같은 서울 기준 기간으로 세요
+    seoul_start, seoul_end = _seoul_bounds(start_date, end_date)
+
+    with session_scope(db) as db:
+        daily_repo_commits = get_daily_repo_commits(github_username, start_date, end_date, db)
+        total_commit_num = get_commit_num_between(github_username, seoul_start, seoul_end, db)
+        used_language = get_used_languages(github_username, seoul_start, seoul_end, db)
+
+    # 달별, 레포별 커밋 수는 이미 가져온 날짜별 레포 커밋 수에서 모아요
+    monthly: Dict[str, Dict] = {}
+    repositories: Dict[str, int] = {}
+    for commit_date, repo_name, commit_count in daily_repo_commits:
+        month = monthly.setdefault(commit_date.strftime("%Y-%m"), {"commit_count": 0, "active_dates": set()})
+        month["commit_count"] += commit_count
+        month["active_dates"].add(commit_date)
+        repositories[repo_name] = repositories.get(repo_name, 0) + commit_count
+
+    bitmap = to_bitmap((commit_date for commit_date, _, _ in daily_repo_commits), start_date, calendar_end)
+
+    return {
+        "start_date": str(start_date),
+        "end_date": str(end_date),
+        "total_commit_num": total_commit_num,
+        "used_language": used_language,
+        "monthly": [
+            {"month": key, "commit_count": month["commit_count"], "active_days": len(month["active_dates"])}
+            for key, month in sorted(monthly.items())
+        ],
+        "repositories": sorted(repositories.items(), key=lambda item: (-item[1], item[0])),
+        **summarize_calendar(bitmap, start_date, calendar_end)
+    }
+
+def get_range_summary(github_username: str, github_token: str, start_date: date, end_date: date, db: Optional[Session] = None) -> Dict:
+    """
+    github_username, github_token, start_date, end_date(포함)를 받아서 기간 요약을 반환해요.
+    """
+    validate_range_n_token(github_username, start_date, end_date, github_token, db=db)
+
+    return summarize_range(github_username, start_date, end_date, db)
+
+def get_rolling_summary(github_username: str, github_token: str, days: int, db: Optional[Session] = None) -> Dict:
+    """
+    오늘(서울 기준)을 포함한 최근 days일의 요약을 반환해요. (last 30, last 365 ...)
+    """
+    if days < 1 or days > MAX_ROLLING_DAYS:
+        raise HTTPException(status_code=422, detail="Invalid days")
+
+    end_date = _today()
+    return get_range_summary(github_username, github_token, end_date - timedelta(days=days - 1), end_date, db)
+
+def get_year_summary(github_username: str, github_token: str, year: int, db: Optional[Session] = None) -> Dict:
+    """
+    year의 1월 1일 ~ 12월 31일 요약을 반환해요. 월 요약과 같은 쿼리 수로 끝나요.
+    """
+    if year < 2005 or year > _today().year:
+        raise HTTPException(status_code=422, detail="Invalid year")
+
+    return get_range_summary(github_username, github_token, date(year, 1, 1), date(year, 12, 31), db)
+
+def _today() -> date:
+    # daily_activity의 local_date가 서울 기준이라 오늘도 서울 기준으로 봐요
+    return datetime.now(SEOUL).date()
+
+def _seoul_bounds(start_date: date, end_date: date) -> Tuple[datetime, datetime]:
+    """
+    서울 기준 start_date 00:00 ~ end_date 다음 날 00:00 직전(BETWEEN으로 비교해서 1µs 빼요)의 timezone 있는 datetime을 반환해요.
+    """
+    return (
+        datetime.combine(start_date, time.min, SEOUL),
+        datetime.combine(end_date + timedelta(days=1), time.min, SEOUL) - timedelta(microseconds=1)
+    )
+
+
+if __name__ == "__main__":
+    import os
+    import dotenv
+    dotenv.load_dotenv()
+
+    token = os.getenv("GITHUB_TOKEN")
+    github_username = os.getenv("GITHUB_USER")
+
+    ic(get_month_summary(github_username, token, 2025, 1))
+    ic(get_year_summary(github_username, token, 2024))
+    ic(get_rolling_summary(github_username, token, 30))
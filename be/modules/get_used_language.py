@@ -1,15 +1,17 @@
 from sqlalchemy import text
 try:
-    from .. import SessionLocal
+    from .. import session_scope
+    from .result_cache import cached_result
 except ImportError:
     import sys
     import os
     sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
-    from be import SessionLocal
-from typing import List, Tuple
+    from be import session_scope
+    from be.modules.result_cache import cached_result
+from typing import List, Optional, Tuple
 from sqlalchemy.orm import Session
 
-def get_used_languages(github_username: str, start_date: str, end_date: str, db: Session = SessionLocal()) -> List[Tuple[str, int]]:
+def get_used_languages(github_username: str, start_date: str, end_date: str, db: Optional[Session] = None) -> List[Tuple[str, int]]:
     """
     특정 기간 동안 커밋된 확장자 빈도를 내림차순으로 반환
     
@@ -17,35 +19,36 @@ def get_used_languages(github_username: str, start_date: str, end_date: str, db:
         github_username (str): GitHub 사용자명
         start_date (str): 시작 날짜 (YYYY-MM-DD 형식)
         end_date (str): 종료 날짜 (YYYY-MM-DD 형식)
-        db (Session): SQLAlchemy session
+        db (Session): SQLAlchemy session (없으면 새로 열었다가 닫아요)
         
     returns:
         list: [(language, count), ...] 형식의 언어 사용 통계
     """
 
-    try:
-        query = text("""
-            SELECT cc.language, COUNT(*) as count
-            FROM code_changes cc
-            JOIN commits c ON cc.commit_id = c.commit_id
-            JOIN repositories r ON c.repo_id = r.repo_id
-            WHERE r.github_username = :username
-            AND c.commit_date BETWEEN :start_date AND :end_date
-            AND cc.language IS NOT NULL
-            GROUP BY cc.language
-            ORDER BY count DESC
-        """)
+    def count_languages() -> List[Tuple[str, int]]:
+        with session_scope(db) as session:
+            query = text("""
+                SELECT cc.language, COUNT(*) as count
+                FROM code_changes cc
+                JOIN commits c ON cc.commit_id = c.commit_id AND cc.commit_date = c.commit_date
+                JOIN repositories r ON c.repo_id = r.repo_id
+                WHERE r.github_username = :username
+                AND c.commit_date BETWEEN :start_date AND :end_date
+                AND cc.commit_date BETWEEN :start_date AND :end_date
+                AND cc.language IS NOT NULL
+                GROUP BY cc.language
+                ORDER BY count DESC
+            """)
         
-        result = db.execute(query, {
-            "username": github_username,
-            "start_date": start_date,
-            "end_date": end_date
-        })
+            result = session.execute(query, {
+                "username": github_username,
+                "start_date": start_date,
+                "end_date": end_date
+            })
         
-        return [(row.language, row.count) for row in result]
-    
-    finally:
-        db.close()
+            return [(row.language, row.count) for row in result]
+
+    return cached_result("used_languages", github_username, (start_date, end_date), count_languages, db)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,214 @@
+from datetime import datetime, timezone
+from typing import List, Dict, Union, Optional
+import subprocess
+import threading
+import base64
+import os
+import dotenv
+from icecream import ic
+
+
+dotenv.load_dotenv()
+
+# bare mirror들을 저장할 디렉토리
+GIT_MIRROR_DIR: str = os.getenv(
+    "GIT_MIRROR_DIR",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".cache", "git_mirrors")
+)
+
+# git log --raw의 상태 문자를 GitHub API의 status로 바꿔요
+GIT_STATUS = {
+    'A': 'added',
+    'M': 'modified',
+    'D': 'removed',
+    'T': 'changed',
+}
+
+# 커밋/필드 구분자
+RECORD_SEP = "\x1e"
+FIELD_SEP = "\x1f"
+
+# 같은 mirror를 여러 스레드가 동시에 fetch하지 않도록 경로별로 잠가요
+_mirror_locks: Dict[str, threading.Lock] = {}
+_mirror_locks_lock = threading.Lock()
+
+
+class GitCommandError(Exception):
+    pass
+
+
+def _git(args: List[str], git_dir: Optional[str] = None, token: Optional[str] = None) -> str:
+    command = ["git", "-c", "core.quotePath=false"]
+    if token:
+        # 토큰이 mirror의 config에 남지 않도록 URL 대신 헤더로 넘겨요
+        credentials = base64.b64encode(f"x-access-token:{token}".encode()).decode()
+        command += ["-c", f"http.extraHeader=Authorization: Basic {credentials}"]
+    if git_dir:
+        command += ["--git-dir", git_dir]
+
+    result = subprocess.run(command + args, capture_output=True)
+    if result.returncode != 0:
+        raise GitCommandError(result.stderr.decode("utf-8", errors="replace").strip())
+    return result.stdout.decode("utf-8", errors="replace")
+
+def _mirror_lock(path: str) -> threading.Lock:
+    with _mirror_locks_lock:
+        return _mirror_locks.setdefault(path, threading.Lock())
+
+def ensure_mirror(token: Optional[str], user: str, repo_name: str, remote_url: Optional[str] = None) -> str:
+    """
+    레포의 bare mirror가 없으면 git clone --mirror로 만들고, 있으면 git fetch로 바뀐 부분만 가져와요.
+
+    params:
+        remote_url: 가져올 원격 주소 (None이면 https://github.com/{user}/{repo_name}.git, 로컬 경로도 가능)
+
+    return: mirror 경로
+    """
+    path = os.path.join(GIT_MIRROR_DIR, user, f"{repo_name}.git")
+    remote_url = remote_url or f"https://github.com/{user}/{repo_name}.git"
+
+    with _mirror_lock(path):
+        if os.path.isdir(path):
+            print(f"        | repository: {repo_name}, git fetch")
+            _git(["fetch", "--prune", "origin"], git_dir=path, token=token)
+        else:
+            print(f"        | repository: {repo_name}, git clone --mirror")
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            _git(["clone", "--mirror", remote_url, path], token=token)
+
+    return path
+
+def _git_date(value: datetime) -> str:
+    # timezone이 없는 datetime은 REST API처럼 UTC로 취급해요
+    if value.tzinfo:
+        value = value.astimezone(timezone.utc)
+    return value.strftime("%Y-%m-%d %H:%M:%S +0000")
+
+def _parse_patches(output: str) -> Dict[str, Dict[str, str]]:
+    """
+    git log -p 출력을 {sha: {filename: patch}}로 나눠요.
+    patch는 GitHub API처럼 첫 @@ hunk부터의 내용이에요.
+    """
+    patches: Dict[str, Dict[str, str]] = {}
+
+    for record in output.split(RECORD_SEP)[1:]:
+        sha, _, body = record.partition("\n")
+        files: Dict[str, str] = {}
+
+        for block in ("\n" + body).split("\ndiff --git ")[1:]:
+            lines = block.split("\n")
+            filename = None
+            hunk_start = None
+            for i, line in enumerate(lines):
+                # 공백이 있는 경로는 끝에 탭이 붙어요
+                if line.startswith("--- a/"):
+                    filename = line[len("--- a/"):].rstrip("\t")
+                elif line.startswith("+++ b/"):
+                    filename = line[len("+++ b/"):].rstrip("\t")
+                elif line.startswith("@@"):
+                    hunk_start = i
+                    break
+
+            if filename is not None and hunk_start is not None:
+                files[filename] = "\n".join(lines[hunk_start:]).rstrip("\n")
+
+        patches[sha.strip()] = files
+
+    return patches
+
+def read_commits(git_dir: str, start_date: datetime, end_date: datetime, latest_commit_sha: str = None) -> List[Dict]:
+    """
+    mirror의 기본 브랜치(HEAD)에서 기간 내 커밋을 최신순으로 읽어서 save_repo_and_commits가 쓰는 형식으로 반환해요.
+    latest_commit_sha가 mirror에 있으면 그 커밋 이후의 커밋만 읽어요.
+    rename은 GitHub API와 달리 removed + added로 나와요.
+    """
+    revision = "HEAD"
+    if latest_commit_sha:
+        try:
+            _git(["cat-file", "-e", f"{latest_commit_sha}^{{commit}}"], git_dir=git_dir)
+            revision = f"{latest_commit_sha}..HEAD"
+        except GitCommandError:
+            pass
+
+    log_args = [
+        "log", revision,
+        f"--since={_git_date(start_date)}",
+        f"--until={_git_date(end_date)}",
+        "--no-renames",
+        "--diff-merges=first-parent",
+    ]
+
+    # 1) 커밋 정보 + 파일별 상태(--raw)와 줄 수(--numstat)
+    meta = _git(log_args + [
+        "--raw", "--numstat",
+        f"--format={RECORD_SEP}%H{FIELD_SEP}%an{FIELD_SEP}%aI{FIELD_SEP}%B{FIELD_SEP}",
+    ], git_dir=git_dir)
+
+    # 2) 파일별 patch
+    patches = _parse_patches(_git(log_args + ["-p", f"--format={RECORD_SEP}%H"], git_dir=git_dir))
+
+    commits: List[Dict] = []
+    for record in meta.split(RECORD_SEP)[1:]:
+        sha, author, date, message, stats = record.split(FIELD_SEP)
+
+        statuses: Dict[str, str] = {}
+        numstats: Dict[str, tuple] = {}
+        for line in stats.strip("\n").split("\n"):
+            if line.startswith(":"):
+                # :100644 100644 abc123 def456 M\tpath
+                info, _, path = line.partition("\t")
+                statuses[path] = GIT_STATUS.get(info.split()[-1][0], 'modified')
+            elif line:
+                # additions\tdeletions\tpath (바이너리 파일은 -\t-)
+                additions, deletions, path = line.split("\t", 2)
+                numstats[path] = (
+                    int(additions) if additions.isdigit() else 0,
+                    int(deletions) if deletions.isdigit() else 0
+                )
+
+        commit_patches = patches.get(sha, {})
+        files_changed: List[Dict] = []
+        for path, status in statuses.items():
+            additions, deletions = numstats.get(path, (0, 0))
+            files_changed.append({
+                'filename': path,
+                'status': status,
+                'additions': additions,
+                'deletions': deletions,
+                'changes': additions + deletions,
+                'patch': commit_patches.get(path, ''),
+                'language': os.path.splitext(path)[1].lower() or 'none'
+            })
+
+        commits.append({
+            'sha': sha,
+            'commit_message': message.rstrip("\n"),
+            'author': author,
+            'date': date,
+            'files_changed': files_changed
+        })
+
+    return commits
+
+def get_user_commits_git(token: str, user: str, repo_name: str, start_date: datetime, end_date: datetime, latest_commit_sha: str = None, remote_url: Optional[str] = None) -> Union[List[Dict], tuple]:
+    """
+    get_user_commits의 로컬 git mirror 버전이에요. 반환 형식은 REST 버전과 같아요.
+    GitHub API를 쓰지 않아서 rate limit에 걸리지 않아요.
+    """
+    print(f"        | repository: {repo_name}, get commits (git mirror)")
+
+    try:
+        git_dir = ensure_mirror(token, user, repo_name, remote_url)
+        return read_commits(git_dir, start_date, end_date, latest_commit_sha)
+    except GitCommandError as e:
+        return (None, str(e))
+
+
+if __name__ == "__main__":
+    token: str = os.getenv("GITHUB_TOKEN")
+    user: str = os.getenv("GITHUB_USER")
+    repo_name: str = os.getenv("GITHUB_TEST_REPO")
+    start_date: datetime = datetime(2025, 1, 1)
+    end_date: datetime = datetime(2025, 1, 31)
+
+    ic(get_user_commits_git(token, user, repo_name, start_date, end_date))
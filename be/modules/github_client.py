@@ -0,0 +1,59 @@
+import requests
+from requests.adapters import HTTPAdapter
+from typing import Optional
+import threading
+import os
+import dotenv
+
+
+dotenv.load_dotenv()
+
+# api.github.com 연결 풀 크기 (동시에 유지할 keep-alive 연결 수)
+# 동시에 GitHub를 부르는 스레드 수보다 작으면 urllib3가 남는 연결을 버려서("Connection pool is full") keep-alive를 못 해요.
+# 그래서 기본값은 동기화 스레드(SYNC_WORKER_COUNT x GITHUB_FETCH_CONCURRENCY)와 요청 스레드(THREADPOOL_SIZE)를 더한 값이에요.
+# (모듈을 import하면 순환 import가 생겨서 같은 환경변수를 같은 기본값으로 직접 읽어요)
+GITHUB_POOL_MAXSIZE: int = int(os.getenv("GITHUB_POOL_MAXSIZE", str(
+    int(os.getenv("SYNC_WORKER_COUNT", "4")) * int(os.getenv("GITHUB_FETCH_CONCURRENCY", "8"))
+    + int(os.getenv("THREADPOOL_SIZE", "40"))
+)))
+# 연결/응답 대기 시간(초)
+GITHUB_CONNECT_TIMEOUT: float = float(os.getenv("GITHUB_CONNECT_TIMEOUT", "5"))
+GITHUB_READ_TIMEOUT: float = float(os.getenv("GITHUB_READ_TIMEOUT", "30"))
+GITHUB_TIMEOUT: tuple = (GITHUB_CONNECT_TIMEOUT, GITHUB_READ_TIMEOUT)
+
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+
+
+def create_github_session() -> requests.Session:
+    """
+    keep-alive 연결을 재사용하는 GitHub API용 세션을 만들어요.
+    재시도는 rate limit 스케줄러가 처리해서 adapter에서는 하지 않아요.
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=GITHUB_POOL_MAXSIZE, max_retries=0)
+    session.mount("https://", adapter)
+    return session
+
+def init_github_session() -> requests.Session:
+    """
+    FastAPI lifespan에서 호출해서 앱 전체가 공유할 세션을 만들어요.
+    """
+    global _session
+    with _session_lock:
+        if _session is None:
+            _session = create_github_session()
+        return _session
+
+def get_github_session() -> requests.Session:
+    """
+    공유 세션을 반환해요. lifespan 밖(스크립트, 워커)에서 호출하면 처음 호출할 때 만들어요.
+    """
+    return _session or init_github_session()
+
+def close_github_session() -> None:
+    global _session
+    with _session_lock:
+        if _session is not None:
+            _session.close()
+            _session = None
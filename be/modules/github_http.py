@@ -0,0 +1,208 @@
+import requests
+from requests.structures import CaseInsensitiveDict
+from typing import Dict, Optional
+import threading
+import hashlib
+import time
+import json
+import os
+import re
+import dotenv
+try:
+    from .rate_limit import send_github_request, PRIORITY_INTERACTIVE
+except ImportError:
+    import sys
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+    from be.modules.rate_limit import send_github_request, PRIORITY_INTERACTIVE
+
+
+dotenv.load_dotenv()
+
+# ETag 캐시를 저장할 디렉토리 (빈 문자열이면 캐시를 사용하지 않아요)
+GITHUB_HTTP_CACHE_DIR: str = os.getenv(
+    "GITHUB_HTTP_CACHE_DIR",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".cache", "github_http")
+)
+# 캐시 디렉토리의 최대 크기(바이트), 넘으면 가장 오래 안 쓴 파일부터 지워요 (0이면 크기 제한 없음)
+GITHUB_HTTP_CACHE_MAX_BYTES: int = int(os.getenv("GITHUB_HTTP_CACHE_MAX_BYTES", str(1024 * 1024 * 1024)))
+# 이 기간(일)동안 쓰지 않은 캐시 파일은 지워요 (0이면 기간 제한 없음)
+GITHUB_HTTP_CACHE_MAX_AGE_DAYS: float = float(os.getenv("GITHUB_HTTP_CACHE_MAX_AGE_DAYS", "30"))
+# 캐시에 쓸 때 위 제한을 확인하는 간격(초), 매번 디렉토리 전체를 훑지 않도록 프로세스마다 이 간격으로 한 번씩 정리해요
+GITHUB_HTTP_CACHE_PRUNE_INTERVAL: float = float(os.getenv("GITHUB_HTTP_CACHE_PRUNE_INTERVAL", "600"))
+
+# sha로 지정한 커밋 상세 정보는 바뀌지 않아서 재검증 없이 캐시에서 바로 반환해요
+IMMUTABLE_URL_PATTERN = re.compile(r"/repos/[^/]+/[^/]+/commits/[0-9a-f]{40}$")
+
+# 캐시 응답을 다시 만들 때 필요한 헤더들
+CACHED_HEADERS = ('etag', 'last-modified', 'link', 'content-type')
+
+_stats: Dict[str, int] = {"hits": 0, "revalidated": 0, "misses": 0, "evicted": 0}
+_stats_lock = threading.Lock()
+_prune_lock = threading.Lock()
+_last_prune: float = 0.0
+
+
+def _count(name: str) -> None:
+    with _stats_lock:
+        _stats[name] += 1
+
+def get_http_cache_stats() -> Dict[str, float]:
+    """
+    캐시 hit/miss 카운터를 반환해요.
+    hits: 요청 없이 캐시에서 반환, revalidated: 304를 받아 캐시에서 반환, misses: 전체 응답을 새로 받음, evicted: 정리하면서 지운 파일 수
+    """
+    with _stats_lock:
+        stats = dict(_stats)
+    total = stats["hits"] + stats["revalidated"] + stats["misses"]
+    stats["hit_ratio"] = (stats["hits"] + stats["revalidated"]) / total if total else 0.0
+    return stats
+
+def _cache_key(url: str, headers: Dict[str, str], params: Optional[Dict]) -> str:
+    # 토큰마다 볼 수 있는 레포가 달라서 Authorization도 키에 포함해요 (원문 대신 해시만)
+    auth = hashlib.sha256(headers.get('Authorization', '').encode()).hexdigest()
+    raw = json.dumps([url, sorted((params or {}).items()), auth], default=str)
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+def _cache_path(key: str) -> str:
+    return os.path.join(GITHUB_HTTP_CACHE_DIR, key[:2], f"{key}.json")
+
+def _load(key: str) -> Optional[Dict]:
+    path = _cache_path(key)
+    try:
+        with open(path, encoding="utf-8") as f:
+            entry = json.load(f)
+    except (OSError, ValueError):
+        return None
+
+    # 수정 시각을 마지막으로 쓴 시각으로 써서, 자주 쓰는 파일은 정리할 때 남겨요
+    try:
+        os.utime(path)
+    except OSError:
+        pass
+    return entry
+
+def _store(key: str, response: requests.Response) -> None:
+    path = _cache_path(key)
+    entry = {
+        "url": response.url,
+        "headers": {name: response.headers[name] for name in CACHED_HEADERS if name in response.headers},
+        "body": response.text
+    }
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # 다른 스레드가 반쯤 쓰인 파일을 읽지 않도록 임시 파일에 쓰고 교체
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(entry, f)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        print(f"        | http cache write failed: {e}")
+
+    _maybe_prune()
+
+def _maybe_prune() -> None:
+    global _last_prune
+
+    if time.time() - _last_prune < GITHUB_HTTP_CACHE_PRUNE_INTERVAL:
+        return
+    # 다른 스레드가 정리하는 중이면 기다리지 않고 넘어가요
+    if not _prune_lock.acquire(blocking=False):
+        return
+    try:
+        _last_prune = time.time()
+        prune_http_cache()
+    finally:
+        _prune_lock.release()
+
+def prune_http_cache(max_bytes: Optional[int] = None, max_age_days: Optional[float] = None) -> Dict[str, int]:
+    """
+    캐시 디렉토리에서 max_age_days일 동안 쓰지 않은 파일을 지우고, 그래도 max_bytes보다 크면 가장 오래 안 쓴 파일부터 지워요.
+    토큰마다 캐시가 따로라서 커밋이 많은 계정은 제한 없이 쌓이기 때문이에요.
+
+    return: {removed, bytes} 지운 파일 수, 남은 크기
+    """
+    max_bytes = GITHUB_HTTP_CACHE_MAX_BYTES if max_bytes is None else max_bytes
+    max_age_days = GITHUB_HTTP_CACHE_MAX_AGE_DAYS if max_age_days is None else max_age_days
+    if not GITHUB_HTTP_CACHE_DIR or not os.path.isdir(GITHUB_HTTP_CACHE_DIR):
+        return {"removed": 0, "bytes": 0}
+
+    expire_before = time.time() - max_age_days * 86400 if max_age_days > 0 else None
+    files = []
+    removed = 0
+    total = 0
+    for entry_dir in os.scandir(GITHUB_HTTP_CACHE_DIR):
+        if not entry_dir.is_dir():
+            continue
+        for entry in os.scandir(entry_dir.path):
+            try:
+                stat = entry.stat()
+                if expire_before is not None and stat.st_mtime < expire_before:
+                    os.remove(entry.path)
+                    removed += 1
+                    continue
+            except OSError:
+                continue
+            files.append((stat.st_mtime, stat.st_size, entry.path))
+            total += stat.st_size
+
+    if max_bytes > 0 and total > max_bytes:
+        for _, size, path in sorted(files):
+            if total <= max_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            removed += 1
+            total -= size
+
+    if removed:
+        with _stats_lock:
+            _stats["evicted"] += removed
+        print(f"        | http cache pruned {removed} files, {total} bytes left")
+    return {"removed": removed, "bytes": total}
+
+def _to_response(entry: Dict) -> requests.Response:
+    response = requests.Response()
+    response.status_code = 200
+    response.url = entry["url"]
+    response.headers = CaseInsensitiveDict(entry["headers"])
+    response._content = entry["body"].encode("utf-8")
+    response.encoding = "utf-8"
+    return response
+
+def github_get(url: str, headers: Dict[str, str], params: Optional[Dict] = None, priority: str = PRIORITY_INTERACTIVE, session: Optional[requests.Session] = None) -> requests.Response:
+    """
+    GitHub API GET 요청을 ETag/Last-Modified 캐시를 거쳐서 보내요.
+    캐시된 응답이 있으면 If-None-Match/If-Modified-Since를 붙이고, 304를 받으면 캐시된 본문을 200 응답으로 돌려줘요.
+    (304 응답은 rate limit에 포함되지 않아요)
+    실제 요청은 rate limit 스케줄러(send_github_request)를 거쳐서 priority에 맞게 보내요.
+    """
+    if not GITHUB_HTTP_CACHE_DIR:
+        return send_github_request("GET", url, headers, priority, session, params=params)
+
+    key = _cache_key(url, headers, params)
+    cached = _load(key)
+
+    if cached and IMMUTABLE_URL_PATTERN.search(url):
+        _count("hits")
+        return _to_response(cached)
+
+    request_headers = dict(headers)
+    if cached:
+        if 'etag' in cached["headers"]:
+            request_headers['If-None-Match'] = cached["headers"]['etag']
+        if 'last-modified' in cached["headers"]:
+            request_headers['If-Modified-Since'] = cached["headers"]['last-modified']
+
+    response: requests.Response = send_github_request("GET", url, request_headers, priority, session, params=params)
+
+    if response.status_code == 304 and cached:
+        _count("revalidated")
+        return _to_response(cached)
+
+    _count("misses")
+    if response.status_code == 200 and ('etag' in response.headers or 'last-modified' in response.headers or IMMUTABLE_URL_PATTERN.search(url)):
+        _store(key, response)
+
+    return response
@@ -0,0 +1,55 @@
+from datetime import datetime, timedelta, timezone
+from typing import List
+from sqlalchemy import text
+import os
+import dotenv
+try:
+    from ..database import engine
+except ImportError:
+    import sys
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+    from be.database import engine
+
+
+dotenv.load_dotenv()
+
+# 앱/워커가 시작할 때 이번 달부터 몇 달 뒤까지 commits, code_changes 파티션을 미리 만들어둘지
+PARTITION_MONTHS_AHEAD: int = int(os.getenv("PARTITION_MONTHS_AHEAD", "3"))
+
+
+def ensure_commit_partitions(start_date: datetime, end_date: datetime) -> None:
+    """
+    start_date ~ end_date가 걸친 모든 달(서울 기준)의 commits, code_changes 파티션을 만들어요.
+    이미 있으면 아무것도 하지 않아요.
+
+    파티션을 붙일 때 부모 테이블과 참조하는 repositories를 잠그니까,
+    저장 트랜잭션 안에서 부르면 안 되고 트랜잭션을 시작하기 전에 따로 불러야 해요.
+    """
+    with engine.begin() as conn:
+        conn.execute(
+            text("SELECT ensure_commit_partitions(:start_date, :end_date)"),
+            {"start_date": start_date, "end_date": end_date}
+        )
+
+def ensure_future_partitions() -> None:
+    now = datetime.now(timezone.utc)
+    ensure_commit_partitions(now, now + timedelta(days=31 * PARTITION_MONTHS_AHEAD))
+
+def get_commit_partitions() -> List[str]:
+    """
+    return: 붙어있는 commits 파티션 이름 목록 (commits_p2025_01, ..., commits_default)
+    """
+    with engine.connect() as conn:
+        return list(conn.execute(text("""
+            SELECT child.relname
+            FROM pg_inherits
+            JOIN pg_class parent ON pg_inherits.inhparent = parent.oid
+            JOIN pg_class child ON pg_inherits.inhrelid = child.oid
+            WHERE parent.relname = 'commits'
+            ORDER BY child.relname
+        """)).scalars())
+
+
+if __name__ == "__main__":
+    ensure_future_partitions()
+    print(get_commit_partitions())
@@ -0,0 +1,132 @@
+from typing import Dict, List, Optional, Tuple
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+import hashlib
+import zlib
+import os
+import dotenv
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+
+dotenv.load_dotenv()
+
+# patch 압축 방식: zlib(기본), zstd(zstandard 패키지 필요), none
+PATCH_COMPRESSION: str = os.getenv("PATCH_COMPRESSION", "zlib").lower()
+# 파일 하나의 patch 최대 크기(byte), 넘는 부분은 잘라요
+PATCH_MAX_FILE_BYTES: int = int(os.getenv("PATCH_MAX_FILE_BYTES", "100000"))
+# 커밋 하나의 patch 합계 최대 크기(byte), 넘으면 뒤쪽 파일부터 잘라요
+PATCH_MAX_COMMIT_BYTES: int = int(os.getenv("PATCH_MAX_COMMIT_BYTES", "1000000"))
+
+TRUNCATION_MARKER: str = "\n... [truncated {omitted} bytes]"
+
+if PATCH_COMPRESSION == "zstd" and zstandard is None:
+    print("        | zstandard is not installed, PATCH_COMPRESSION falls back to zlib")
+    PATCH_COMPRESSION = "zlib"
+
+
+def _truncate(patch_bytes: bytes, max_bytes: int) -> Tuple[str, bool]:
+    if len(patch_bytes) <= max_bytes:
+        return patch_bytes.decode("utf-8", errors="replace"), False
+
+    # 멀티바이트 문자가 중간에 잘리면 버려요
+    kept = patch_bytes[:max_bytes].decode("utf-8", errors="ignore")
+    return kept + TRUNCATION_MARKER.format(omitted=len(patch_bytes) - len(kept.encode("utf-8"))), True
+
+def _compress(text: str) -> Tuple[bytes, str]:
+    raw = text.encode("utf-8")
+    if PATCH_COMPRESSION == "zstd":
+        return zstandard.ZstdCompressor().compress(raw), "zstd"
+    if PATCH_COMPRESSION == "none":
+        return raw, "none"
+    return zlib.compress(raw), "zlib"
+
+def encode_patch(patch: Optional[str], max_bytes: int = PATCH_MAX_FILE_BYTES) -> Dict:
+    """
+    patch 하나를 max_bytes로 자르고 압축해서 {hash, data, encoding, original_size, truncated}를 반환해요.
+
+    - hash: 저장할 patch(잘린 경우 잘린 내용)의 sha256, patch_blobs의 키에요
+    - original_size: 자르기 전 patch 크기(byte)
+    - truncated: 크기 제한 때문에 잘렸는지 (잘린 patch 끝에는 TRUNCATION_MARKER가 붙어요)
+    """
+    patch_bytes = (patch or '').encode("utf-8")
+    text, truncated = _truncate(patch_bytes, max(max_bytes, 0))
+    data, encoding = _compress(text)
+
+    return {
+        "hash": hashlib.sha256(text.encode("utf-8")).hexdigest(),
+        "data": data,
+        "encoding": encoding,
+        "original_size": len(patch_bytes),
+        "truncated": truncated
+    }
+
+def encode_commit_patches(files_changed: List[Dict]) -> List[Dict]:
+    """
+    커밋의 파일별 patch에 파일/커밋 크기 제한을 적용하고 압축해요.
+    files_changed와 같은 순서로 encode_patch의 결과를 반환해요.
+    """
+    remaining = PATCH_MAX_COMMIT_BYTES
+    encoded: List[Dict] = []
+
+    for file_change in files_changed:
+        stored_patch = encode_patch(file_change.get('patch'), min(PATCH_MAX_FILE_BYTES, remaining))
+        remaining -= min(stored_patch['original_size'], PATCH_MAX_FILE_BYTES)
+        encoded.append(stored_patch)
+
+    return encoded
+
+def store_patch_blobs(db: Session, stored_patches: List[Dict]) -> None:
+    """
+    encode_commit_patches의 결과를 patch_blobs에 저장해요.
+    같은 내용의 patch(fork, cherry-pick, vendoring 등)는 레포가 달라도 한 번만 저장돼요.
+    커밋은 호출한 쪽에서 해요.
+    """
+    blobs = {patch['hash']: patch for patch in stored_patches}
+    if not blobs:
+        return
+
+    db.execute(
+        text("""
+            INSERT INTO patch_blobs (blob_hash, data, encoding)
+            SELECT *
+            FROM unnest(CAST(:blob_hashes AS TEXT[]), CAST(:data AS BYTEA[]), CAST(:encodings AS TEXT[]))
+            ON CONFLICT (blob_hash) DO NOTHING
+        """),
+        {
+            "blob_hashes": list(blobs),
+            "data": [patch['data'] for patch in blobs.values()],
+            "encodings": [patch['encoding'] for patch in blobs.values()]
+        }
+    )
+
+def decode_patch(data: Optional[bytes], encoding: Optional[str], content: Optional[str] = None) -> str:
+    """
+    저장된 patch를 원래 문자열로 되돌려요.
+    압축 저장 이전에 content 컬럼에 그대로 저장된 행은 content를 반환해요.
+
+    읽을 때는 patch_blobs를 먼저 보고, 없으면 code_changes에 남아있는 값을 써요.
+        decode_patch(COALESCE(pb.data, cc.content_data), COALESCE(pb.encoding, cc.content_encoding), cc.content)
+    """
+    if data is None:
+        return content or ''
+
+    data = bytes(data)
+    if encoding == "zstd":
+        if zstandard is None:
+            raise RuntimeError("zstandard is required to read zstd-compressed patches")
+        return zstandard.ZstdDecompressor().decompress(data).decode("utf-8")
+    if encoding == "zlib":
+        return zlib.decompress(data).decode("utf-8")
+    return data.decode("utf-8")
+
+
+if __name__ == "__main__":
+    from icecream import ic
+
+    files_changed = [{'patch': "@@ -1 +1 @@\n-a\n+b"}, {'patch': "x" * (PATCH_MAX_FILE_BYTES + 10)}]
+    for file_change, stored in zip(files_changed, encode_commit_patches(files_changed)):
+        ic(stored['encoding'], stored['original_size'], len(stored['data']), stored['truncated'])
+        ic(decode_patch(stored['data'], stored['encoding'])[-40:])
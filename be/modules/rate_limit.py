@@ -0,0 +1,208 @@
+import requests
+from typing import Dict, Optional
+import threading
+import hashlib
+import time
+import os
+import dotenv
+try:
+    from .github_client import get_github_session, GITHUB_TIMEOUT
+except ImportError:
+    import sys
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+    from be.modules.github_client import get_github_session, GITHUB_TIMEOUT
+
+
+dotenv.load_dotenv()
+
+# 우선순위: 사용자가 기다리는 /get 요청은 interactive, 커밋 수집 같은 작업은 background
+PRIORITY_INTERACTIVE: str = "interactive"
+PRIORITY_BACKGROUND: str = "background"
+
+# background 요청은 남은 요청 수가 이만큼 이하가 되면 reset까지 기다려서 interactive 몫을 남겨둬요
+GITHUB_BACKGROUND_RESERVE: int = int(os.getenv("GITHUB_BACKGROUND_RESERVE", "100"))
+# 남은 요청 비율이 이보다 낮아지면 reset까지 남은 시간에 요청을 고르게 나눠 보내요
+GITHUB_PACING_THRESHOLD: float = float(os.getenv("GITHUB_PACING_THRESHOLD", "0.2"))
+# rate limit에 걸렸을 때 다시 시도하는 횟수
+GITHUB_RATE_LIMIT_RETRIES: int = int(os.getenv("GITHUB_RATE_LIMIT_RETRIES", "3"))
+# 우선순위별로 보내기 전이나 rate limit 응답 후 다시 보내기 전에 기다릴 수 있는 최대 시간(초). 넘으면 기다리지 않고 rate limit 응답을 반환해요
+MAX_WAIT_SECONDS: Dict[str, float] = {
+    PRIORITY_INTERACTIVE: float(os.getenv("GITHUB_INTERACTIVE_MAX_WAIT", "10")),
+    PRIORITY_BACKGROUND: float(os.getenv("GITHUB_BACKGROUND_MAX_WAIT", "900")),
+}
+# secondary rate limit 응답에 retry-after가 없을 때 기다리는 기본 시간(초)
+SECONDARY_LIMIT_WAIT: float = 60.0
+
+# (토큰 해시, resource) -> {"limit", "remaining", "reset"}
+_budgets: Dict[tuple, Dict[str, float]] = {}
+# (토큰 해시, resource) -> 보냈지만 아직 응답을 받지 못한 요청 수
+_in_flight: Dict[tuple, int] = {}
+_budgets_lock = threading.Lock()
+
+
+def _budget_key(headers: Dict[str, str], resource: str) -> tuple:
+    # "token xxx", "bearer xxx" 모두 같은 토큰으로 취급
+    token = headers.get('Authorization', '').split(' ')[-1]
+    return (hashlib.sha256(token.encode()).hexdigest(), resource)
+
+def _resource_for(url: str) -> str:
+    return "graphql" if url.rstrip('/').endswith('/graphql') else "core"
+
+def _reserve_slot(key: tuple, priority: str) -> tuple:
+    """
+    요청 하나를 보낼 자리가 있는지 확인해요.
+    return: (reserved, wait)
+        - reserved가 True면 남은 요청 수를 미리 하나 줄였고, wait초(pacing)만 쉬고 보내면 돼요
+        - reserved가 False면 wait초 뒤에 다시 확인해야 해요
+    """
+    with _budgets_lock:
+        budget = _budgets.get(key)
+        now = time.time()
+
+        # 아직 응답을 받아본 적이 없거나 reset 시간이 지났으면 바로 보내요
+        if budget is None or budget["reset"] <= now:
+            _in_flight[key] = _in_flight.get(key, 0) + 1
+            return (True, 0.0)
+
+        reserve = GITHUB_BACKGROUND_RESERVE if priority == PRIORITY_BACKGROUND else 0
+        available = budget["remaining"] - reserve
+
+        if available <= 0:
+            return (False, budget["reset"] - now + 1)
+
+        budget["remaining"] -= 1
+        _in_flight[key] = _in_flight.get(key, 0) + 1
+
+        # interactive 요청은 pacing 없이 바로 보내요
+        if priority == PRIORITY_BACKGROUND and budget["remaining"] < budget["limit"] * GITHUB_PACING_THRESHOLD:
+            return (True, (budget["reset"] - now) / available)
+
+        return (True, 0.0)
+
+def _wait_for_budget(key: tuple, priority: str) -> Optional[float]:
+    """
+    보낼 수 있을 때까지 기다려요. 기다리는 시간은 모두 합쳐서 우선순위별 최대 대기 시간을 넘지 않아요.
+    interactive 요청은 그보다 오래 기다려야 하면 바로 보내서 GitHub의 응답을 그대로 받고,
+    background 요청은 보내지 않아요 (요청을 처리하는 스레드에서 불려도 reset까지 한 시간 가까이 멈추지 않게요).
+
+    return: 보내도 되면 None, 보내지 않아야 하면 더 기다려야 하는 시간(초)
+    """
+    waited = 0.0
+    while True:
+        reserved, wait = _reserve_slot(key, priority)
+        if reserved:
+            if wait > 0:
+                time.sleep(min(wait, MAX_WAIT_SECONDS[priority]))
+            return None
+
+        if waited + wait > MAX_WAIT_SECONDS[priority]:
+            if priority == PRIORITY_INTERACTIVE:
+                # 남은 요청 수는 줄이지 않지만, 응답을 받으면 _release_slot이 하나 빼니까 보내는 중인 요청으로 세요
+                with _budgets_lock:
+                    _in_flight[key] = _in_flight.get(key, 0) + 1
+                return None
+            return wait
+
+        print(f"        | rate limit budget exhausted ({priority}), waiting {wait:.0f}s")
+        time.sleep(wait)
+        waited += wait
+
+def _release_slot(key: tuple, response: Optional[requests.Response]) -> None:
+    """
+    응답을 받으면(또는 보내다 실패하면) 예약한 자리를 풀고 남은 요청 수를 맞춰요.
+    응답 헤더의 x-ratelimit-remaining이 GitHub가 실제로 센 값이라서, 거기서 아직 응답을 받지 못한 요청 수만 빼요.
+    (304나 캐시처럼 GitHub가 세지 않은 요청에 쓴 자리는 이렇게 돌려받아요)
+    헤더가 없으면 GitHub가 세지 않은 것으로 보고 자리를 돌려줘요.
+    """
+    headers = response.headers if response is not None else {}
+
+    with _budgets_lock:
+        in_flight = max(_in_flight.get(key, 0) - 1, 0)
+        _in_flight[key] = in_flight
+        budget = _budgets.get(key)
+
+        if 'x-ratelimit-remaining' not in headers or 'x-ratelimit-reset' not in headers:
+            if budget is not None and budget["reset"] > time.time():
+                budget["remaining"] = min(budget["remaining"] + 1, budget["limit"])
+            return
+
+        remaining = float(headers['x-ratelimit-remaining'])
+        _budgets[key] = {
+            "limit": float(headers.get('x-ratelimit-limit', remaining)),
+            "remaining": max(remaining - in_flight, 0),
+            "reset": float(headers['x-ratelimit-reset'])
+        }
+
+def _budget_exhausted_response(url: str, wait: float) -> requests.Response:
+    """
+    background 요청을 보내지 않을 때 GitHub의 rate limit 응답 대신 반환하는 429 응답이에요.
+    """
+    response = requests.Response()
+    response.status_code = 429
+    response.url = url
+    response.headers['retry-after'] = str(int(wait) + 1)
+    response._content = f'{{"message": "rate limit budget exhausted, retry after {int(wait) + 1}s"}}'.encode("utf-8")
+    return response
+
+def _retry_wait(response: requests.Response, attempt: int) -> Optional[float]:
+    """
+    rate limit 때문에 실패한 응답이면 다시 보내기 전에 기다릴 시간(초)을, 아니면 None을 반환해요.
+    """
+    if response.status_code not in (403, 429):
+        return None
+
+    headers = response.headers
+
+    # secondary rate limit은 retry-after를 알려줘요
+    if 'retry-after' in headers:
+        return float(headers['retry-after'])
+
+    # primary rate limit 소진
+    if headers.get('x-ratelimit-remaining') == '0' and 'x-ratelimit-reset' in headers:
+        return max(float(headers['x-ratelimit-reset']) - time.time(), 0) + 1
+
+    if 'secondary rate limit' in response.text.lower():
+        return SECONDARY_LIMIT_WAIT * (2 ** attempt)
+
+    return None
+
+def get_rate_limit_status() -> Dict[str, Dict[str, float]]:
+    """
+    토큰(해시 앞 8자리)과 resource별로 마지막으로 확인한 rate limit 상태를 반환해요.
+    """
+    with _budgets_lock:
+        return {f"{token_hash[:8]}:{resource}": dict(budget) for (token_hash, resource), budget in _budgets.items()}
+
+def send_github_request(method: str, url: str, headers: Dict[str, str], priority: str = PRIORITY_INTERACTIVE, session: Optional[requests.Session] = None, **kwargs) -> requests.Response:
+    """
+    모든 GitHub API 요청이 거쳐가는 스케줄러에요.
+    토큰별 남은 요청 수를 보고 필요하면 기다렸다가 보내고, rate limit(403/429) 응답을 받으면 기다렸다가 다시 보내요.
+    다시 보내기 전에 기다려야 하는 시간이 우선순위별 최대 대기 시간을 넘으면 rate limit 응답을 그대로 반환해요.
+    background 요청은 남은 요청 수가 없어서 최대 대기 시간보다 오래 기다려야 하면 보내지 않고 429 응답을 반환해요.
+    session을 주지 않으면 앱이 공유하는 keep-alive 세션을 사용해요.
+    """
+    key = _budget_key(headers, _resource_for(url))
+    session = session or get_github_session()
+    kwargs.setdefault('timeout', GITHUB_TIMEOUT)
+
+    response: Optional[requests.Response] = None
+    for attempt in range(GITHUB_RATE_LIMIT_RETRIES + 1):
+        budget_wait = _wait_for_budget(key, priority)
+        if budget_wait is not None:
+            print(f"        | rate limit budget exhausted ({priority}), not waiting {budget_wait:.0f}s")
+            return _budget_exhausted_response(url, budget_wait)
+
+        response = None
+        try:
+            response = session.request(method, url, headers=headers, **kwargs)
+        finally:
+            _release_slot(key, response)
+
+        wait = _retry_wait(response, attempt)
+        if wait is None or attempt == GITHUB_RATE_LIMIT_RETRIES or wait > MAX_WAIT_SECONDS[priority]:
+            return response
+
+        print(f"        | rate limited ({response.status_code}), retry {attempt + 1}/{GITHUB_RATE_LIMIT_RETRIES} in {wait:.0f}s")
+        time.sleep(wait)
+
+    return response
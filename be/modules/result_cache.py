@@ -0,0 +1,82 @@
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+import threading
+import os
+import dotenv
+try:
+    from .. import session_scope
+except ImportError:
+    import sys
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+    from be import session_scope
+
+
+dotenv.load_dotenv()
+
+# 분석 결과를 프로세스 안에 캐시해둘 최대 개수 (넘으면 가장 오래 안 쓴 것부터 지워요, 0이면 캐시하지 않아요)
+RESULT_CACHE_MAX_ENTRIES: int = int(os.getenv("RESULT_CACHE_MAX_ENTRIES", "2048"))
+
+# (github_username, metric, params, data_version) -> 결과
+_results: "OrderedDict[Tuple, Any]" = OrderedDict()
+_results_lock = threading.Lock()
+_stats: Dict[str, int] = {"hits": 0, "misses": 0, "evictions": 0}
+
+
+def get_data_version(github_username: str, db: Optional[Session] = None) -> int:
+    """
+    github_username의 데이터 버전 (save_repo_and_commits가 저장할 때마다 1씩 올라가요, 저장한 적이 없으면 0)
+    """
+    with session_scope(db) as db:
+        version = db.execute(
+            text("SELECT version FROM data_versions WHERE github_username = :username"),
+            {"username": github_username}
+        ).scalar()
+        return version or 0
+
+def cached_result(metric: str, github_username: str, params: Hashable, compute: Callable[[], Any], db: Optional[Session] = None) -> Any:
+    """
+    (github_username, metric, params, 데이터 버전)이 같으면 compute를 다시 부르지 않고 캐시된 결과를 반환해요.
+    저장하면 버전이 올라가서 예전 결과는 다시 쓰이지 않고, LRU로 밀려나요.
+    반환한 결과는 캐시와 같은 객체라서 고치면 안 돼요.
+
+    버전을 compute보다 먼저 읽어서, 그 사이에 저장이 끝나도 새 데이터가 예전 버전 키에 들어갈 뿐 예전 데이터가 새 버전 키에 들어가지는 않아요.
+    """
+    if RESULT_CACHE_MAX_ENTRIES <= 0:
+        return compute()
+
+    key = (github_username, metric, params, get_data_version(github_username, db))
+
+    with _results_lock:
+        if key in _results:
+            _results.move_to_end(key)
+            _stats["hits"] += 1
+            return _results[key]
+        _stats["misses"] += 1
+
+    result = compute()
+
+    with _results_lock:
+        _results[key] = result
+        _results.move_to_end(key)
+        while len(_results) > RESULT_CACHE_MAX_ENTRIES:
+            _results.popitem(last=False)
+            _stats["evictions"] += 1
+
+    return result
+
+def clear_result_cache() -> None:
+    with _results_lock:
+        _results.clear()
+
+def get_result_cache_stats() -> Dict[str, float]:
+    """
+    분석 결과 캐시 hit/miss/eviction 카운터와 현재 개수를 반환해요.
+    """
+    with _results_lock:
+        stats = dict(_stats)
+        stats["size"] = len(_results)
+    total = stats["hits"] + stats["misses"]
+    stats["hit_ratio"] = stats["hits"] / total if total else 0.0
+    return stats
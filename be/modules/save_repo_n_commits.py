@@ -1,19 +1,32 @@
 from datetime import datetime, timezone
 try:
-    from .. import SessionLocal
+    from .. import SessionLocal, session_scope
+    from .patch_storage import encode_commit_patches, store_patch_blobs
+    from .partitions import ensure_commit_partitions
 except ImportError:
     import sys
     import os
     sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
-    from be import SessionLocal
-from typing import List, Dict, Union
+    from be import SessionLocal, session_scope
+    from be.modules.patch_storage import encode_commit_patches, store_patch_blobs
+    from be.modules.partitions import ensure_commit_partitions
+from typing import List, Dict, Optional, Union
 from sqlalchemy.orm import Session
 from sqlalchemy import text
+import os
+import dotenv
+
+
+dotenv.load_dotenv()
+
+# 한 번의 INSERT로 저장할 최대 행 수 (커밋, 변경 파일 각각)
+SAVE_BATCH_SIZE: int = int(os.getenv("SAVE_BATCH_SIZE", "1000"))
 
 def save_repo_and_commits(
     github_username: str,
     repo_data: Dict,
-    commits_data: List[Dict]
+    commits_data: List[Dict],
+    partial: bool = False
 ) -> Union[bool, str]:
     """
     레포지토리 정보와 커밋 데이터를 데이터베이스에 저장
@@ -22,6 +35,9 @@ def save_repo_and_commits(
         github_username: GitHub 사용자 이름
         repo_data: 레포지토리 정보
         commits_data: 커밋 정보 리스트
+        partial: 기간 전체가 아니라 일부 커밋만 저장하는지 (push webhook)
+            True면 이미 같은 달에 동기화 커서가 있을 때만 커서를 옮겨요.
+            그 달을 끝까지 동기화한 적이 없는데 커서를 옮기면 다음 /save가 커서부터 가져와서 그 앞의 커밋을 건너뛰어요.
 
     return:
         True: 성공
@@ -29,6 +45,12 @@ def save_repo_and_commits(
     """
     try:
         db: Session = SessionLocal()
+
+        # 저장할 커밋들이 들어갈 월 파티션을 먼저 만들어둬요
+        # 파티션을 붙일 때 repositories도 잠그니까 저장 트랜잭션을 시작하기 전에 해야 해요
+        if commits_data:
+            commit_dates = [_parse_commit_date(commit['date']) for commit in commits_data]
+            ensure_commit_partitions(min(commit_dates), max(commit_dates))
         
         # 레포지토리 저장
         repo_query = text("""
@@ -51,64 +73,176 @@ def save_repo_and_commits(
         )
         repo_id = result.scalar()
         
-        # 커밋 데이터 저장
-        for commit in commits_data:
-            # 커밋 기본 정보 저장
-            commit_query = text("""
-                INSERT INTO commits (repo_id, commit_hash, commit_message, commit_date, author)
-                VALUES (:repo_id, :commit_hash, :commit_message, :commit_date, :author)
-                ON CONFLICT (repo_id, commit_hash)
-                DO UPDATE SET 
-                    commit_message = :commit_message,
-                    author = :author
-                RETURNING commit_id
-            """)
-            
+        # 같은 커밋이 두 번 들어오면 ON CONFLICT DO UPDATE가 한 행을 두 번 고치게 돼서, 마지막 것만 남겨요
+        commits_data = list({commit['sha']: commit for commit in commits_data}.values())
+
+        # 커밋 데이터 저장 (배열로 넘겨서 한 번에 저장)
+        for commits_chunk in _chunks(commits_data, SAVE_BATCH_SIZE):
             result = db.execute(
-                commit_query,
+                text("""
+                    INSERT INTO commits (repo_id, commit_hash, commit_message, commit_date, author)
+                    SELECT :repo_id, *
+                    FROM unnest(
+                        CAST(:commit_hashes AS TEXT[]),
+                        CAST(:commit_messages AS TEXT[]),
+                        CAST(:commit_dates AS TIMESTAMPTZ[]),
+                        CAST(:authors AS TEXT[])
+                    )
+                    ON CONFLICT (repo_id, commit_hash, commit_date)
+                    DO UPDATE SET
+                        commit_message = EXCLUDED.commit_message,
+                        author = EXCLUDED.author
+                    RETURNING commit_hash, commit_id, commit_date
+                """),
                 {
                     "repo_id": repo_id,
-                    "commit_hash": commit['sha'],
-                    "commit_message": commit['commit_message'],
-                    "commit_date": commit['date'],
-                    "author": commit['author']
+                    "commit_hashes": [commit['sha'] for commit in commits_chunk],
+                    "commit_messages": [commit['commit_message'] for commit in commits_chunk],
+                    "commit_dates": [_parse_commit_date(commit['date']) for commit in commits_chunk],
+                    "authors": [commit['author'] for commit in commits_chunk]
                 }
             )
-            commit_id = result.scalar()
-            
-            for file_change in commit['files_changed']:
-                filename = file_change['filename']
-                file_extension = 'none'
-                if '.' in filename:
-                    possible_extension = filename.split('.')[-1]
-                    if len(possible_extension) <= 45: 
-                        file_extension = possible_extension
-
-                change_query = text("""
-                    INSERT INTO code_changes (
-                        commit_id, file_path, change_type, content,
-                        additions, deletions, changes, language
-                    )
-                    VALUES (
-                        :commit_id, :file_path, :change_type, :content,
-                        :additions, :deletions, :changes, :language
-                    )
-                """)
-                
+            commit_keys: Dict[str, tuple] = {row.commit_hash: (row.commit_id, row.commit_date) for row in result}
+
+            # patch는 크기 제한을 적용하고 압축해서 patch_blobs에 저장하고, code_changes에는 hash만 남겨요
+            changes: List[Dict] = []
+            for commit in commits_chunk:
+                stored_patches = encode_commit_patches(commit['files_changed'])
+                for file_change, stored_patch in zip(commit['files_changed'], stored_patches):
+                    commit_id, commit_date = commit_keys[commit['sha']]
+                    changes.append({
+                        "commit_id": commit_id,
+                        "commit_date": commit_date,
+                        "file_change": file_change,
+                        "stored_patch": stored_patch
+                    })
+            store_patch_blobs(db, [change['stored_patch'] for change in changes])
+            # (commit_id, file_path)가 중복되면 마지막 것만 남겨요
+            changes = list({(change['commit_id'], change['file_change']['filename']): change for change in changes}.values())
+
+            for changes_chunk in _chunks(changes, SAVE_BATCH_SIZE):
                 db.execute(
-                    change_query,
+                    text("""
+                        INSERT INTO code_changes (
+                            commit_id, commit_date, file_path, change_type,
+                            patch_hash, content_size, content_truncated,
+                            additions, deletions, changes, language
+                        )
+                        SELECT *
+                        FROM unnest(
+                            CAST(:commit_ids AS INTEGER[]),
+                            CAST(:commit_dates AS TIMESTAMPTZ[]),
+                            CAST(:file_paths AS TEXT[]),
+                            CAST(:change_types AS TEXT[]),
+                            CAST(:patch_hashes AS TEXT[]),
+                            CAST(:content_sizes AS INTEGER[]),
+                            CAST(:content_truncated AS BOOLEAN[]),
+                            CAST(:additions AS INTEGER[]),
+                            CAST(:deletions AS INTEGER[]),
+                            CAST(:changes AS INTEGER[]),
+                            CAST(:languages AS TEXT[])
+                        )
+                        ON CONFLICT (commit_id, commit_date, file_path)
+                        DO UPDATE SET
+                            change_type = EXCLUDED.change_type,
+                            content = NULL,
+                            content_data = NULL,
+                            content_encoding = NULL,
+                            patch_hash = EXCLUDED.patch_hash,
+                            content_size = EXCLUDED.content_size,
+                            content_truncated = EXCLUDED.content_truncated,
+                            additions = EXCLUDED.additions,
+                            deletions = EXCLUDED.deletions,
+                            changes = EXCLUDED.changes,
+                            language = EXCLUDED.language
+                    """),
                     {
-                        "commit_id": commit_id,
-                        "file_path": file_change['filename'],
-                        "change_type": file_change['status'],
-                        "content": file_change.get('patch', ''),
-                        "additions": file_change['additions'],
-                        "deletions": file_change['deletions'],
-                        "changes": file_change['changes'],
-                        "language": file_extension or "none"
+                        "commit_ids": [change['commit_id'] for change in changes_chunk],
+                        "commit_dates": [change['commit_date'] for change in changes_chunk],
+                        "file_paths": [change['file_change']['filename'] for change in changes_chunk],
+                        "change_types": [change['file_change']['status'] for change in changes_chunk],
+                        "patch_hashes": [change['stored_patch']['hash'] for change in changes_chunk],
+                        "content_sizes": [change['stored_patch']['original_size'] for change in changes_chunk],
+                        "content_truncated": [change['stored_patch']['truncated'] for change in changes_chunk],
+                        "additions": [change['file_change']['additions'] for change in changes_chunk],
+                        "deletions": [change['file_change']['deletions'] for change in changes_chunk],
+                        "changes": [change['file_change']['changes'] for change in changes_chunk],
+                        "languages": [_file_extension(change['file_change']['filename']) for change in changes_chunk]
                     }
                 )
         
+        # 이번에 저장한 커밋이 있는 날짜들의 daily_activity를 다시 계산해요 (다시 저장해도 두 번 세지 않도록 덮어써요)
+        if commits_data:
+            # 같은 레포를 동시에 저장하면(webhook 작업, /save, 워커) 각자 자기 스냅샷으로 다시 계산해서 나중 것이 덮어쓰니까,
+            # 레포별 advisory lock을 잡고 계산해요. 다음 저장은 앞의 저장이 커밋된 뒤에 그 커밋까지 보고 다시 계산해요
+            db.execute(
+                text("SELECT pg_advisory_xact_lock(hashtext('daily_activity'), :repo_id)"),
+                {"repo_id": repo_id}
+            )
+            db.execute(
+                text("""
+                    WITH days AS (
+                        SELECT DISTINCT (d AT TIME ZONE 'Asia/Seoul')::date AS local_date
+                        FROM unnest(CAST(:commit_dates AS TIMESTAMPTZ[])) d
+                    )
+                    INSERT INTO daily_activity (github_username, local_date, repo_id, commit_count, additions, deletions)
+                    SELECT :username, days.local_date, c.repo_id, COUNT(*), COALESCE(SUM(s.additions), 0), COALESCE(SUM(s.deletions), 0)
+                    FROM days
+                    JOIN commits c ON c.repo_id = :repo_id
+                        AND c.commit_date >= days.local_date::timestamp AT TIME ZONE 'Asia/Seoul'
+                        AND c.commit_date < (days.local_date + 1)::timestamp AT TIME ZONE 'Asia/Seoul'
+                    LEFT JOIN LATERAL (
+                        SELECT SUM(cc.additions) AS additions, SUM(cc.deletions) AS deletions
+                        FROM code_changes cc
+                        WHERE cc.commit_id = c.commit_id AND cc.commit_date = c.commit_date
+                    ) s ON TRUE
+                    GROUP BY days.local_date, c.repo_id
+                    ON CONFLICT (github_username, local_date, repo_id)
+                    DO UPDATE SET
+                        commit_count = EXCLUDED.commit_count,
+                        additions = EXCLUDED.additions,
+                        deletions = EXCLUDED.deletions
+                """),
+                {"username": github_username, "repo_id": repo_id, "commit_dates": commit_dates}
+            )
+
+        # 동기화 커서를 이번에 저장한 가장 최근 커밋으로 옮김 (이미 더 최근 커서가 있으면 유지)
+        # 일부 커밋만 저장할 때는 커서가 이미 같은 달(get_user_commits처럼 UTC 기준)에 있어야 옮겨요
+        if commits_data:
+            newest_commit = max(commits_data, key=lambda c: _parse_commit_date(c['date']))
+            if partial:
+                cursor_condition = """
+                    last_synced_commit_date <= :commit_date
+                    AND date_trunc('month', last_synced_commit_date AT TIME ZONE 'UTC') = date_trunc('month', CAST(:commit_date AS TIMESTAMPTZ) AT TIME ZONE 'UTC')
+                """
+            else:
+                cursor_condition = "(last_synced_commit_date IS NULL OR last_synced_commit_date <= :commit_date)"
+            db.execute(
+                text(f"""
+                    UPDATE repositories
+                    SET last_synced_commit_sha = :commit_hash, last_synced_commit_date = :commit_date
+                    WHERE repo_id = :repo_id
+                    AND {cursor_condition}
+                """),
+                {
+                    "repo_id": repo_id,
+                    "commit_hash": newest_commit['sha'],
+                    "commit_date": _parse_commit_date(newest_commit['date'])
+                }
+            )
+
+        # 분석 결과 캐시가 예전 결과를 쓰지 않도록 같은 트랜잭션에서 데이터 버전을 올려요
+        # 사용자 행을 잠그니까 커밋하기 바로 전에 올려서 잠그는 시간을 짧게 해요
+        db.execute(
+            text("""
+                INSERT INTO data_versions (github_username, version)
+                VALUES (:username, 1)
+                ON CONFLICT (github_username)
+                DO UPDATE SET version = data_versions.version + 1, updated_at = CURRENT_TIMESTAMP
+            """),
+            {"username": github_username}
+        )
+        
         db.commit()
         return True
         
@@ -118,7 +252,24 @@ def save_repo_and_commits(
     finally:
         db.close()
 
-def check_repo_update_needed(github_username: str, repo_url: str, updated_at: Union[str, datetime], db: Session = SessionLocal()) -> bool:
+def _chunks(items: List, size: int):
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+def _file_extension(filename: str) -> str:
+    file_extension = 'none'
+    if '.' in filename:
+        possible_extension = filename.split('.')[-1]
+        if len(possible_extension) <= 45: 
+            file_extension = possible_extension
+    return file_extension or "none"
+
+def _parse_commit_date(value: Union[str, datetime]) -> datetime:
+    if isinstance(value, datetime):
+        return value
+    return datetime.fromisoformat(value.replace('Z', '+00:00'))
+
+def check_repo_update_needed(github_username: str, repo_url: str, updated_at: Union[str, datetime], db: Optional[Session] = None) -> bool:
     """
     db 날짜 기준으로 레포의 업데이트 필요 여부를 확인
     username - repo_url 기준
@@ -130,7 +281,7 @@ def check_repo_update_needed(github_username: str, repo_url: str, updated_at: Un
         True: 업데이트 필요
         False: 업데이트 불필요
     """
-    try:
+    with session_scope(db) as db:
         query = text("""
             SELECT last_updated 
             FROM repositories 
@@ -149,8 +300,6 @@ def check_repo_update_needed(github_username: str, repo_url: str, updated_at: Un
             github_updated_at = updated_at.replace(tzinfo=timezone.utc) if updated_at.tzinfo is None else updated_at
             
         return github_updated_at > db_updated_at
-    finally:
-        db.close()
 
 if __name__ == "__main__":
     from be.modules.fetch_user_repos import get_user_repos
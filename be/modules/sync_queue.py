@@ -0,0 +1,267 @@
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+from sqlalchemy import text
+import json
+import os
+import dotenv
+try:
+    from .. import SessionLocal
+except ImportError:
+    import sys
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+    from be import SessionLocal
+
+
+dotenv.load_dotenv()
+
+# 한 작업을 최대 몇 번까지 시도할지 (넘으면 dead 상태로 남겨둬요)
+SYNC_JOB_MAX_ATTEMPTS: int = int(os.getenv("SYNC_JOB_MAX_ATTEMPTS", "3"))
+# 실패한 작업을 다시 시도하기 전 기본 대기 시간(초), 시도할 때마다 두 배씩 늘어나요
+SYNC_JOB_RETRY_DELAY: int = int(os.getenv("SYNC_JOB_RETRY_DELAY", "30"))
+# running 상태에서 이 시간(초)동안 heartbeat가 없으면 워커가 죽은 것으로 보고 다시 queued로 돌려요
+SYNC_JOB_TIMEOUT: int = int(os.getenv("SYNC_JOB_TIMEOUT", "1800"))
+# 워커가 작업을 처리하는 동안 heartbeat를 남기는 간격(초), SYNC_JOB_TIMEOUT보다 충분히 짧아야 해요
+SYNC_JOB_HEARTBEAT_INTERVAL: int = int(os.getenv("SYNC_JOB_HEARTBEAT_INTERVAL", "60"))
+
+# 워커가 sync_repository에 넘기는 레포 정보 (owner는 GitHub에서 가져온 레포나 push 작업에만 있어요)
+REPOSITORY_FIELDS = ('name', 'html_url', 'private', 'updated_at')
+OPTIONAL_REPOSITORY_FIELDS = ('owner', 'full_name')
+
+
+def _serialize_repository(repository: Dict) -> Dict:
+    data = {key: repository[key] for key in REPOSITORY_FIELDS}
+    data.update({key: repository[key] for key in OPTIONAL_REPOSITORY_FIELDS if key in repository})
+    # GitHub 응답의 owner는 객체라서 login만 남겨요
+    if isinstance(data.get('owner'), dict):
+        data['owner'] = data['owner'].get('login')
+    # check_repo_update_needed는 GitHub API 형식(2024-01-01T00:00:00Z)의 문자열을 받아요
+    if isinstance(data['updated_at'], datetime):
+        updated_at = data['updated_at']
+        if updated_at.tzinfo:
+            updated_at = updated_at.astimezone(timezone.utc)
+        data['updated_at'] = updated_at.strftime('%Y-%m-%dT%H:%M:%SZ')
+    return data
+
+def enqueue_sync_job(github_username: str, repository: Dict, start_date: datetime, end_date: datetime, github_token: str) -> int:
+    """
+    레포 하나의 동기화 작업을 큐에 넣고 job_id를 반환해요.
+    토큰은 워커가 GitHub를 호출할 때만 쓰고, 작업이 끝나면(done/dead) 지워요.
+    """
+    db = SessionLocal()
+    try:
+        job_id = db.execute(text("""
+            INSERT INTO sync_jobs (github_username, repository, start_date, end_date, github_token, max_attempts)
+            VALUES (:username, CAST(:repository AS JSONB), :start_date, :end_date, :github_token, :max_attempts)
+            RETURNING job_id
+        """), {
+            "username": github_username,
+            "repository": json.dumps(_serialize_repository(repository)),
+            "start_date": start_date,
+            "end_date": end_date,
+            "github_token": github_token,
+            "max_attempts": SYNC_JOB_MAX_ATTEMPTS
+        }).scalar()
+        db.commit()
+        return job_id
+    except Exception as e:
+        db.rollback()
+        raise e
+    finally:
+        db.close()
+
+def enqueue_push_job(github_username: str, repository: Dict, commit_shas: List[str]) -> int:
+    """
+    push webhook으로 들어온 커밋들만 가져와서 저장하는 작업을 큐에 넣고 job_id를 반환해요.
+    사용자 토큰이 없어서 워커는 GITHUB_TOKEN 환경변수의 토큰을 사용해요.
+    """
+    db = SessionLocal()
+    try:
+        job_id = db.execute(text("""
+            INSERT INTO sync_jobs (github_username, repository, kind, commit_shas, max_attempts)
+            VALUES (:username, CAST(:repository AS JSONB), 'push', :commit_shas, :max_attempts)
+            RETURNING job_id
+        """), {
+            "username": github_username,
+            "repository": json.dumps(_serialize_repository(repository)),
+            "commit_shas": commit_shas,
+            "max_attempts": SYNC_JOB_MAX_ATTEMPTS
+        }).scalar()
+        db.commit()
+        return job_id
+    except Exception as e:
+        db.rollback()
+        raise e
+    finally:
+        db.close()
+
+def claim_sync_job(worker_id: str) -> Optional[Dict]:
+    """
+    실행할 수 있는 작업 하나를 running으로 바꾸고 가져와요.
+    FOR UPDATE SKIP LOCKED라서 여러 워커가 동시에 불러도 같은 작업을 가져가지 않아요.
+    """
+    db = SessionLocal()
+    try:
+        row = db.execute(text("""
+            UPDATE sync_jobs
+            SET status = 'running',
+                attempts = attempts + 1,
+                worker_id = :worker_id,
+                started_at = CURRENT_TIMESTAMP,
+                heartbeat_at = CURRENT_TIMESTAMP
+            WHERE job_id = (
+                SELECT job_id
+                FROM sync_jobs
+                WHERE status = 'queued'
+                AND available_at <= CURRENT_TIMESTAMP
+                ORDER BY available_at, job_id
+                FOR UPDATE SKIP LOCKED
+                LIMIT 1
+            )
+            RETURNING job_id, kind, github_username, repository, start_date, end_date, commit_shas, github_token, attempts, max_attempts
+        """), {"worker_id": worker_id}).mappings().first()
+        db.commit()
+        return dict(row) if row else None
+    except Exception as e:
+        db.rollback()
+        raise e
+    finally:
+        db.close()
+
+def heartbeat_sync_job(job_id: int, worker_id: str) -> bool:
+    """
+    worker_id가 처리 중인 작업의 heartbeat_at을 지금으로 바꿔요.
+    rate limit이 풀릴 때까지 기다리는 것처럼 오래 걸려도 heartbeat가 이어지면 다른 워커가 가져가지 않아요.
+
+    return: 아직 이 워커가 처리 중인 작업이면 True
+    """
+    db = SessionLocal()
+    try:
+        updated = db.execute(text("""
+            UPDATE sync_jobs
+            SET heartbeat_at = CURRENT_TIMESTAMP
+            WHERE job_id = :job_id AND status = 'running' AND worker_id = :worker_id
+        """), {"job_id": job_id, "worker_id": worker_id}).rowcount
+        db.commit()
+        return updated > 0
+    finally:
+        db.close()
+
+def complete_sync_job(job_id: int, worker_id: str, result: Dict) -> bool:
+    """
+    worker_id가 처리 중인 작업을 done으로 바꿔요.
+    그 사이 timeout으로 다른 상태가 됐거나 다른 워커가 가져갔으면 바꾸지 않아요.
+
+    return: 바꿨으면 True
+    """
+    db = SessionLocal()
+    try:
+        updated = db.execute(text("""
+            UPDATE sync_jobs
+            SET status = 'done',
+                result = CAST(:result AS JSONB),
+                last_error = NULL,
+                github_token = NULL,
+                finished_at = CURRENT_TIMESTAMP
+            WHERE job_id = :job_id AND status = 'running' AND worker_id = :worker_id
+        """), {"job_id": job_id, "worker_id": worker_id, "result": json.dumps(result, default=str)}).rowcount
+        db.commit()
+        return updated > 0
+    finally:
+        db.close()
+
+# 실패한 작업을 다시 queued로 돌리거나, 최대 시도 횟수를 넘었으면 dead로 바꾸는 SET 절 (fail_sync_job, requeue_stale_sync_jobs가 같이 써요)
+_FAIL_SET = """
+    SET status = CASE WHEN attempts >= max_attempts THEN 'dead' ELSE 'queued' END,
+        github_token = CASE WHEN attempts >= max_attempts THEN NULL ELSE github_token END,
+        available_at = CURRENT_TIMESTAMP + make_interval(secs => :retry_delay * power(2, attempts - 1)),
+        finished_at = CASE WHEN attempts >= max_attempts THEN CURRENT_TIMESTAMP ELSE NULL END,
+        last_error = :error
+"""
+
+def fail_sync_job(job_id: int, worker_id: str, error: str) -> Optional[str]:
+    """
+    worker_id가 처리 중인 작업을 다시 queued로 돌리거나, 최대 시도 횟수를 넘었으면 dead로 바꿔요.
+    그 사이 timeout으로 다른 상태가 됐거나 다른 워커가 가져갔으면 바꾸지 않아요.
+
+    return: 바뀐 상태 (queued | dead), 바꾸지 않았으면 None
+    """
+    db = SessionLocal()
+    try:
+        status = db.execute(text(f"""
+            UPDATE sync_jobs
+            {_FAIL_SET}
+            WHERE job_id = :job_id AND status = 'running' AND worker_id = :worker_id
+            RETURNING status
+        """), {"job_id": job_id, "worker_id": worker_id, "error": error, "retry_delay": SYNC_JOB_RETRY_DELAY}).scalar()
+        db.commit()
+        return status
+    finally:
+        db.close()
+
+def requeue_stale_sync_jobs() -> int:
+    """
+    SYNC_JOB_TIMEOUT동안 heartbeat가 없는 running 작업(워커가 죽은 경우)을 실패로 처리해서 다시 시도하게 해요.
+    고르는 것과 바꾸는 것을 한 UPDATE로 해서, 그 사이에 끝난 작업을 다시 queued로 돌리지 않아요.
+
+    return: 처리한 작업 수
+    """
+    db = SessionLocal()
+    try:
+        job_ids: List[int] = db.execute(text(f"""
+            UPDATE sync_jobs
+            {_FAIL_SET}
+            WHERE status = 'running'
+            AND COALESCE(heartbeat_at, started_at) < CURRENT_TIMESTAMP - make_interval(secs => :timeout)
+            RETURNING job_id
+        """), {"timeout": SYNC_JOB_TIMEOUT, "error": "worker timed out", "retry_delay": SYNC_JOB_RETRY_DELAY}).scalars().all()
+        db.commit()
+        return len(job_ids)
+    except Exception as e:
+        db.rollback()
+        raise e
+    finally:
+        db.close()
+
+def get_sync_job_status(github_username: str, job_id: int) -> Optional[Dict]:
+    """
+    작업 상태와 예상 남은 시간(eta_seconds)을 반환해요.
+    ETA는 최근에 끝난 작업들의 평균 실행 시간, 앞에 기다리는 작업 수, 지금 일하는 워커 수로 계산해요.
+    """
+    db = SessionLocal()
+    try:
+        job = db.execute(text("""
+            SELECT job_id, repository->>'name' AS repository, status, attempts, max_attempts,
+                   last_error, result, created_at, started_at, finished_at
+            FROM sync_jobs
+            WHERE job_id = :job_id AND github_username = :username
+        """), {"job_id": job_id, "username": github_username}).mappings().first()
+
+        if not job:
+            return None
+        job = dict(job)
+
+        stats = db.execute(text("""
+            SELECT
+                (SELECT AVG(EXTRACT(EPOCH FROM finished_at - started_at))
+                 FROM (SELECT finished_at, started_at FROM sync_jobs
+                       WHERE status = 'done' ORDER BY finished_at DESC LIMIT 100) recent) AS avg_seconds,
+                (SELECT COUNT(*) FROM sync_jobs WHERE status = 'queued' AND job_id < :job_id) AS ahead,
+                (SELECT COUNT(DISTINCT worker_id) FROM sync_jobs WHERE status = 'running') AS workers
+        """), {"job_id": job_id}).mappings().first()
+
+        avg_seconds = float(stats["avg_seconds"]) if stats["avg_seconds"] is not None else None
+        workers = max(stats["workers"], 1)
+
+        if job["status"] in ("done", "dead") or avg_seconds is None:
+            eta_seconds = 0 if job["status"] in ("done", "dead") else None
+        elif job["status"] == "running":
+            elapsed = (datetime.now(job["started_at"].tzinfo) - job["started_at"]).total_seconds()
+            eta_seconds = max(avg_seconds - elapsed, 0)
+        else:
+            eta_seconds = (stats["ahead"] // workers + 1) * avg_seconds
+
+        job["queue_position"] = stats["ahead"] if job["status"] == "queued" else 0
+        job["eta_seconds"] = eta_seconds
+        return job
+    finally:
+        db.close()
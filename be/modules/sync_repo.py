@@ -0,0 +1,195 @@
+from datetime import datetime
+from typing import Callable, Dict, Iterator, List, Optional
+from urllib.parse import urlparse
+from concurrent.futures import ThreadPoolExecutor
+import queue
+import os
+import dotenv
+try:
+    from .fetch_user_commit import get_user_commits, get_sync_cursor, fetch_commit_details
+    from .save_repo_n_commits import save_repo_and_commits, check_repo_update_needed
+except ImportError:
+    import sys
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+    from be.modules.fetch_user_commit import get_user_commits, get_sync_cursor, fetch_commit_details
+    from be.modules.save_repo_n_commits import save_repo_and_commits, check_repo_update_needed
+
+
+dotenv.load_dotenv()
+
+# 계정 전체 동기화 시 동시에 동기화할 레포 수
+SYNC_WORKER_COUNT: int = int(os.getenv("SYNC_WORKER_COUNT", "4"))
+
+
+def _repository_owner(repository: Dict, github_username: str) -> str:
+    """
+    레포 소유자 login을 반환해요. /user/repos에는 organization, collaborator 레포도 있어서 github_username이 소유자가 아닐 수 있어요.
+    owner는 GitHub 응답이면 {"login": ...}, push 작업이면 문자열이에요.
+    없으면 full_name(owner/name)이나 html_url(https://github.com/owner/name)에서 꺼내고, 그것도 없으면 github_username을 써요.
+    """
+    owner = repository.get('owner')
+    if isinstance(owner, dict):
+        owner = owner.get('login')
+    if not owner and repository.get('full_name'):
+        owner = repository['full_name'].split('/')[0]
+    if not owner and repository.get('html_url'):
+        parts = urlparse(repository['html_url']).path.strip('/').split('/')
+        if len(parts) == 2:
+            owner = parts[0]
+    return owner or github_username
+
+def sync_repository(
+    github_token: str,
+    github_username: str,
+    repository: Dict,
+    start_date: datetime,
+    end_date: datetime,
+    on_event: Optional[Callable[[Dict], None]] = None
+) -> Dict:
+    """
+    레포 하나의 기간 내 커밋을 가져와서 DB에 저장해요.
+    on_event를 주면 커밋 목록을 가져온 뒤 fetching_commits 이벤트를 보내요.
+
+    params:
+        repository: name, html_url, private, updated_at이 있는 레포 정보 (owner나 full_name이 있으면 그 소유자의 레포에서 가져와요)
+
+    return:
+        {"success": bool, "message": str, "total_commits": int(저장한 경우만)}
+    """
+    # 여러 스레드에서 호출되니까 db를 넘기지 않고 호출마다 세션을 따로 열게 해요
+    if not check_repo_update_needed(github_username=github_username, repo_url=repository['html_url'], updated_at=repository['updated_at']):
+        return {
+            "success": True,
+            "message": f"'{repository['name']}' is already up to date!"
+        }
+
+    # DB에서 동기화 커서(마지막으로 동기화한 커밋 SHA, 날짜) 가져오기
+    sync_cursor = get_sync_cursor(github_username, repository['html_url']) or (None, None)
+
+    commits = get_user_commits(
+        github_token,
+        _repository_owner(repository, github_username),
+        repository['name'],
+        start_date,
+        end_date,
+        *sync_cursor
+    )
+
+    if not isinstance(commits, list):
+        return {
+            "success": False,
+            "message": f"Error getting commits for {repository['name']}: {commits}"
+        }
+
+    if on_event:
+        on_event({
+            "type": "fetching_commits",
+            "repository": repository['name'],
+            "total_commits_found": len(commits)
+        })
+
+    result = save_repo_and_commits(github_username, repository, commits)
+    if result is not True:
+        return {
+            "success": False,
+            "message": f"Error saving {repository['name']}: {result}"
+        }
+
+    return {
+        "success": True,
+        "message": f"'{repository['name']}' is saved!",
+        "total_commits": len(commits)
+    }
+
+def sync_pushed_commits(
+    github_token: str,
+    github_username: str,
+    repository: Dict,
+    commit_shas: List[str]
+) -> Dict:
+    """
+    push webhook으로 들어온 커밋들의 상세 정보만 가져와서 저장해요.
+    그 달을 이미 동기화해서 커서가 있을 때만 커서도 옮겨요 (save_repo_and_commits의 partial 참고).
+
+    params:
+        repository: name, html_url, private, updated_at, owner(레포 소유자)가 있는 레포 정보
+    """
+    details = fetch_commit_details(github_token, _repository_owner(repository, github_username), repository['name'], commit_shas)
+
+    commits: List[Dict] = []
+    for detail in details:
+        if isinstance(detail, tuple):
+            return {
+                "success": False,
+                "message": f"Error getting pushed commits for {repository['name']}: {detail}"
+            }
+        commits.append(detail)
+
+    result = save_repo_and_commits(github_username, repository, commits, partial=True)
+    if result is not True:
+        return {
+            "success": False,
+            "message": f"Error saving {repository['name']}: {result}"
+        }
+
+    return {
+        "success": True,
+        "message": f"{len(commits)} pushed commits of '{repository['name']}' are saved!",
+        "total_commits": len(commits)
+    }
+
+def sync_all_repositories(
+    github_token: str,
+    github_username: str,
+    repositories: List[Dict],
+    start_date: datetime,
+    end_date: datetime,
+    max_workers: Optional[int] = None
+) -> Iterator[Dict]:
+    """
+    여러 레포를 스레드 풀로 동시에 동기화하면서 진행 상황 이벤트를 하나씩 yield 해요.
+
+    events:
+        - progress: {current, total, repository, message} 레포 하나가 끝날 때마다
+        - fetching_commits: {repository, total_commits_found}
+        - error: {repository, message} 레포 동기화 실패
+        - complete: {message, success} 모든 레포가 끝났을 때
+    """
+    total = len(repositories)
+    events: queue.Queue = queue.Queue()
+
+    yield {"type": "progress", "current": 0, "total": total, "repository": None, "message": "start"}
+
+    def run(repository: Dict) -> None:
+        try:
+            result = sync_repository(github_token, github_username, repository, start_date, end_date, events.put)
+        except Exception as e:
+            result = {"success": False, "message": f"Error syncing {repository['name']}: {e}"}
+        events.put({"type": "result", "repository": repository['name'], **result})
+
+    workers = max(1, min(max_workers or SYNC_WORKER_COUNT, total or 1))
+    failed = 0
+    done = 0
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for repository in repositories:
+            executor.submit(run, repository)
+
+        while done < total:
+            event = events.get()
+            if event["type"] != "result":
+                yield event
+                continue
+
+            done += 1
+            if not event["success"]:
+                failed += 1
+                yield {"type": "error", "repository": event["repository"], "message": event["message"]}
+
+            yield {"type": "progress", "current": done, "total": total, "repository": event["repository"], "message": event["message"]}
+
+    yield {
+        "type": "complete",
+        "success": failed == 0,
+        "message": f"{total - failed}/{total} repositories synced"
+    }
@@ -1,11 +1,47 @@
-from datetime import datetime, timedelta
+from datetime import date, datetime, time as dt_time, timedelta
 from fastapi import HTTPException
-from typing import Optional
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+from typing import Dict, Optional, Tuple
 import requests
+import threading
+import hashlib
+import time
+import os
+import dotenv
+try:
+    from .. import session_scope
+    from .github_http import github_get
+except ImportError:
+    import sys
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+    from be import session_scope
+    from be.modules.github_http import github_get
 
-def validate_date_n_token(github_username: Optional[str], year: Optional[int], month: Optional[int], token: Optional[str]) -> bool:
+
+dotenv.load_dotenv()
+
+# 확인한 토큰의 로그인 이름을 캐시해둘 시간(초) (0이면 캐시하지 않고 매번 GitHub에 물어봐요)
+TOKEN_CACHE_TTL: float = float(os.getenv("TOKEN_CACHE_TTL", "300"))
+# 유효하지 않은(401) 토큰을 캐시해둘 시간(초)
+TOKEN_NEGATIVE_CACHE_TTL: float = float(os.getenv("TOKEN_NEGATIVE_CACHE_TTL", "60"))
+# 프로세스 안에 캐시해둘 최대 토큰 수 (넘으면 오래된 것부터 지워요)
+TOKEN_CACHE_MAX_ENTRIES: int = int(os.getenv("TOKEN_CACHE_MAX_ENTRIES", "10000"))
+# memory: 프로세스마다 따로 캐시, postgres: 워커 여러 개가 token_cache 테이블을 같이 써요 (프로세스 캐시도 같이 써요)
+TOKEN_CACHE_BACKEND: str = os.getenv("TOKEN_CACHE_BACKEND", "memory").lower()
+# token_cache 테이블에서 만료된 행을 지우는 간격(초), 저장할 때마다 지우지 않고 프로세스마다 이 간격으로 한 번씩 지워요
+TOKEN_CACHE_CLEANUP_INTERVAL: float = float(os.getenv("TOKEN_CACHE_CLEANUP_INTERVAL", "3600"))
+
+# 토큰 원문 대신 sha256 해시를 키로 {token_hash: (login, 만료 시각)}, 유효하지 않은 토큰은 login이 None
+_token_cache: Dict[str, Tuple[Optional[str], float]] = {}
+_token_cache_lock = threading.Lock()
+_token_stats: Dict[str, int] = {"hits": 0, "shared_hits": 0, "misses": 0}
+_last_cleanup: float = 0.0
+
+def validate_date_n_token(github_username: Optional[str], year: Optional[int], month: Optional[int], token: Optional[str], session: Optional[requests.Session] = None, db: Optional[Session] = None) -> bool:
     """
     date와 token을 정상적으로 받았는지 확인하고, 이상하다고 하면 함수 내에서 raise HTTPException을 해줘요.
+    db는 TOKEN_CACHE_BACKEND=postgres일 때 token_cache를 읽고 쓰는 세션이에요 (validate_token 참고).
 
     정상적인 값이면 start_date(datetime), end_date(datetime)로 만들어서 각각 반환해요.
     """
@@ -34,18 +70,154 @@ def validate_date_n_token(github_username: Optional[str], year: Optional[int], m
     end_date = next_month_date - timedelta(days=1)
     end_date = end_date.replace(hour=23, minute=59, second=59)
 
-    url = "https://api.github.com/user"
-    headers = {"Authorization": f"token {token}"}
-    response = requests.get(url, headers=headers)
+    validate_token(github_username, token, session, db)
+
+    return start_date, end_date
+
+def validate_range_n_token(github_username: Optional[str], start_date: Optional[date], end_date: Optional[date], token: Optional[str], session: Optional[requests.Session] = None, db: Optional[Session] = None) -> Tuple[datetime, datetime]:
+    """
+    validate_date_n_token의 기간(start_date ~ end_date, 둘 다 포함) 버전이에요.
 
-    if response.status_code == 200:
-        user_info = response.json()
-        if user_info['login'] != github_username:
-            raise HTTPException(status_code=422, detail="Github username is invalid")
+    정상적인 값이면 start_date 00:00:00, end_date 23:59:59의 datetime으로 만들어서 각각 반환해요.
+    """
+
+    if github_username is None:
+        raise HTTPException(status_code=422, detail="Github username is required")
+
+    if token is None:
+        raise HTTPException(status_code=422, detail="GitHub token must be provided")
+
+    if start_date is None or end_date is None:
+        raise HTTPException(status_code=422, detail="Start date and end date must be provided")
+
+    if start_date.year < 2005 or start_date > end_date:
+        raise HTTPException(status_code=422, detail="Invalid date range")
+
+    validate_token(github_username, token, session, db)
+
+    return datetime.combine(start_date, dt_time.min), datetime.combine(end_date, dt_time.max).replace(microsecond=0)
+
+def validate_token(github_username: Optional[str], token: Optional[str], session: Optional[requests.Session] = None, db: Optional[Session] = None) -> None:
+    """
+    token이 github_username의 토큰인지 GitHub API로 확인하고, 아니면 raise HTTPException을 해줘요.
+    확인한 결과(토큰 해시 -> login)는 TOKEN_CACHE_TTL초, 유효하지 않은 토큰은 TOKEN_NEGATIVE_CACHE_TTL초 동안 캐시해요.
+
+    TOKEN_CACHE_BACKEND=postgres면 db(요청의 세션)로 token_cache를 읽고 써서 연결을 따로 꺼내지 않아요.
+    토큰 확인은 다른 작업보다 먼저 해서, 캐시를 저장할 때 db를 commit해도 돼요.
+    """
+
+    if github_username is None:
+        raise HTTPException(status_code=422, detail="Github username is required")
+
+    if token is None:
+        raise HTTPException(status_code=422, detail="GitHub token must be provided")
+
+    token_hash = hashlib.sha256(token.encode()).hexdigest()
+    found, login = _get_cached_login(token_hash, db)
+
+    if not found:
+        url = "https://api.github.com/user"
+        headers = {"Authorization": f"token {token}"}
+        response = github_get(url, headers, session=session)
+
+        if response.status_code == 200:
+            login = response.json()['login']
+            _cache_login(token_hash, login, TOKEN_CACHE_TTL, db)
+        elif response.status_code == 401:
+            login = None
+            _cache_login(token_hash, login, TOKEN_NEGATIVE_CACHE_TTL, db)
         else:
-            return start_date, end_date
-        
-    elif response.status_code == 401:
+            # rate limit이나 GitHub 장애는 토큰 문제가 아니라서 캐시하지 않아요
+            raise HTTPException(status_code=422, detail="Unexpected Github API error")
+
+    if login is None:
         raise HTTPException(status_code=422, detail="GitHub token is invalid or expired")
-    else:
-        raise HTTPException(status_code=422, detail="Unexpected Github API error")
+
+    if login != github_username:
+        raise HTTPException(status_code=422, detail="Github username is invalid")
+
+def _count(name: str) -> None:
+    with _token_cache_lock:
+        _token_stats[name] += 1
+
+def _get_cached_login(token_hash: str, db: Optional[Session] = None) -> Tuple[bool, Optional[str]]:
+    """
+    return: (캐시에 있는지, login) - 유효하지 않은 토큰으로 캐시돼 있으면 (True, None)
+    """
+    now = time.time()
+    with _token_cache_lock:
+        entry = _token_cache.get(token_hash)
+        if entry is not None and entry[1] > now:
+            _token_stats["hits"] += 1
+            return True, entry[0]
+
+    if TOKEN_CACHE_BACKEND == "postgres":
+        with session_scope(db) as db:
+            try:
+                row = db.execute(text("""
+                    SELECT login, EXTRACT(EPOCH FROM expires_at)
+                    FROM token_cache
+                    WHERE token_hash = :token_hash AND expires_at > CURRENT_TIMESTAMP
+                """), {"token_hash": token_hash}).first()
+            except Exception as e:
+                # 읽지 못하면 캐시에 없는 것으로 보고 GitHub에 물어봐요
+                db.rollback()
+                print(f"        | token cache read failed: {e}")
+                row = None
+        if row is not None:
+            _count("shared_hits")
+            _store_login(token_hash, row[0], float(row[1]))
+            return True, row[0]
+
+    _count("misses")
+    return False, None
+
+def _store_login(token_hash: str, login: Optional[str], expires_at: float) -> None:
+    with _token_cache_lock:
+        _token_cache.pop(token_hash, None)
+        _token_cache[token_hash] = (login, expires_at)
+        # dict는 넣은 순서를 유지해서 앞에서부터 지우면 오래된 것부터 지워져요
+        while len(_token_cache) > TOKEN_CACHE_MAX_ENTRIES:
+            del _token_cache[next(iter(_token_cache))]
+
+def _cache_login(token_hash: str, login: Optional[str], ttl: float, db: Optional[Session] = None) -> None:
+    global _last_cleanup
+
+    if ttl <= 0:
+        return
+
+    _store_login(token_hash, login, time.time() + ttl)
+
+    if TOKEN_CACHE_BACKEND == "postgres":
+        with _token_cache_lock:
+            cleanup = time.time() - _last_cleanup >= TOKEN_CACHE_CLEANUP_INTERVAL
+            if cleanup:
+                _last_cleanup = time.time()
+
+        with session_scope(db) as db:
+            try:
+                db.execute(text("""
+                    INSERT INTO token_cache (token_hash, login, expires_at)
+                    VALUES (:token_hash, :login, CURRENT_TIMESTAMP + make_interval(secs => :ttl))
+                    ON CONFLICT (token_hash)
+                    DO UPDATE SET login = EXCLUDED.login, expires_at = EXCLUDED.expires_at
+                """), {"token_hash": token_hash, "login": login, "ttl": ttl})
+                if cleanup:
+                    db.execute(text("DELETE FROM token_cache WHERE expires_at < CURRENT_TIMESTAMP - INTERVAL '1 hour'"))
+                db.commit()
+            except Exception as e:
+                # 캐시는 최적화일 뿐이라 저장하지 못해도(잠금 대기, 읽기 전용 replica ...) 확인한 결과로 요청을 이어가요
+                db.rollback()
+                print(f"        | token cache write failed: {e}")
+
+def get_token_cache_stats() -> Dict[str, float]:
+    """
+    토큰 확인 캐시 hit/miss 카운터를 반환해요.
+    hits: 프로세스 캐시에서 확인, shared_hits: token_cache 테이블에서 확인, misses: GitHub에 물어봄
+    """
+    with _token_cache_lock:
+        stats = dict(_token_stats)
+        stats["size"] = len(_token_cache)
+    total = stats["hits"] + stats["shared_hits"] + stats["misses"]
+    stats["hit_ratio"] = (stats["hits"] + stats["shared_hits"]) / total if total else 0.0
+    return stats
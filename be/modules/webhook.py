@@ -0,0 +1,105 @@
+from typing import Dict, List, Optional
+from sqlalchemy import text
+import hashlib
+import hmac
+import json
+import os
+import dotenv
+from icecream import ic
+try:
+    from .. import SessionLocal
+    from .sync_queue import enqueue_push_job
+except ImportError:
+    import sys
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+    from be import SessionLocal
+    from be.modules.sync_queue import enqueue_push_job
+
+
+dotenv.load_dotenv()
+
+# GitHub webhook 설정에 넣은 secret
+GITHUB_WEBHOOK_SECRET: str = os.getenv("GITHUB_WEBHOOK_SECRET", "")
+
+
+def verify_webhook_signature(body: bytes, signature: Optional[str], secret: str = None) -> bool:
+    """
+    X-Hub-Signature-256 헤더(sha256=<hex>)가 body의 HMAC-SHA256과 같은지 확인해요.
+    secret이 설정되지 않았으면 항상 False에요.
+    """
+    secret = GITHUB_WEBHOOK_SECRET if secret is None else secret
+    if not secret or not signature or not signature.startswith("sha256="):
+        return False
+
+    expected = hmac.new(secret.encode(), body, hashlib.sha256).hexdigest()
+    return hmac.compare_digest(expected, signature[len("sha256="):])
+
+def parse_push_event(payload: Dict) -> Optional[Dict]:
+    """
+    push 이벤트 payload에서 기본 브랜치에 새로 들어온 커밋 SHA들을 꺼내요.
+    기본 브랜치가 아니거나, 브랜치 삭제거나, 새 커밋이 없으면 None을 반환해요.
+
+    return:
+        {repo_url, repo_name, owner, commit_shas}
+    """
+    repository = payload.get('repository') or {}
+    default_branch = repository.get('default_branch') or repository.get('master_branch')
+
+    if payload.get('deleted') or payload.get('ref') != f"refs/heads/{default_branch}":
+        return None
+
+    # distinct가 false인 커밋은 이미 다른 브랜치로 들어와서 저장된 커밋이에요
+    commit_shas: List[str] = [commit['id'] for commit in payload.get('commits', []) if commit.get('distinct', True)]
+    if not commit_shas:
+        return None
+
+    owner = repository.get('owner') or {}
+    return {
+        "repo_url": repository['html_url'],
+        "repo_name": repository['name'],
+        "owner": owner.get('login') or owner.get('name'),
+        "commit_shas": commit_shas
+    }
+
+def handle_push_event(payload: Dict) -> List[int]:
+    """
+    push 이벤트의 커밋들을 해당 레포를 동기화하고 있는 사용자마다 push 작업으로 큐에 넣어요.
+    한 번도 동기화하지 않은 레포는 무시해요.
+
+    return: 큐에 넣은 job_id 목록
+    """
+    push = parse_push_event(payload)
+    if push is None:
+        return []
+
+    db = SessionLocal()
+    try:
+        tracked = db.execute(text("""
+            SELECT github_username, repo_name, repo_url, is_secret, last_updated
+            FROM repositories
+            WHERE repo_url = :repo_url
+        """), {"repo_url": push['repo_url']}).fetchall()
+    finally:
+        db.close()
+
+    job_ids: List[int] = []
+    for row in tracked:
+        repository = {
+            "name": row.repo_name,
+            "html_url": row.repo_url,
+            "private": row.is_secret,
+            # 폴링(check_repo_update_needed) 판단에 영향이 없도록 저장된 last_updated를 그대로 넘겨요
+            "updated_at": row.last_updated,
+            "owner": push['owner']
+        }
+        job_ids.append(enqueue_push_job(row.github_username, repository, push['commit_shas']))
+
+    return job_ids
+
+
+if __name__ == "__main__":
+    # 저장해둔 payload로 확인: python -m be.modules.webhook payload.json
+    import sys
+
+    with open(sys.argv[1], encoding="utf-8") as f:
+        ic(parse_push_event(json.load(f)))
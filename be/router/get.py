@@ -1,5 +1,8 @@
-from fastapi import APIRouter, Header
+from fastapi import APIRouter, Depends, Header, HTTPException, Query
+from sqlalchemy.orm import Session
 from typing import Optional
+from datetime import date
+from .. import get_db
 from ..modules import (
     get_user_repos,
     get_total_commit_num,
@@ -9,13 +12,24 @@ from ..modules import (
     get_longest_streak,
     get_longest_gap,
     get_total_days,
-    get_each_day_commit_count
+    get_each_day_commit_count,
+    get_used_languages,
+    get_month_summary,
+    get_range_summary,
+    get_rolling_summary,
+    get_year_summary,
+    validate_token,
+    get_sync_job_status
 )
 
 router = APIRouter(prefix="/get")
 
+# 모듈 함수들이 requests, SQLAlchemy 세션으로 블로킹 I/O를 해서 핸들러를 async def가 아닌 def로 둬요.
+# def 핸들러는 FastAPI가 스레드 풀에서 실행해서, GitHub 응답이 느려도 이벤트 루프가 막히지 않아요.
+# DB를 쓰는 핸들러는 get_db로 요청마다 세션을 하나 받아서 모듈 함수에 넘겨요.
+
 @router.get("/{user}/repo/{year}/{month}")
-async def get_repository(
+def get_repository(
     user: str,
     year: int, 
     month: int,
@@ -28,68 +42,74 @@ async def get_repository(
     return get_user_repos(github_token, start_date, end_date)
 
 @router.get("/{user}/commit_num/total")
-async def get_commit_num(
+def get_commit_num(
     user: str,
     year: Optional[int] = None,
     month: Optional[int] = None,
-    github_token: Optional[str] = Header(None, alias="X-GitHub-Token")
+    github_token: Optional[str] = Header(None, alias="X-GitHub-Token"),
+    db: Session = Depends(get_db)
 ):
-    return get_total_commit_num(github_token, user, year, month)
+    return get_total_commit_num(github_token, user, year, month, db)
 
 @router.get("/{user}/commit_num/specific")
-async def get_commit_num(
+def get_commit_num(
     user: str,
     repo_name: str,
     year: Optional[int] = None,
     month: Optional[int] = None,
-    github_token: Optional[str] = Header(None, alias="X-GitHub-Token")
+    github_token: Optional[str] = Header(None, alias="X-GitHub-Token"),
+    db: Session = Depends(get_db)
 ):
-    return get_specific_repo_commit_num(github_token, user, repo_name, year, month)
+    return get_specific_repo_commit_num(github_token, user, repo_name, year, month, db)
 
 @router.get("/{user}/used_language")
-async def get_used_language(
+def get_used_language(
     user: str,
     year: Optional[int] = None,
     month: Optional[int] = None,
-    github_token: Optional[str] = Header(None, alias="X-GitHub-Token")
+    github_token: Optional[str] = Header(None, alias="X-GitHub-Token"),
+    db: Session = Depends(get_db)
 ):
-    start_date, end_date = validate_date_n_token(user, year, month, github_token)
+    start_date, end_date = validate_date_n_token(user, year, month, github_token, db=db)
 
-    return get_used_language(user, start_date, end_date)
+    return get_used_languages(user, start_date, end_date, db)
 
 @router.get("/{user}/days/active/{year}/{month}")
-async def get_active_days_endpoint(
+def get_active_days_endpoint(
     user: str,
     year: int,
     month: int,
-    github_token: Optional[str] = Header(None, alias="X-GitHub-Token")
+    github_token: Optional[str] = Header(None, alias="X-GitHub-Token"),
+    db: Session = Depends(get_db)
 ):
-    active_days = get_active_days(user, github_token, year, month)
+    active_days = get_active_days(user, github_token, year, month, db)
     return {"active_days": active_days}
 
 @router.get("/{user}/days/longest_streak/{year}/{month}")
-async def get_longest_streak_endpoint(
+def get_longest_streak_endpoint(
     user: str,
     year: int,
     month: int,
-    github_token: Optional[str] = Header(None, alias="X-GitHub-Token")
+    github_token: Optional[str] = Header(None, alias="X-GitHub-Token"),
+    db: Session = Depends(get_db)
 ):
-    longest_streak = get_longest_streak(user, github_token, year, month)
+    longest_streak = get_longest_streak(user, github_token, year, month, db)
     return {"longest_streak": longest_streak}
 
 @router.get("/{user}/days/longest_gap/{year}/{month}/{day}")
-async def get_longest_gap_endpoint(
+def get_longest_gap_endpoint(
     user: str,
     year: int,
     month: int,
     day: int,
-    github_token: Optional[str] = Header(None, alias="X-GitHub-Token")
+    github_token: Optional[str] = Header(None, alias="X-GitHub-Token"),
+    db: Session = Depends(get_db)
 ):
-    longest_gap = get_longest_gap(user, github_token, year, month, day)
+    longest_gap = get_longest_gap(user, github_token, year, month, day, db)
     return {"longest_gap": longest_gap}
 
 @router.get("/days/total/{year}/{month}")
-async def get_total_days_endpoint(
+def get_total_days_endpoint(
     year: int,
     month: int,
 ):
@@ -97,11 +117,66 @@ async def get_total_days_endpoint(
     return {"total_days": total_days}
 
 @router.get("/{user}/days/each/{year}/{month}")
-async def get_each_day_commit_count_endpoint(
+def get_each_day_commit_count_endpoint(
     user: str,
     year: int,
     month: int,
+    github_token: Optional[str] = Header(None, alias="X-GitHub-Token"),
+    db: Session = Depends(get_db)
+):
+    each_day_commit_count = get_each_day_commit_count(user, github_token, year, month, db)
+    return {"each_day_commit_count": each_day_commit_count}
+
+# /summary/{year}/{month}보다 먼저 등록해야 range, last가 year로 읽히지 않아요
+@router.get("/{user}/summary/range")
+def get_range_summary_endpoint(
+    user: str,
+    start_date: date = Query(..., alias="from"),
+    end_date: date = Query(..., alias="to"),
+    github_token: Optional[str] = Header(None, alias="X-GitHub-Token"),
+    db: Session = Depends(get_db)
+):
+    return get_range_summary(user, github_token, start_date, end_date, db)
+
+@router.get("/{user}/summary/last/{days}")
+def get_rolling_summary_endpoint(
+    user: str,
+    days: int,
+    github_token: Optional[str] = Header(None, alias="X-GitHub-Token"),
+    db: Session = Depends(get_db)
+):
+    return get_rolling_summary(user, github_token, days, db)
+
+@router.get("/{user}/summary/{year}")
+def get_year_summary_endpoint(
+    user: str,
+    year: int,
+    github_token: Optional[str] = Header(None, alias="X-GitHub-Token"),
+    db: Session = Depends(get_db)
+):
+    return get_year_summary(user, github_token, year, db)
+
+@router.get("/{user}/summary/{year}/{month}")
+def get_month_summary_endpoint(
+    user: str,
+    year: int,
+    month: int,
+    day: Optional[int] = None,
+    github_token: Optional[str] = Header(None, alias="X-GitHub-Token"),
+    db: Session = Depends(get_db)
+):
+    # 대시보드가 active, longest_streak, longest_gap, each, commit_num/total, used_language를 한 번에 받아가요
+    return get_month_summary(user, github_token, year, month, day, db)
+
+@router.get("/{user}/jobs/{job_id}")
+def get_sync_job_status_endpoint(
+    user: str,
+    job_id: int,
     github_token: Optional[str] = Header(None, alias="X-GitHub-Token")
 ):
-    each_day_commit_count = get_each_day_commit_count(user, github_token, year, month)
-    return {"each_day_commit_count": each_day_commit_count}
\ No newline at end of file
+    validate_token(user, github_token)
+
+    job = get_sync_job_status(user, job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
@@ -1,18 +1,23 @@
 from fastapi import APIRouter, Header
+from fastapi.responses import StreamingResponse
 from typing import Optional
+import json
 from ..classes import RequestBody
 from ..modules import (
-    check_repo_update_needed,
-    get_user_commits,
-    save_repo_and_commits,
+    get_user_repos,
     validate_date_n_token,
-    get_latest_commit_sha
+    sync_repository,
+    sync_all_repositories,
+    enqueue_sync_job
 )
 
 router = APIRouter(prefix="/save")
 
+# 모듈 함수들이 requests, SQLAlchemy 세션으로 블로킹 I/O를 해서 핸들러를 async def가 아닌 def로 둬요.
+# def 핸들러는 FastAPI가 스레드 풀에서 실행해서, GitHub 응답이 느려도 이벤트 루프가 막히지 않아요.
+
 @router.post("/{github_username}/specific/{year}/{month}")
-async def save_specific_repo_n_commits_to_db(
+def save_specific_repo_n_commits_to_db(
     github_username: str,
     year: int,
     month: int,
@@ -22,33 +27,64 @@ async def save_specific_repo_n_commits_to_db(
     repository = request_body.repository.model_dump()
     start_date, end_date = validate_date_n_token(github_username, year, month, github_token)
     
-    if check_repo_update_needed(github_username=github_username, repo_url=repository['html_url'], updated_at=repository['updated_at']):
-        # DB에서 최신 커밋 SHA 가져오기
-        latest_commit_sha = get_latest_commit_sha(github_username, repository['html_url']) 
-        
-        commits = get_user_commits(
-            github_token, 
-            github_username, 
-            repository['name'], 
-            start_date, 
-            end_date,
-            latest_commit_sha
-        )
-        
-        if isinstance(commits, list):
-            result = save_repo_and_commits(github_username, repository, commits)
-            return {
-                "success": True,
-                "message": f"'{repository['name']}' is saved! {result}",
-                "total_commits": len(commits)
-            }
-        else:
-            return {
-                "success": False,
-                "message": f"Error getting commits for {repository['name']}: {commits}"
-            }
-    else:
+    return sync_repository(github_token, github_username, repository, start_date, end_date)
+
+@router.post("/{github_username}/all/{year}/{month}")
+def save_all_repos_n_commits_to_db(
+    github_username: str,
+    year: int,
+    month: int,
+    github_token: Optional[str] = Header(None, alias="X-GitHub-Token")
+):
+    start_date, end_date = validate_date_n_token(github_username, year, month, github_token)
+
+    repositories = get_user_repos(github_token, start_date, end_date)
+    if not isinstance(repositories, list):
         return {
-            "success": True,
-            "message": f"'{repository['name']}' is already up to date!"
-        }
\ No newline at end of file
+            "success": False,
+            "message": f"Error getting repositories: {repositories}"
+        }
+
+    # 레포별 진행 상황을 Server-Sent Events로 보내요
+    def event_stream():
+        for event in sync_all_repositories(github_token, github_username, repositories, start_date, end_date):
+            yield f"data: {json.dumps(event, default=str)}\n\n"
+
+    return StreamingResponse(event_stream(), media_type="text/event-stream")
+
+@router.post("/{github_username}/jobs/specific/{year}/{month}")
+def enqueue_specific_repo_sync_job(
+    github_username: str,
+    year: int,
+    month: int,
+    request_body: RequestBody,
+    github_token: Optional[str] = Header(None, alias="X-GitHub-Token")
+):
+    repository = request_body.repository.model_dump()
+    start_date, end_date = validate_date_n_token(github_username, year, month, github_token)
+
+    # 바로 동기화하지 않고 큐에 넣어두면 워커(be/worker.py)가 처리해요
+    job_id = enqueue_sync_job(github_username, repository, start_date, end_date, github_token)
+    return {"success": True, "job_ids": [job_id]}
+
+@router.post("/{github_username}/jobs/all/{year}/{month}")
+def enqueue_all_repos_sync_jobs(
+    github_username: str,
+    year: int,
+    month: int,
+    github_token: Optional[str] = Header(None, alias="X-GitHub-Token")
+):
+    start_date, end_date = validate_date_n_token(github_username, year, month, github_token)
+
+    repositories = get_user_repos(github_token, start_date, end_date)
+    if not isinstance(repositories, list):
+        return {
+            "success": False,
+            "message": f"Error getting repositories: {repositories}"
+        }
+
+    job_ids = [
+        enqueue_sync_job(github_username, repository, start_date, end_date, github_token)
+        for repository in repositories
+    ]
+    return {"success": True, "job_ids": job_ids}
@@ -0,0 +1,29 @@
+from fastapi import APIRouter, Header, HTTPException, Request
+from fastapi.concurrency import run_in_threadpool
+from typing import Optional
+import json
+from ..modules import verify_webhook_signature, handle_push_event
+
+router = APIRouter(prefix="/webhook")
+
+@router.post("/github")
+async def receive_github_webhook(
+    request: Request,
+    github_event: Optional[str] = Header(None, alias="X-GitHub-Event"),
+    signature: Optional[str] = Header(None, alias="X-Hub-Signature-256")
+):
+    body = await request.body()
+
+    if not verify_webhook_signature(body, signature):
+        raise HTTPException(status_code=401, detail="Invalid webhook signature")
+
+    if github_event == "ping":
+        return {"success": True, "message": "pong"}
+
+    if github_event != "push":
+        return {"success": True, "message": f"'{github_event}' event is ignored"}
+
+    # 커밋 상세 정보는 워커가 가져와요
+    # 본문을 await로 읽어야 해서 핸들러는 async def로 두고, DB에 쓰는 부분만 스레드 풀에서 실행해요
+    job_ids = await run_in_threadpool(handle_push_event, json.loads(body))
+    return {"success": True, "job_ids": job_ids}
@@ -0,0 +1,87 @@
+"""
+동시에 요청을 보냈을 때 응답 시간(p50, p99)을 핸들러가 async def일 때(이전)와 def일 때(지금)로 비교해요.
+GitHub API는 github_latency초 뒤에 응답하는 가짜 응답으로 바꾸고, DB는 실제로 조회해요.
+httpx가 필요해요.
+
+    python -m be.scripts.benchmark_concurrency [clients] [github_latency]
+"""
+from typing import List
+from fastapi import FastAPI, Header
+import anyio.to_thread
+import requests
+import asyncio
+import httpx
+import time
+import json
+import sys
+from .. import init_db
+from ..main import THREADPOOL_SIZE
+from ..modules import get_active_days
+from ..router.get import router
+
+BENCH_USER = "bench_concurrency"
+URL = f"/get/{BENCH_USER}/days/active/2025/1"
+
+
+def fake_github(latency: float):
+    def request(self, method, url, headers=None, **kwargs) -> requests.Response:
+        time.sleep(latency)
+        response = requests.Response()
+        response.status_code = 200
+        response.url = url
+        response._content = json.dumps({"login": BENCH_USER}).encode("utf-8")
+        return response
+    return request
+
+def blocking_app() -> FastAPI:
+    # 이전처럼 async def 핸들러에서 블로킹 함수를 바로 부르는 앱
+    app = FastAPI()
+
+    @app.get("/get/{user}/days/active/{year}/{month}")
+    async def get_active_days_endpoint(user: str, year: int, month: int, github_token: str = Header(None, alias="X-GitHub-Token")):
+        return {"active_days": get_active_days(user, github_token, year, month)}
+
+    return app
+
+def threadpool_app() -> FastAPI:
+    app = FastAPI()
+    app.include_router(router)
+    return app
+
+async def measure(app: FastAPI, clients: int) -> List[float]:
+    anyio.to_thread.current_default_thread_limiter().total_tokens = THREADPOOL_SIZE
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        # 모든 클라이언트가 동시에 요청했다고 보고, 같은 시작 시각부터 응답을 받을 때까지 잰 시간이에요
+        # (이벤트 루프가 막히면 요청을 보내는 것부터 늦어져서 요청별로 재면 기다린 시간이 빠져요)
+        start = time.perf_counter()
+
+        async def one() -> float:
+            response = await client.get(URL, headers={"X-GitHub-Token": "bench"})
+            response.raise_for_status()
+            return time.perf_counter() - start
+
+        return sorted(await asyncio.gather(*[one() for _ in range(clients)]))
+
+def _percentile(latencies: List[float], percent: float) -> float:
+    return latencies[min(int(len(latencies) * percent / 100), len(latencies) - 1)] * 1000
+
+
+if __name__ == "__main__":
+    clients = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    latency = float(sys.argv[2]) if len(sys.argv) > 2 else 0.1
+
+    init_db()
+    requests.Session.request = fake_github(latency)
+
+    print(f"        | {clients} clients, github latency {latency * 1000:.0f}ms, threadpool {THREADPOOL_SIZE}")
+    results = {}
+    for label, app in [("before", blocking_app()), ("after", threadpool_app())]:
+        start = time.perf_counter()
+        latencies = asyncio.run(measure(app, clients))
+        elapsed = time.perf_counter() - start
+        results[label] = _percentile(latencies, 99)
+        print(f"{label:<8}| p50 {_percentile(latencies, 50):.0f}ms, p99 {results[label]:.0f}ms, {clients / elapsed:.0f} req/s")
+
+    print(f"        | p99 {results['before'] / max(results['after'], 0.001):.1f}x lower")
@@ -0,0 +1,140 @@
+"""
+분석 쿼리들의 EXPLAIN ANALYZE 결과를 0008_analytics_indexes 인덱스가 있을 때와 없을 때로 비교해요.
+bench_ 로 시작하는 사용자들의 가짜 데이터를 만들고, 끝나면 지워요.
+
+    python -m be.scripts.benchmark_indexes [users] [repos_per_user] [commits_per_repo] [files_per_commit]
+"""
+from datetime import datetime, timezone
+from typing import Dict, List
+from sqlalchemy import text
+import json
+import sys
+from .. import init_db
+from ..database import engine
+from ..modules.partitions import ensure_commit_partitions
+
+INDEXES = [
+    "commits_repo_date_idx",
+    "commits_author_date_idx",
+    "code_changes_commit_language_idx",
+]
+
+BENCH_USER = "bench_1"
+PARAMS = {"username": BENCH_USER, "start_date": "2024-11-01", "end_date": "2024-11-30 23:59:59"}
+
+# 각 모듈의 쿼리와 같은 모양
+QUERIES: Dict[str, str] = {
+    "get_total_commit_num": """
+        SELECT COUNT(DISTINCT c.commit_hash)
+        FROM commits c
+        JOIN repositories r ON c.repo_id = r.repo_id
+        WHERE r.github_username = :username
+        AND c.commit_date BETWEEN CAST(:start_date AS TIMESTAMP) AND CAST(:end_date AS TIMESTAMP)
+        AND c.author = :username
+    """,
+    "get_used_languages": """
+        SELECT cc.language, COUNT(*) as count
+        FROM code_changes cc
+        JOIN commits c ON cc.commit_id = c.commit_id AND cc.commit_date = c.commit_date
+        JOIN repositories r ON c.repo_id = r.repo_id
+        WHERE r.github_username = :username
+        AND c.commit_date BETWEEN CAST(:start_date AS TIMESTAMP) AND CAST(:end_date AS TIMESTAMP)
+        AND cc.commit_date BETWEEN CAST(:start_date AS TIMESTAMP) AND CAST(:end_date AS TIMESTAMP)
+        AND cc.language IS NOT NULL
+        GROUP BY cc.language
+        ORDER BY count DESC
+    """,
+    "combine_commits.get_user_commits": """
+        SELECT c.commit_id, c.repo_id
+        FROM commits c
+        WHERE c.author = :username
+        AND c.commit_date BETWEEN CAST(:start_date AS TIMESTAMP) AND CAST(:end_date AS TIMESTAMP)
+        ORDER BY c.commit_date DESC
+    """,
+}
+
+
+def create_dataset(conn, users: int, repos: int, commits: int, files: int) -> None:
+    ensure_commit_partitions(datetime(2022, 1, 1, tzinfo=timezone.utc), datetime(2025, 1, 1, tzinfo=timezone.utc))
+    conn.execute(text("""
+        INSERT INTO repositories (github_username, repo_name, repo_url, last_updated)
+        SELECT 'bench_' || u, 'repo' || r, 'https://github.com/bench_' || u || '/repo' || r, CURRENT_TIMESTAMP
+        FROM generate_series(1, :users) u, generate_series(1, :repos) r
+    """), {"users": users, "repos": repos})
+    conn.execute(text("""
+        INSERT INTO commits (repo_id, commit_hash, commit_message, commit_date, author)
+        SELECT r.repo_id, md5(r.repo_id || '-' || n) || left(md5(n::text), 8), 'benchmark',
+               TIMESTAMPTZ '2022-01-01' + random() * INTERVAL '3 years', r.github_username
+        FROM repositories r, generate_series(1, :commits) n
+        WHERE r.github_username LIKE 'bench\\_%'
+    """), {"commits": commits})
+    conn.execute(text("""
+        INSERT INTO code_changes (commit_id, commit_date, file_path, change_type, additions, deletions, changes, language)
+        SELECT c.commit_id, c.commit_date, 'src/file' || f || '.' || (ARRAY['py', 'ts', 'vue', 'md'])[1 + f % 4], 'modified', 1, 1, 2,
+               (ARRAY['py', 'ts', 'vue', 'md'])[1 + f % 4]
+        FROM commits c
+        JOIN repositories r ON c.repo_id = r.repo_id, generate_series(1, :files) f
+        WHERE r.github_username LIKE 'bench\\_%'
+    """), {"files": files})
+    conn.commit()
+    conn.execute(text("ANALYZE repositories"))
+    conn.execute(text("ANALYZE commits"))
+    conn.execute(text("ANALYZE code_changes"))
+    conn.commit()
+
+def delete_dataset(conn) -> None:
+    repo_ids = "SELECT repo_id FROM repositories WHERE github_username LIKE 'bench\\_%'"
+    conn.execute(text(f"DELETE FROM code_changes WHERE commit_id IN (SELECT commit_id FROM commits WHERE repo_id IN ({repo_ids}))"))
+    conn.execute(text(f"DELETE FROM commits WHERE repo_id IN ({repo_ids})"))
+    conn.execute(text("DELETE FROM repositories WHERE github_username LIKE 'bench\\_%'"))
+    conn.commit()
+
+def _scan_nodes(plan: Dict) -> List[str]:
+    nodes = []
+    if "Relation Name" in plan or "Index Name" in plan:
+        nodes.append(f"{plan['Node Type']}" + (f" on {plan['Relation Name']}" if "Relation Name" in plan else "") + (f" using {plan['Index Name']}" if "Index Name" in plan else ""))
+    for child in plan.get("Plans", []):
+        nodes += _scan_nodes(child)
+    return nodes
+
+def explain(conn, query: str) -> Dict:
+    plan = conn.execute(text("EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) " + query), PARAMS).scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return {
+        "time": plan[0]["Execution Time"],
+        "scans": _scan_nodes(plan[0]["Plan"])
+    }
+
+def run_queries(conn, label: str) -> Dict[str, float]:
+    times: Dict[str, float] = {}
+    for name, query in QUERIES.items():
+        explain(conn, query)  # 캐시 데우기
+        result = explain(conn, query)
+        times[name] = result["time"]
+        print(f"{label:<8}| {name}: {result['time']:.2f}ms")
+        for scan in result["scans"]:
+            print(f"        |     {scan}")
+    return times
+
+
+if __name__ == "__main__":
+    users, repos, commits, files = [int(arg) for arg in sys.argv[1:5]] + [100, 10, 300, 5][len(sys.argv[1:5]):]
+
+    init_db()
+    with engine.connect() as conn:
+        print(f"        | creating {users * repos * commits} commits, {users * repos * commits * files} code_changes")
+        create_dataset(conn, users, repos, commits, files)
+        try:
+            # 인덱스를 지운 상태는 트랜잭션 안에서만 보고 되돌려요
+            for index in INDEXES:
+                conn.execute(text(f"DROP INDEX IF EXISTS {index}"))
+            before = run_queries(conn, "before")
+            conn.rollback()
+
+            after = run_queries(conn, "after")
+            for name in QUERIES:
+                print(f"        | {name}: {before[name] / max(after[name], 0.001):.1f}x faster")
+        finally:
+            conn.rollback()
+            delete_dataset(conn)
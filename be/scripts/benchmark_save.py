@@ -0,0 +1,158 @@
+"""
+save_repo_and_commits의 저장 속도(rows/s)를 한 행씩 INSERT하던 이전 방식과 비교해요.
+가짜 레포를 만들어서 저장하고 끝나면 지워요.
+
+    python -m be.scripts.benchmark_save [commits] [files_per_commit]
+"""
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List
+from sqlalchemy import text
+import time
+import uuid
+import sys
+from .. import SessionLocal, init_db
+from ..modules.save_repo_n_commits import save_repo_and_commits, _file_extension
+from ..modules.patch_storage import encode_commit_patches, store_patch_blobs
+from ..modules.partitions import ensure_commit_partitions
+
+
+def make_commits(commit_count: int, files_per_commit: int) -> List[Dict]:
+    base_date = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    commits: List[Dict] = []
+    for i in range(commit_count):
+        commits.append({
+            'sha': uuid.uuid4().hex + uuid.uuid4().hex[:8],
+            'commit_message': f"benchmark commit {i}",
+            'author': "benchmark",
+            'date': (base_date + timedelta(minutes=i)).isoformat(),
+            'files_changed': [
+                {
+                    'filename': f"src/module_{j}.py",
+                    'status': 'modified',
+                    'additions': 3,
+                    'deletions': 1,
+                    'changes': 4,
+                    'patch': f"@@ -1,3 +1,5 @@\n-old {i} {j}\n+new {i} {j}\n+line\n+line"
+                }
+                for j in range(files_per_commit)
+            ]
+        })
+    return commits
+
+def make_repo() -> Dict:
+    name = f"benchmark-{uuid.uuid4().hex[:8]}"
+    return {
+        'name': name,
+        'html_url': f"https://github.com/benchmark/{name}",
+        'updated_at': '2025-02-01T00:00:00Z',
+        'private': False
+    }
+
+def save_row_by_row(github_username: str, repo_data: Dict, commits_data: List[Dict]) -> None:
+    # 이전 save_repo_and_commits: 커밋마다, 변경 파일마다 INSERT 한 번씩
+    commit_dates = [datetime.fromisoformat(commit['date']) for commit in commits_data]
+    ensure_commit_partitions(min(commit_dates), max(commit_dates))
+
+    db = SessionLocal()
+    try:
+        repo_id = db.execute(text("""
+            INSERT INTO repositories (github_username, repo_name, repo_url, last_updated, is_secret)
+            VALUES (:username, :repo_name, :repo_url, :last_updated, :is_secret)
+            RETURNING repo_id
+        """), {
+            "username": github_username,
+            "repo_name": repo_data['name'],
+            "repo_url": repo_data['html_url'],
+            "last_updated": repo_data['updated_at'],
+            "is_secret": repo_data['private']
+        }).scalar()
+
+        for commit in commits_data:
+            commit_id = db.execute(text("""
+                INSERT INTO commits (repo_id, commit_hash, commit_message, commit_date, author)
+                VALUES (:repo_id, :commit_hash, :commit_message, :commit_date, :author)
+                ON CONFLICT (repo_id, commit_hash, commit_date)
+                DO UPDATE SET commit_message = :commit_message, author = :author
+                RETURNING commit_id
+            """), {
+                "repo_id": repo_id,
+                "commit_hash": commit['sha'],
+                "commit_message": commit['commit_message'],
+                "commit_date": commit['date'],
+                "author": commit['author']
+            }).scalar()
+
+            stored_patches = encode_commit_patches(commit['files_changed'])
+            for file_change, stored_patch in zip(commit['files_changed'], stored_patches):
+                store_patch_blobs(db, [stored_patch])
+                db.execute(text("""
+                    INSERT INTO code_changes (
+                        commit_id, commit_date, file_path, change_type,
+                        patch_hash, content_size, content_truncated,
+                        additions, deletions, changes, language
+                    )
+                    VALUES (
+                        :commit_id, :commit_date, :file_path, :change_type,
+                        :patch_hash, :content_size, :content_truncated,
+                        :additions, :deletions, :changes, :language
+                    )
+                """), {
+                    "commit_id": commit_id,
+                    "commit_date": commit['date'],
+                    "file_path": file_change['filename'],
+                    "change_type": file_change['status'],
+                    "patch_hash": stored_patch['hash'],
+                    "content_size": stored_patch['original_size'],
+                    "content_truncated": stored_patch['truncated'],
+                    "additions": file_change['additions'],
+                    "deletions": file_change['deletions'],
+                    "changes": file_change['changes'],
+                    "language": _file_extension(file_change['filename'])
+                })
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        raise e
+    finally:
+        db.close()
+
+def delete_repo(github_username: str, repo_url: str) -> None:
+    db = SessionLocal()
+    try:
+        params = {"username": github_username, "repo_url": repo_url}
+        repo_ids = "SELECT repo_id FROM repositories WHERE github_username = :username AND repo_url = :repo_url"
+        db.execute(text(f"""
+            DELETE FROM code_changes
+            WHERE commit_id IN (SELECT commit_id FROM commits WHERE repo_id IN ({repo_ids}))
+        """), params)
+        db.execute(text(f"DELETE FROM commits WHERE repo_id IN ({repo_ids})"), params)
+        db.execute(text("DELETE FROM repositories WHERE github_username = :username AND repo_url = :repo_url"), params)
+        db.commit()
+    finally:
+        db.close()
+
+def run(name: str, save, commit_count: int, files_per_commit: int) -> float:
+    github_username = "benchmark"
+    repo = make_repo()
+    commits = make_commits(commit_count, files_per_commit)
+    rows = commit_count * (files_per_commit + 1)
+
+    started = time.perf_counter()
+    result = save(github_username, repo, commits)
+    elapsed = time.perf_counter() - started
+    if isinstance(result, str):
+        raise RuntimeError(result)
+
+    delete_repo(github_username, repo['html_url'])
+    print(f"{name:<12}| {rows} rows in {elapsed:.2f}s, {rows / elapsed:,.0f} rows/s")
+    return elapsed
+
+
+if __name__ == "__main__":
+    commit_count = int(sys.argv[1]) if len(sys.argv) > 1 else 300
+    files_per_commit = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+
+    init_db()
+    before = run("row-by-row", save_row_by_row, commit_count, files_per_commit)
+    after = run("bulk", save_repo_and_commits, commit_count, files_per_commit)
+    print(f"        | {before / after:.1f}x faster")
@@ -0,0 +1,75 @@
+"""
+(commit_id, file_path) 유니크 인덱스가 생기기 전에 다시 저장하면서 쌓인 code_changes 중복 행을 지우고,
+code_changes_commit_file_key 인덱스를 만들어요. 각 (commit_id, file_path)마다 가장 나중에 저장한 행을 남겨요.
+한 번만 실행하면 되지만 여러 번 실행해도 괜찮아요.
+
+    python -m be.scripts.compact_code_changes [commits_per_batch]
+"""
+from sqlalchemy import text
+import sys
+from .. import SessionLocal
+from ..database import engine
+
+
+def delete_duplicate_changes(commits_per_batch: int = 1000) -> int:
+    """
+    commit_id 구간별로 나눠서 지우고 구간마다 커밋해요 (긴 잠금을 피하려고).
+
+    return: 지운 행 수
+    """
+    db = SessionLocal()
+    try:
+        max_commit_id = db.execute(text("SELECT COALESCE(MAX(commit_id), 0) FROM code_changes")).scalar()
+        deleted = 0
+
+        for low in range(0, max_commit_id + 1, commits_per_batch):
+            result = db.execute(text("""
+                DELETE FROM code_changes older
+                USING code_changes newer
+                WHERE older.commit_id = newer.commit_id
+                AND older.file_path = newer.file_path
+                AND older.change_id < newer.change_id
+                AND older.commit_id >= :low AND older.commit_id < :high
+            """), {"low": low, "high": low + commits_per_batch})
+            db.commit()
+
+            deleted += result.rowcount
+            if result.rowcount:
+                print(f"        | commit_id {low}~{low + commits_per_batch - 1}: deleted {result.rowcount} rows")
+
+        return deleted
+    except Exception as e:
+        db.rollback()
+        raise e
+    finally:
+        db.close()
+
+def create_unique_index() -> None:
+    # CONCURRENTLY는 트랜잭션 안에서 실행할 수 없어서 autocommit으로 실행해요
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        # 이전에 실패한 CONCURRENTLY 인덱스는 INVALID로 남아있어서 지우고 다시 만들어요
+        conn.execute(text("""
+            DO $$
+            BEGIN
+                IF EXISTS (
+                    SELECT 1 FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid
+                    WHERE c.relname = 'code_changes_commit_file_key' AND NOT i.indisvalid
+                ) THEN
+                    DROP INDEX code_changes_commit_file_key;
+                END IF;
+            END $$;
+        """))
+        # 0007 이후로는 마이그레이션이 만들어둬서(파티션 테이블은 CONCURRENTLY도 안 돼요) 없을 때만 만들어요
+        if not conn.execute(text("SELECT to_regclass('code_changes_commit_file_key') IS NOT NULL")).scalar():
+            conn.execute(text("""
+                CREATE UNIQUE INDEX CONCURRENTLY code_changes_commit_file_key
+                ON code_changes (commit_id, file_path)
+            """))
+        conn.execute(text("VACUUM (ANALYZE) code_changes"))
+
+
+if __name__ == "__main__":
+    deleted = delete_duplicate_changes(int(sys.argv[1]) if len(sys.argv) > 1 else 1000)
+    print(f"        | deleted {deleted} duplicate rows")
+    create_unique_index()
+    print("        | code_changes_commit_file_key ready")
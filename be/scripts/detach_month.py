@@ -0,0 +1,69 @@
+"""
+한 달치 commits, code_changes 파티션을 부모 테이블에서 떼어내요(detach).
+떼어낸 테이블은 commits_p2023_01_detached, code_changes_p2023_01_detached로 이름을 바꿔서 남겨요. pg_dump로 옮기고 지우면 돼요.
+이름을 바꿔두지 않으면 ensure_commit_partitions가 파티션이 있다고 보고 새로 만들지 않아서, 그 달에 새로 들어온 커밋이 DEFAULT 파티션에 쌓여요.
+다시 붙이려면 --attach를 줘요. 그 사이 그 달의 파티션이 새로 생겼으면 떼어낸 행을 그 파티션으로 옮기고 떼어낸 테이블은 지워요.
+
+    python -m be.scripts.detach_month 2023 1 [--attach]
+"""
+from datetime import date
+from sqlalchemy import text
+import argparse
+from ..database import engine
+
+
+def _bounds(year: int, month: int) -> tuple:
+    next_month = date(year + 1, 1, 1) if month == 12 else date(year, month + 1, 1)
+    return date(year, month, 1), next_month
+
+def detach_month(year: int, month: int) -> None:
+    suffix = f"p{year:04d}_{month:02d}"
+    with engine.begin() as conn:
+        conn.execute(text(f"ALTER TABLE code_changes DETACH PARTITION code_changes_{suffix}"))
+        # 떼어낸 code_changes는 commits를 참조하지 않게 해야 commits 파티션도 떼어낼 수 있어요
+        conn.execute(text(f"ALTER TABLE code_changes_{suffix} DROP CONSTRAINT IF EXISTS code_changes_commit_id_fkey"))
+        conn.execute(text(f"ALTER TABLE commits DETACH PARTITION commits_{suffix}"))
+        conn.execute(text(f"ALTER TABLE code_changes_{suffix} RENAME TO code_changes_{suffix}_detached"))
+        conn.execute(text(f"ALTER TABLE commits_{suffix} RENAME TO commits_{suffix}_detached"))
+    print(f"        | detached commits_{suffix}_detached, code_changes_{suffix}_detached")
+    print(f"        | pg_dump -t commits_{suffix}_detached -t code_changes_{suffix}_detached ... && DROP TABLE code_changes_{suffix}_detached, commits_{suffix}_detached")
+
+def attach_month(year: int, month: int) -> None:
+    suffix = f"p{year:04d}_{month:02d}"
+    lower, upper = _bounds(year, month)
+    bounds = f"FROM ('{lower} 00:00:00 Asia/Seoul') TO ('{upper} 00:00:00 Asia/Seoul')"
+    with engine.begin() as conn:
+        if conn.execute(text("SELECT to_regclass(:name)"), {"name": f"commits_{suffix}"}).scalar() is None:
+            conn.execute(text(f"ALTER TABLE commits_{suffix}_detached RENAME TO commits_{suffix}"))
+            conn.execute(text(f"ALTER TABLE code_changes_{suffix}_detached RENAME TO code_changes_{suffix}"))
+            conn.execute(text(f"ALTER TABLE commits ATTACH PARTITION commits_{suffix} FOR VALUES {bounds}"))
+            conn.execute(text(f"ALTER TABLE code_changes ATTACH PARTITION code_changes_{suffix} FOR VALUES {bounds}"))
+            print(f"        | attached commits_{suffix}, code_changes_{suffix}")
+            return
+
+        # 떼어낸 뒤에 그 달의 커밋이 들어와서 파티션이 새로 생겼으면, 떼어낸 행을 옮겨 담아요 (새로 저장한 행이 우선이에요)
+        moved = conn.execute(text(f"""
+            INSERT INTO commits SELECT * FROM commits_{suffix}_detached
+            ON CONFLICT DO NOTHING
+        """)).rowcount
+        conn.execute(text(f"""
+            INSERT INTO code_changes
+            SELECT cc.* FROM code_changes_{suffix}_detached cc
+            JOIN commits c ON c.commit_id = cc.commit_id AND c.commit_date = cc.commit_date
+            ON CONFLICT DO NOTHING
+        """))
+        conn.execute(text(f"DROP TABLE code_changes_{suffix}_detached, commits_{suffix}_detached"))
+    print(f"        | commits_{suffix} already exists, moved {moved} commits into it")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(prog="python -m be.scripts.detach_month")
+    parser.add_argument("year", type=int)
+    parser.add_argument("month", type=int)
+    parser.add_argument("--attach", action="store_true", help="떼어낸 파티션을 다시 붙여요")
+    args = parser.parse_args()
+
+    if args.attach:
+        attach_month(args.year, args.month)
+    else:
+        detach_month(args.year, args.month)
@@ -0,0 +1,68 @@
+"""
+patch_blobs 이전에 code_changes에 직접 저장된 patch(content, content_data)를 patch_blobs로 옮겨요.
+옮긴 행은 patch_hash만 남기고 content, content_data를 비워요. 여러 번 실행해도 괜찮아요.
+
+    python -m be.scripts.move_patches_to_blobs [batch_size]
+"""
+from sqlalchemy import text
+import sys
+from .. import SessionLocal, init_db
+from ..modules.patch_storage import encode_patch, store_patch_blobs, decode_patch
+
+
+def move_patches_to_blobs(batch_size: int = 500) -> int:
+    """
+    return: 옮긴 행 수
+    """
+    moved = 0
+    while True:
+        db = SessionLocal()
+        try:
+            rows = db.execute(text("""
+                SELECT change_id, content, content_data, content_encoding
+                FROM code_changes
+                WHERE patch_hash IS NULL
+                ORDER BY change_id
+                LIMIT :batch_size
+            """), {"batch_size": batch_size}).fetchall()
+            if not rows:
+                return moved
+
+            # 커밋 단위 제한은 이미 저장된 행에 다시 적용하지 않고, 파일 단위 제한만 적용해요
+            stored_patches = [encode_patch(decode_patch(row.content_data, row.content_encoding, row.content)) for row in rows]
+            store_patch_blobs(db, stored_patches)
+
+            db.execute(
+                text("""
+                    UPDATE code_changes
+                    SET patch_hash = :patch_hash,
+                        content = NULL,
+                        content_data = NULL,
+                        content_encoding = NULL,
+                        content_size = COALESCE(content_size, :content_size),
+                        content_truncated = content_truncated OR :content_truncated
+                    WHERE change_id = :change_id
+                """),
+                [
+                    {
+                        "change_id": row.change_id,
+                        "patch_hash": stored_patch['hash'],
+                        "content_size": stored_patch['original_size'],
+                        "content_truncated": stored_patch['truncated']
+                    }
+                    for row, stored_patch in zip(rows, stored_patches)
+                ]
+            )
+            db.commit()
+            moved += len(rows)
+            print(f"        | moved {moved} patches")
+        except Exception as e:
+            db.rollback()
+            raise e
+        finally:
+            db.close()
+
+
+if __name__ == "__main__":
+    init_db()
+    move_patches_to_blobs(int(sys.argv[1]) if len(sys.argv) > 1 else 500)
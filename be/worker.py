@@ -0,0 +1,101 @@
+"""
+sync_jobs 큐를 처리하는 워커에요. 프로세스를 여러 개 띄우면 그만큼 동시에 처리해요.
+
+    python -m be.worker
+"""
+import signal
+import socket
+import threading
+import time
+import os
+import dotenv
+from . import init_db
+from .modules import (
+    sync_repository,
+    sync_pushed_commits,
+    claim_sync_job,
+    heartbeat_sync_job,
+    complete_sync_job,
+    fail_sync_job,
+    requeue_stale_sync_jobs,
+    ensure_future_partitions
+)
+from .modules.sync_queue import SYNC_JOB_HEARTBEAT_INTERVAL
+
+dotenv.load_dotenv()
+
+# 처리할 작업이 없을 때 다시 확인하기까지 기다리는 시간(초)
+SYNC_WORKER_POLL_INTERVAL: float = float(os.getenv("SYNC_WORKER_POLL_INTERVAL", "2"))
+
+_stopping = False
+
+
+def _stop(signum, frame):
+    # 지금 처리 중인 작업은 끝내고 멈춰요
+    global _stopping
+    _stopping = True
+
+def _heartbeat(job_id: int, worker_id: str, done: threading.Event) -> None:
+    # 작업이 끝날 때까지 heartbeat를 남겨서, 오래 걸려도 requeue_stale_sync_jobs가 다른 워커에게 넘기지 않게 해요
+    while not done.wait(SYNC_JOB_HEARTBEAT_INTERVAL):
+        try:
+            if not heartbeat_sync_job(job_id, worker_id):
+                return
+        except Exception as e:
+            print(f"        | job {job_id}: heartbeat failed: {e}")
+
+def run_job(job: dict, worker_id: str) -> None:
+    repository = job['repository']
+    # push 작업은 사용자 토큰 없이 들어와서 서버의 토큰을 사용해요
+    github_token = job['github_token'] or os.getenv("GITHUB_TOKEN")
+
+    done = threading.Event()
+    heartbeat = threading.Thread(target=_heartbeat, args=(job['job_id'], worker_id, done), daemon=True)
+    heartbeat.start()
+    try:
+        if job['kind'] == 'push':
+            result = sync_pushed_commits(github_token, job['github_username'], repository, job['commit_shas'])
+        else:
+            result = sync_repository(github_token, job['github_username'], repository, job['start_date'], job['end_date'])
+    except Exception as e:
+        result = {"success": False, "message": f"Error syncing {repository['name']}: {e}"}
+    finally:
+        done.set()
+        heartbeat.join()
+
+    if result["success"]:
+        if complete_sync_job(job['job_id'], worker_id, result):
+            print(f"done    | job {job['job_id']}: {result['message']}")
+        else:
+            print(f"        | job {job['job_id']}: no longer owned by this worker, result discarded")
+    else:
+        status = fail_sync_job(job['job_id'], worker_id, result["message"])
+        if status:
+            print(f"{status:<8}| job {job['job_id']} (attempt {job['attempts']}/{job['max_attempts']}): {result['message']}")
+        else:
+            print(f"        | job {job['job_id']}: no longer owned by this worker, failure discarded")
+
+def main() -> None:
+    signal.signal(signal.SIGTERM, _stop)
+    signal.signal(signal.SIGINT, _stop)
+
+    init_db()
+    ensure_future_partitions()
+    worker_id = f"{socket.gethostname()}:{os.getpid()}"
+    print(f"        | worker {worker_id} started")
+
+    while not _stopping:
+        requeue_stale_sync_jobs()
+
+        job = claim_sync_job(worker_id)
+        if job is None:
+            time.sleep(SYNC_WORKER_POLL_INTERVAL)
+            continue
+
+        run_job(job, worker_id)
+
+    print(f"        | worker {worker_id} stopped")
+
+
+if __name__ == "__main__":
+    main()